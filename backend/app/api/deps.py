@@ -5,10 +5,27 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import decode_access_token
 from app.models import User
+from app.models.statements import user_by_id
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+def _load_user(db: Session, user_id) -> Optional[User]:
+    """
+    Look up the token's user, then end the lookup's transaction so its
+    connection goes back to the pool now instead of when the request
+    finishes. The user is detached across the rollback so it keeps its
+    loaded state, and re-attached for the route to use and modify.
+    """
+    user = db.scalars(user_by_id(user_id)).first()
+    if user is not None:
+        db.expunge(user)
+    db.rollback()
+    if user is not None:
+        db.add(user)
+    return user
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -28,7 +45,7 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _load_user(db, user_id)
     if user is None:
         raise credentials_exception
     
@@ -81,4 +98,4 @@ def get_optional_user(
     if user_id is None:
         return None
     
-    return db.query(User).filter(User.id == user_id).first()
+    return _load_user(db, user_id)
@@ -1,32 +1,54 @@
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.db_metrics import pool_metrics
+from app.core.payload_cache import payload_cache, json_list_response
+from app.core.single_flight import read_coalescer
 from app.models import (
     User, Car, Booking, Auction, Ride, Rating,
     BookingStatus, AuctionStatus, RideStatus, Availability, AvailabilityStatus
 )
+from app.models.loaders import AUCTION_DETAILS, booking_details_options
 from app.schemas import (
     CarCreate, CarUpdate, CarResponse,
     BookingResponse, BookingWithDetails,
     RatingCreate, RatingResponse,
     UserResponse, UserPublic,
-    AuctionWithDetails
+    AuctionWithDetails, BidWithUser
 )
 from app.api.deps import get_current_admin
-from app.services import trust_engine, auction_engine
+from app.services import (
+    trust_engine, trust_history_engine, auction_engine, calendar_engine, report_engine, outbox_engine,
+    archive_engine
+)
+from app.core.archive import BOOKINGS, AUCTIONS
+from app.core.config import settings
+from app.core.trust_history import downsample
+from app.core.fieldsets import schema_tree, parse_fields, dump_fields, project, wants
+from app.core.store_indexes import to_naive_utc
+from app.core.reporting import (
+    MAX_DAILY_REPORT_DAYS, METRICS, REVENUE, report_window, day_date, fleet_cutoff, summarize
+)
+from app.core.exports import (
+    BOOKING_EXPORT_COLUMNS, EXPORT_BATCH_SIZE, MEDIA_TYPES, encode_rows, attachment_headers
+)
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+# Fields the booking listing may ask for with ?fields=
+ADMIN_BOOKING_FIELDS = schema_tree(BookingWithDetails)
+
 
 # ============ Dashboard ============
 
 @router.get("/dashboard")
 def get_dashboard(
     admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get admin dashboard statistics"""
     total_users = db.query(User).filter(User.role == "user").count()
@@ -118,6 +140,7 @@ def update_car(
     
     car.updated_at = datetime.utcnow()
     db.commit()
+    read_coalescer.forget(("car", car_id))
     db.refresh(car)
     return car
 
@@ -150,6 +173,20 @@ def delete_car(
     
     db.delete(car)
     db.commit()
+    payload_cache.invalidate(car_id)
+    read_coalescer.forget(("car", car_id))
+
+
+@router.get("/metrics/db-pool")
+def get_db_pool_metrics(
+    reset: bool = False,
+    admin: User = Depends(get_current_admin)
+):
+    """Per-route database session use and pooled connection checkouts since start or last reset"""
+    routes = pool_metrics.snapshot()
+    if reset:
+        pool_metrics.reset()
+    return routes
 
 
 # ============ Booking Management ============
@@ -159,16 +196,46 @@ def list_all_bookings(
     status_filter: Optional[str] = Query(None, alias="status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    include_archived: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,user.name"),
     admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """List all bookings (admin view)"""
-    query = db.query(Booking)
+    """List all bookings (admin view); archived bookings follow the live ones"""
+    fields = parse_fields(fields, ADMIN_BOOKING_FIELDS)
+    query = db.query(Booking).options(*booking_details_options(fields))
     
     if status_filter:
         query = query.filter(Booking.status == status_filter)
     
-    return query.order_by(Booking.created_at.desc()).offset(skip).limit(limit).all()
+    bookings = query.order_by(Booking.created_at.desc()).offset(skip).limit(limit).all()
+    if include_archived and len(bookings) < limit:
+        live = skip + len(bookings) if bookings else query.count()
+        archived = archive_engine.scan(db, BOOKINGS, status_filter, max(skip - live, 0), limit - len(bookings))
+    else:
+        archived = []
+    
+    people, cars = {}, {}
+    archived = [
+        BookingWithDetails(
+            **bundle["booking"],
+            user=_cached_get(db, User, bundle["booking"]["user_id"], people) if wants(fields, "user") else None,
+            car=_cached_get(db, Car, bundle["booking"]["car_id"], cars) if wants(fields, "car") else None
+        )
+        for bundle in archived
+    ]
+    if fields is None:
+        return bookings + archived
+    return JSONResponse(
+        [dump_fields(BookingWithDetails, b, fields) for b in bookings]
+        + [project(b.model_dump(mode="json"), fields) for b in archived]
+    )
+
+
+def _cached_get(db: Session, model, record_id, cache: dict):
+    if record_id not in cache:
+        cache[record_id] = db.get(model, record_id)
+    return cache[record_id]
 
 
 @router.post("/bookings/{booking_id}/approve", response_model=BookingResponse)
@@ -193,6 +260,9 @@ def approve_booking(
     
     booking.status = BookingStatus.CONFIRMED.value
     booking.updated_at = datetime.utcnow()
+    calendar_engine.mark_booked(db, booking)
+    report_engine.booking_changed(db, booking, BookingStatus.PENDING.value)
+    outbox_engine.booking_changed(db, booking, BookingStatus.PENDING.value)
     db.commit()
     db.refresh(booking)
     return booking
@@ -218,8 +288,11 @@ def reject_booking(
             detail=f"Cannot reject booking with status: {booking.status}"
         )
     
+    previous = booking.status
     booking.status = BookingStatus.REJECTED.value
     booking.updated_at = datetime.utcnow()
+    report_engine.booking_changed(db, booking, previous)
+    outbox_engine.booking_changed(db, booking, previous)
     db.commit()
     db.refresh(booking)
     return booking
@@ -259,6 +332,7 @@ def start_ride(
         started_at=datetime.utcnow()
     )
     db.add(ride)
+    outbox_engine.ride_changed(db, ride, None)
     db.commit()
     db.refresh(ride)
     
@@ -287,9 +361,13 @@ def complete_ride(
     
     ride.status = RideStatus.COMPLETED.value
     ride.ended_at = datetime.utcnow()
+    outbox_engine.ride_changed(db, ride, RideStatus.ACTIVE.value)
     
     # Update booking status
+    previous = ride.booking.status
     ride.booking.status = BookingStatus.COMPLETED.value
+    report_engine.ride_completed(db, ride)
+    outbox_engine.booking_changed(db, ride.booking, previous)
     
     db.commit()
     db.refresh(ride)
@@ -336,7 +414,10 @@ def rate_ride(
     
     # Update ride status if damaged
     if rating_data.damage_flag:
+        previous = ride.status
         ride.status = RideStatus.DAMAGED.value
+        if previous != ride.status:
+            outbox_engine.ride_changed(db, ride, previous)
     
     db.commit()
     db.refresh(rating)
@@ -356,7 +437,7 @@ def list_users(
     limit: int = Query(50, ge=1, le=100),
     blocked_only: bool = Query(False),
     admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List all users (admin view)"""
     query = db.query(User).filter(User.role == "user")
@@ -364,23 +445,90 @@ def list_users(
     if blocked_only:
         query = query.filter(User.is_blocked == True)
     
-    return query.order_by(User.trust_score.desc()).offset(skip).limit(limit).all()
+    users = query.order_by(User.trust_score.desc()).offset(skip).limit(limit).all()
+    return json_list_response(_user_fragment(u, UserResponse) for u in users)
 
 
 @router.get("/users/leaderboard", response_model=List[UserPublic])
 def get_trust_leaderboard(
     limit: int = Query(10, ge=1, le=50),
     admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get top users by trust score"""
-    return (
+    users = (
         db.query(User)
         .filter(User.role == "user", User.is_blocked == False)
         .order_by(User.trust_score.desc())
         .limit(limit)
         .all()
     )
+    return json_list_response(_user_fragment(u, UserPublic) for u in users)
+
+
+def _user_fragment(user: User, schema) -> bytes:
+    """Cached JSON per user and schema; trust updates change updated_at"""
+    return payload_cache.fragment(
+        schema.__name__, user.id, user.updated_at,
+        lambda: schema.model_validate(user).model_dump_json().encode()
+    )
+
+
+@router.get("/users/{user_id}/rank")
+def get_user_rank(
+    user_id: UUID,
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get a user's position by trust score among users with the same role and block status"""
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    # Both counts are range scans on ix_users_leaderboard
+    peers = db.query(User).filter(User.role == user.role, User.is_blocked == user.is_blocked)
+    higher = peers.filter(User.trust_score > user.trust_score).count()
+    
+    return {
+        "user_id": str(user_id),
+        "trust_score": float(user.trust_score),
+        "rank": higher + 1,
+        "out_of": peers.count(),
+        "is_blocked": user.is_blocked,
+    }
+
+
+@router.get("/users/{user_id}/trust-history")
+def get_user_trust_history(
+    user_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    points: int = Query(200, ge=1, le=2000),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get a user's trust score history, downsampled to at most `points` buckets"""
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    history, total, downsampled = downsample(
+        trust_history_engine.get_events(db, user.id, start, end), points
+    )
+    
+    return {
+        "user_id": str(user_id),
+        "trust_score": float(user.trust_score),
+        "total_events": total,
+        "downsampled": downsampled,
+        "points": history,
+    }
 
 
 @router.post("/users/{user_id}/block")
@@ -434,18 +582,21 @@ def unblock_user(
 @router.get("/auctions", response_model=List[AuctionWithDetails])
 def list_all_auctions(
     status_filter: Optional[str] = Query(None, alias="status"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    include_archived: bool = False,
     admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """List all auctions (admin view)"""
-    query = db.query(Auction)
+    """List all auctions (admin view); archived auctions follow the live ones"""
+    query = db.query(Auction).options(*AUCTION_DETAILS)
     
     if status_filter:
         query = query.filter(Auction.status == status_filter)
     
-    auctions = query.order_by(Auction.created_at.desc()).all()
+    auctions = query.order_by(Auction.created_at.desc()).offset(skip).limit(limit).all()
     
-    return [
+    results = [
         AuctionWithDetails(
             id=a.id,
             car_id=a.car_id,
@@ -463,6 +614,22 @@ def list_all_auctions(
         )
         for a in auctions
     ]
+    if include_archived and len(auctions) < limit:
+        live = skip + len(auctions) if auctions else query.count()
+        people, cars = {}, {}
+        for bundle in archive_engine.scan(db, AUCTIONS, status_filter, max(skip - live, 0), limit - len(auctions)):
+            auction = bundle["auction"]
+            results.append(AuctionWithDetails(
+                **auction,
+                car=_cached_get(db, Car, auction["car_id"], cars),
+                winner=_cached_get(db, User, auction["winner_id"], people) if auction["winner_id"] else None,
+                bids=[
+                    BidWithUser(**bid, user=_cached_get(db, User, bid["user_id"], people))
+                    for bid in bundle["bids"]
+                ],
+                bid_count=len(bundle["bids"])
+            ))
+    return results
 
 
 @router.post("/auctions/{auction_id}/close")
@@ -486,9 +653,202 @@ def close_auction(
         )
     
     winning_booking = auction_engine.close_auction(db, auction)
+    read_coalescer.forget(("auction", auction_id))
     
     return {
         "message": "Auction closed",
         "winner_id": str(auction.winner_id) if auction.winner_id else None,
         "winning_booking_id": str(winning_booking.id) if winning_booking else None
     }
+
+
+# ============ Archive ============
+
+@router.post("/archive/run")
+def run_archive(
+    older_than_days: int = Query(settings.ARCHIVE_AFTER_DAYS, ge=0),
+    admin: User = Depends(get_current_admin)
+):
+    """Archive finished bookings and closed auctions last touched more than `older_than_days` ago"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    return {"cutoff": cutoff, "archived": archive_engine.archive_terminal(cutoff)}
+
+
+@router.get("/archive/stats")
+def get_archive_stats(
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Archived segments, records and compressed bytes per kind, plus live row counts"""
+    return archive_engine.stats(db)
+
+
+# ============ Exports ============
+
+def _booking_export_rows(bind, status_filter, start, end):
+    """
+    One joined SELECT read through a server-side cursor, EXPORT_BATCH_SIZE
+    rows at a time. Runs on its own session: the request's session is
+    closed once the endpoint returns, before the body is streamed.
+    """
+    db = Session(bind=bind)
+    try:
+        query = (
+            db.query(
+                Booking.id,
+                Booking.status,
+                Booking.start_time,
+                Booking.end_time,
+                Booking.offer_price,
+                Booking.created_at,
+                Booking.updated_at,
+                Booking.car_id,
+                Car.model,
+                Car.number_plate,
+                Booking.user_id,
+                User.name,
+                User.email,
+                User.trust_score,
+            )
+            .join(Car, Car.id == Booking.car_id)
+            .join(User, User.id == Booking.user_id)
+        )
+        
+        if status_filter:
+            query = query.filter(Booking.status == status_filter)
+        if start:
+            query = query.filter(Booking.start_time >= start)
+        if end:
+            query = query.filter(Booking.start_time < end)
+        
+        query = (
+            query.order_by(Booking.created_at, Booking.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for row in query:
+            yield tuple(row)
+    finally:
+        db.close()
+
+
+@router.get("/exports/bookings")
+def export_bookings(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Stream every booking starting in [start, end) as CSV or NDJSON, oldest first"""
+    start = to_naive_utc(start) if start else None
+    end = to_naive_utc(end) if end else None
+    if start and end and start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    
+    rows = _booking_export_rows(db.get_bind(), status_filter, start, end)
+    return StreamingResponse(
+        encode_rows(fmt, BOOKING_EXPORT_COLUMNS, rows),
+        media_type=MEDIA_TYPES[fmt],
+        headers=attachment_headers("bookings", fmt)
+    )
+
+
+# ============ Reports ============
+
+def _report_window(start, end, max_days=None):
+    try:
+        return report_window(start, end, max_days)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/reports/fleet")
+def get_fleet_report(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Fleet-wide utilization, revenue and auction totals for [start, end]"""
+    start, end = _report_window(start, end)
+    days = (end - start).days + 1
+    cars = db.query(Car).filter(Car.created_at < fleet_cutoff(end)).count()
+    totals = report_engine.fleet_totals(db, start, end)
+    
+    return {
+        "start": start,
+        "end": end,
+        "cars": cars,
+        **summarize(totals, days, cars),
+    }
+
+
+@router.get("/reports/cars")
+def get_car_reports(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Per-car totals for [start, end], highest revenue first"""
+    start, end = _report_window(start, end)
+    days = (end - start).days + 1
+    totals_by_car = report_engine.car_totals(db, start, end)
+    empty = [0] * len(METRICS)
+    
+    rows = [
+        (car_id, model, number_plate, totals_by_car.get(car_id, empty))
+        for car_id, model, number_plate in db.query(Car.id, Car.model, Car.number_plate)
+    ]
+    rows.sort(key=lambda row: row[3][REVENUE], reverse=True)
+    
+    return [
+        {
+            "car_id": str(car_id),
+            "model": model,
+            "number_plate": number_plate,
+            **summarize(totals, days),
+        }
+        for car_id, model, number_plate, totals in rows
+    ]
+
+
+@router.get("/reports/daily")
+def get_daily_report(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    car_id: Optional[UUID] = None,
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Per-day series for one car or the fleet; days without activity are omitted"""
+    start, end = _report_window(start, end, MAX_DAILY_REPORT_DAYS)
+    
+    if car_id:
+        if not db.query(Car.id).filter(Car.id == car_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Car not found"
+            )
+        cars = 1
+    else:
+        cars = db.query(Car).filter(Car.created_at < fleet_cutoff(end)).count()
+    
+    series = report_engine.daily(db, start, end, car_id)
+    
+    return {
+        "start": start,
+        "end": end,
+        "car_id": str(car_id) if car_id else None,
+        "days": [
+            {"date": day_date(day), **summarize(totals, 1, cars)}
+            for day, totals in series
+        ],
+    }
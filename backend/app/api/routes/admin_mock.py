@@ -1,12 +1,23 @@
 from typing import List, Optional
 from uuid import UUID, uuid4
-from datetime import datetime
-from decimal import Decimal
+from datetime import date, datetime, timedelta
 from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from app.core.mock_store import store, Car, Ride, Rating
-from app.api.routes.auth_mock import get_current_user, get_current_admin, user_to_response, User
+from app.api.routes.auth_mock import get_current_user, get_current_admin, user_to_response, user_fragment, User
 from app.core.config import settings
+from app.core.fixed_point import to_paise, paise_to_float, centi_to_float
+from app.core.trust_history import downsample
+from app.core.store_indexes import to_naive_utc
+from app.core.exports import BOOKING_EXPORT_COLUMNS, MEDIA_TYPES, encode_rows, attachment_headers
+from app.core.loaders import StoreLoaders, get_store_loaders
+from app.core.payload_cache import payload_cache, json_list_response
+from app.core.single_flight import read_coalescer
+from app.core.fieldsets import FieldTree, field_tree, parse_fields, project, wants
+from app.core.reporting import (
+    MAX_DAILY_REPORT_DAYS, METRICS, REVENUE, report_window, day_index, day_date, fleet_cutoff, summarize
+)
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -52,8 +63,8 @@ def car_to_response(car: Car) -> dict:
         "id": str(car.id),
         "model": car.model,
         "number_plate": car.number_plate,
-        "daily_price": float(car.daily_price),
-        "deposit": float(car.deposit),
+        "daily_price": paise_to_float(car.daily_price),
+        "deposit": paise_to_float(car.deposit),
         "image_url": car.image_url,
         "seats": car.seats,
         "transmission": car.transmission,
@@ -63,19 +74,49 @@ def car_to_response(car: Car) -> dict:
     }
 
 
-def booking_with_details(booking):
-    car = store.get_car_by_id(booking.car_id)
-    user = store.get_user_by_id(booking.user_id)
-    ride = store.get_ride_by_booking(booking.id)
-    rating = store.get_rating_by_ride(ride.id) if ride else None
+# Fields the admin booking listing may ask for with ?fields=
+BOOKING_FIELDS = field_tree(
+    "id", "user_id", "car_id", "start_time", "end_time", "offer_price", "status", "created_at",
+    car=(
+        "id", "model", "number_plate", "daily_price", "deposit", "image_url",
+        "seats", "transmission", "fuel_type", "description", "is_active",
+    ),
+    user=(
+        "id", "name", "email", "phone", "role", "total_rides", "avg_rating",
+        "damage_count", "rash_count", "trust_score", "is_blocked",
+    ),
+    ride=("id", "status", "started_at", "ended_at", "rating"),
+)
+
+
+def booking_with_details(booking, loaders: Optional[StoreLoaders] = None, fields: Optional[FieldTree] = None):
+    loaders = loaders or get_store_loaders()
+    ride = loaders.rides.load(booking.id) if wants(fields, "ride") else None
+    rating = loaders.ratings.load(ride.id) if ride else None
+    return _booking_details(booking, ride, rating, loaders, fields)
+
+
+def archived_booking_with_details(
+    bundle: dict,
+    loaders: Optional[StoreLoaders] = None,
+    fields: Optional[FieldTree] = None
+):
+    return _booking_details(
+        bundle["booking"], bundle["ride"], bundle["rating"], loaders or get_store_loaders(), fields
+    )
+
+
+def _booking_details(booking, ride, rating, loaders: StoreLoaders, fields: Optional[FieldTree] = None):
+    car = loaders.cars.load(booking.car_id) if wants(fields, "car") else None
+    user = loaders.users.load(booking.user_id) if wants(fields, "user") else None
     
-    return {
+    return project({
         "id": str(booking.id),
         "user_id": str(booking.user_id),
         "car_id": str(booking.car_id),
         "start_time": booking.start_time.isoformat(),
         "end_time": booking.end_time.isoformat(),
-        "offer_price": float(booking.offer_price),
+        "offer_price": paise_to_float(booking.offer_price),
         "status": booking.status,
         "created_at": booking.created_at.isoformat(),
         "car": car_to_response(car) if car else None,
@@ -93,7 +134,7 @@ def booking_with_details(booking):
                 "notes": rating.notes,
             } if rating else None
         } if ride else None
-    }
+    }, fields)
 
 
 # ============ Dashboard ============
@@ -101,28 +142,28 @@ def booking_with_details(booking):
 @router.get("/dashboard")
 def get_dashboard(admin: User = Depends(get_current_admin)):
     """Get admin dashboard statistics"""
-    users = [u for u in store.users.values() if u.role == "user"]
+    counts = store.get_counts()
     
     return {
         "users": {
-            "total": len(users),
-            "blocked": len([u for u in users if u.is_blocked]),
-            "active": len([u for u in users if not u.is_blocked])
+            "total": counts["users"],
+            "blocked": counts["blocked_users"],
+            "active": counts["users"] - counts["blocked_users"]
         },
         "cars": {
-            "total": len(store.cars),
-            "active": len([c for c in store.cars.values() if c.is_active]),
-            "inactive": len([c for c in store.cars.values() if not c.is_active])
+            "total": counts["cars"],
+            "active": counts["active_cars"],
+            "inactive": counts["cars"] - counts["active_cars"]
         },
         "bookings": {
-            "pending": len([b for b in store.bookings.values() if b.status == "pending"]),
-            "active": len([b for b in store.bookings.values() if b.status == "confirmed"])
+            "pending": counts["pending_bookings"],
+            "active": counts["confirmed_bookings"]
         },
         "auctions": {
-            "active": len([a for a in store.auctions.values() if a.status == "active"])
+            "active": counts["active_auctions"]
         },
         "rides": {
-            "active": len([r for r in store.rides.values() if r.status == "active"])
+            "active": counts["active_rides"]
         }
     }
 
@@ -133,19 +174,18 @@ def get_dashboard(admin: User = Depends(get_current_admin)):
 def add_car(car_data: CarCreate, admin: User = Depends(get_current_admin)):
     """Add a new car to the fleet"""
     # Check for duplicate number plate
-    for car in store.cars.values():
-        if car.number_plate == car_data.number_plate:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Car with this number plate already exists"
-            )
+    if store.get_car_by_plate(car_data.number_plate):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Car with this number plate already exists"
+        )
     
     car = Car(
         id=uuid4(),
         model=car_data.model,
         number_plate=car_data.number_plate,
-        daily_price=Decimal(str(car_data.daily_price)),
-        deposit=Decimal(str(car_data.deposit)),
+        daily_price=to_paise(car_data.daily_price),
+        deposit=to_paise(car_data.deposit),
         image_url=car_data.image_url,
         seats=car_data.seats,
         transmission=car_data.transmission,
@@ -170,11 +210,12 @@ def update_car(car_id: str, car_data: CarUpdate, admin: User = Depends(get_curre
     
     update_data = car_data.dict(exclude_unset=True)
     if "daily_price" in update_data:
-        update_data["daily_price"] = Decimal(str(update_data["daily_price"]))
+        update_data["daily_price"] = to_paise(update_data["daily_price"])
     if "deposit" in update_data:
-        update_data["deposit"] = Decimal(str(update_data["deposit"]))
+        update_data["deposit"] = to_paise(update_data["deposit"])
     
-    store.update_car(UUID(car_id), update_data)
+    car = store.update_car(UUID(car_id), update_data)
+    read_coalescer.forget(("car", car.id))
     
     return car_to_response(car)
 
@@ -191,14 +232,15 @@ def delete_car(car_id: str, admin: User = Depends(get_current_admin)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
     
     # Check for active bookings
-    for booking in store.bookings.values():
-        if booking.car_id == UUID(car_id) and booking.status in ["confirmed", "pending"]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot delete car with active bookings"
-            )
+    if store.car_has_bookings(UUID(car_id), ["confirmed", "pending"]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete car with active bookings"
+        )
     
     store.delete_car(UUID(car_id))
+    payload_cache.invalidate(UUID(car_id))
+    read_coalescer.forget(("car", UUID(car_id)))
 
 
 # ============ Booking Management ============
@@ -208,12 +250,23 @@ def list_all_bookings(
     status_filter: Optional[str] = Query(None, alias="status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    admin: User = Depends(get_current_admin)
+    include_archived: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,user.name"),
+    admin: User = Depends(get_current_admin),
+    loaders: StoreLoaders = Depends(get_store_loaders)
 ):
-    """List all bookings (admin view)"""
+    """List all bookings (admin view); archived bookings follow the live ones"""
+    fields = parse_fields(fields, BOOKING_FIELDS)
+    users, cars = wants(fields, "user"), wants(fields, "car")
     bookings = store.get_all_bookings(status_filter)
-    bookings = bookings[skip:skip + limit]
-    return [booking_with_details(b) for b in bookings]
+    live = bookings[skip:skip + limit]
+    loaders.prime_bookings(live, rides=wants(fields, "ride"), users=users, cars=cars)
+    page = [booking_with_details(b, loaders, fields) for b in live]
+    if include_archived and len(page) < limit:
+        archived = store.get_archived_bookings(status_filter, max(skip - len(bookings), 0), limit - len(page))
+        loaders.prime_bookings([bundle["booking"] for bundle in archived], users=users, cars=cars)
+        page.extend(archived_booking_with_details(bundle, loaders, fields) for bundle in archived)
+    return page
 
 
 @router.post("/bookings/{booking_id}/approve")
@@ -233,8 +286,8 @@ def approve_booking(booking_id: str, admin: User = Depends(get_current_admin)):
             detail=f"Cannot approve booking with status: {booking.status}"
         )
     
-    booking.status = "confirmed"
-    booking.updated_at = datetime.utcnow()
+    if not store.update_booking_status(booking, "confirmed", only_from=["pending"]):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Booking was changed by another request")
     
     return booking_with_details(booking)
 
@@ -256,8 +309,8 @@ def reject_booking(booking_id: str, admin: User = Depends(get_current_admin)):
             detail=f"Cannot reject booking with status: {booking.status}"
         )
     
-    booking.status = "rejected"
-    booking.updated_at = datetime.utcnow()
+    if not store.update_booking_status(booking, "rejected", only_from=["pending", "competing"]):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Booking was changed by another request")
     
     return booking_with_details(booking)
 
@@ -283,7 +336,8 @@ def start_ride(booking_id: str, admin: User = Depends(get_current_admin)):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ride already started")
     
     ride = Ride(id=uuid4(), booking_id=booking.id)
-    store.create_ride(ride)
+    if not store.create_ride(ride):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ride already started")
     
     return {"message": "Ride started", "ride_id": str(ride.id)}
 
@@ -302,13 +356,13 @@ def complete_ride(ride_id: str, admin: User = Depends(get_current_admin)):
     if ride.status != "active":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only active rides can be completed")
     
-    ride.status = "completed"
-    ride.ended_at = datetime.utcnow()
+    if not store.update_ride_status(ride, "completed", only_from=["active"]):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only active rides can be completed")
     
     # Update booking status
     booking = store.get_booking_by_id(ride.booking_id)
     if booking:
-        booking.status = "completed"
+        store.update_booking_status(booking, "completed")
     
     return {"message": "Ride completed", "ride_id": str(ride.id)}
 
@@ -340,37 +394,20 @@ def rate_ride(ride_id: str, rating_data: RatingCreate, admin: User = Depends(get
         rash_flag=rating_data.rash_flag,
         notes=rating_data.notes
     )
-    store.create_rating(rating)
+    if not store.create_rating(rating):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ride already rated")
     
     # Update ride status if damaged
     if rating_data.damage_flag:
-        ride.status = "damaged"
+        store.update_ride_status(ride, "damaged")
     
-    # Update user trust score
+    # Update user counters and trust score in one store call (re-ranks the
+    # user on the leaderboard, auto-blocks below the threshold)
     booking = store.get_booking_by_id(ride.booking_id)
     if booking:
-        user = store.get_user_by_id(booking.user_id)
-        if user:
-            # Increment ride count
-            user.total_rides += 1
-            
-            # Update average rating
-            old_avg = float(user.avg_rating)
-            new_avg = ((old_avg * (user.total_rides - 1)) + rating_data.driving_rating) / user.total_rides
-            user.avg_rating = Decimal(str(round(new_avg, 2)))
-            
-            # Update incident counts
-            if rating_data.damage_flag:
-                user.damage_count += 1
-            if rating_data.rash_flag:
-                user.rash_count += 1
-            
-            # Recalculate trust score
-            user.trust_score = user.calculate_trust_score()
-            
-            # Auto-block check
-            if float(user.trust_score) < settings.AUTO_BLOCK_THRESHOLD:
-                user.is_blocked = True
+        store.record_rating(
+            booking.user_id, rating_data.driving_rating, rating_data.damage_flag, rating_data.rash_flag
+        )
     
     return {
         "id": str(rating.id),
@@ -392,9 +429,8 @@ def list_users(
     admin: User = Depends(get_current_admin)
 ):
     """List all users (admin view)"""
-    users = store.get_all_users(role="user", blocked_only=blocked_only)
-    users = users[skip:skip + limit]
-    return [user_to_response(u) for u in users]
+    users = store.get_all_users(role="user", blocked_only=blocked_only, skip=skip, limit=limit)
+    return json_list_response(user_fragment(u) for u in users)
 
 
 @router.get("/users/leaderboard")
@@ -403,9 +439,60 @@ def get_trust_leaderboard(
     admin: User = Depends(get_current_admin)
 ):
     """Get top users by trust score"""
-    users = [u for u in store.users.values() if u.role == "user" and not u.is_blocked]
-    users = sorted(users, key=lambda u: float(u.trust_score), reverse=True)[:limit]
-    return [user_to_response(u) for u in users]
+    users = store.get_leaderboard(limit)
+    return json_list_response(user_fragment(u) for u in users)
+
+
+@router.get("/users/{user_id}/rank")
+def get_user_rank(user_id: str, admin: User = Depends(get_current_admin)):
+    """Get a user's position by trust score among users with the same role and block status"""
+    try:
+        user = store.get_user_by_id(UUID(user_id))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    
+    rank, out_of = store.get_user_rank(user.id)
+    
+    return {
+        "user_id": user_id,
+        "trust_score": centi_to_float(user.trust_score),
+        "rank": rank,
+        "out_of": out_of,
+        "is_blocked": user.is_blocked,
+    }
+
+
+@router.get("/users/{user_id}/trust-history")
+def get_user_trust_history(
+    user_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    points: int = Query(200, ge=1, le=2000),
+    admin: User = Depends(get_current_admin)
+):
+    """Get a user's trust score history, downsampled to at most `points` buckets"""
+    try:
+        user = store.get_user_by_id(UUID(user_id))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    
+    history, total, downsampled = downsample(
+        store.get_trust_events(user.id, start, end), points
+    )
+    
+    return {
+        "user_id": user_id,
+        "trust_score": centi_to_float(user.trust_score),
+        "total_events": total,
+        "downsampled": downsampled,
+        "points": history,
+    }
 
 
 @router.post("/users/{user_id}/block")
@@ -422,7 +509,7 @@ def block_user(user_id: str, admin: User = Depends(get_current_admin)):
     if user.role == "admin":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot block admin users")
     
-    user.is_blocked = True
+    store.update_user(user.id, {"is_blocked": True})
     
     return {"message": "User blocked", "user_id": user_id}
 
@@ -438,7 +525,7 @@ def unblock_user(user_id: str, admin: User = Depends(get_current_admin)):
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    user.is_blocked = False
+    store.update_user(user.id, {"is_blocked": False})
     
     return {"message": "User unblocked", "user_id": user_id}
 
@@ -448,13 +535,28 @@ def unblock_user(user_id: str, admin: User = Depends(get_current_admin)):
 @router.get("/auctions")
 def list_all_auctions(
     status_filter: Optional[str] = Query(None, alias="status"),
-    admin: User = Depends(get_current_admin)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    include_archived: bool = False,
+    admin: User = Depends(get_current_admin),
+    loaders: StoreLoaders = Depends(get_store_loaders)
 ):
-    """List all auctions (admin view)"""
+    """List all auctions (admin view); archived auctions follow the live ones"""
     from app.api.routes.auctions_mock import auction_to_response
     
     auctions = store.get_all_auctions(status_filter)
-    return [auction_to_response(a) for a in auctions]
+    live = auctions[skip:skip + limit]
+    loaders.prime_auctions(live, bids=True)
+    results = [auction_to_response(a, loaders=loaders) for a in live]
+    if include_archived and len(results) < limit:
+        archived = store.get_archived_auctions(status_filter, max(skip - len(auctions), 0), limit - len(results))
+        loaders.prime_auctions([bundle["auction"] for bundle in archived])
+        loaders.users.prime(bid.user_id for bundle in archived for bid in bundle["bids"])
+        results.extend(
+            auction_to_response(bundle["auction"], bids=bundle["bids"], loaders=loaders)
+            for bundle in archived
+        )
+    return results
 
 
 @router.post("/auctions/{auction_id}/close")
@@ -471,51 +573,186 @@ def close_auction(auction_id: str, admin: User = Depends(get_current_admin)):
     if auction.status != "active":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction is already closed")
     
-    bids = store.get_auction_bids(auction.id)
+    # Scores, winner and booking updates happen in the one store call that
+    # closes the auction, so concurrent closes cannot both go through
+    closed = store.close_auction(auction.id)
+    if closed is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction is already closed")
+    auction, winner_bid = closed
+    read_coalescer.forget(("auction", auction.id))
     
-    if not bids:
-        auction.status = "closed"
+    if winner_bid is None:
         return {"message": "Auction closed with no bids", "winner_id": None}
     
-    # Calculate final scores
-    max_trust = max(float(b.trust_score_snapshot) for b in bids) or 1
-    max_rides = max(store.get_user_by_id(b.user_id).total_rides for b in bids) or 1
-    max_price = max(float(b.offer_price) for b in bids) or 1
-    
-    for bid in bids:
-        user = store.get_user_by_id(bid.user_id)
-        normalized_trust = float(bid.trust_score_snapshot) / max_trust
-        normalized_rides = (user.total_rides if user else 0) / max_rides
-        normalized_price = float(bid.offer_price) / max_price
-        
-        bid.final_score = Decimal(str(round(
-            0.5 * normalized_trust + 0.3 * normalized_rides + 0.2 * normalized_price, 4
-        )))
-    
-    # Determine winner
-    eligible_bids = [b for b in bids if float(b.trust_score_snapshot) >= settings.TRUST_THRESHOLD]
-    
-    if eligible_bids:
-        winner_bid = max(eligible_bids, key=lambda b: float(b.final_score or 0))
-    else:
-        winner_bid = max(bids, key=lambda b: float(b.offer_price))
-    
-    # Update auction
-    auction.status = "closed"
-    auction.winner_id = winner_bid.user_id
-    auction.auction_end = datetime.utcnow()
-    
-    # Update bookings
-    for bid in bids:
-        booking = store.get_booking_by_id(bid.booking_id)
-        if booking:
-            if bid.id == winner_bid.id:
-                booking.status = "confirmed"
-            else:
-                booking.status = "rejected"
-    
     return {
         "message": "Auction closed",
         "winner_id": str(auction.winner_id),
         "winning_booking_id": str(winner_bid.booking_id)
     }
+
+
+# ============ Archive ============
+
+@router.post("/archive/run")
+def run_archive(
+    older_than_days: int = Query(settings.ARCHIVE_AFTER_DAYS, ge=0),
+    admin: User = Depends(get_current_admin)
+):
+    """Archive finished bookings and closed auctions last touched more than `older_than_days` ago"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    return {"cutoff": cutoff, "archived": store.archive_terminal(cutoff)}
+
+
+@router.get("/archive/stats")
+def get_archive_stats(admin: User = Depends(get_current_admin)):
+    """Archived segments, records and compressed bytes per kind, plus live record counts"""
+    return store.get_archive_stats()
+
+
+# ============ Exports ============
+
+def _booking_export_rows(bookings):
+    # Memoized lookups stand in for the car/user joins
+    cars, users = {}, {}
+    for booking in bookings:
+        if booking.car_id not in cars:
+            cars[booking.car_id] = store.get_car_by_id(booking.car_id)
+        if booking.user_id not in users:
+            users[booking.user_id] = store.get_user_by_id(booking.user_id)
+        car = cars[booking.car_id]
+        user = users[booking.user_id]
+        yield (
+            booking.id,
+            booking.status,
+            booking.start_time,
+            booking.end_time,
+            paise_to_float(booking.offer_price),
+            booking.created_at,
+            booking.updated_at,
+            booking.car_id,
+            car.model if car else None,
+            car.number_plate if car else None,
+            booking.user_id,
+            user.name if user else None,
+            user.email if user else None,
+            centi_to_float(user.trust_score) if user else None,
+        )
+
+
+@router.get("/exports/bookings")
+def export_bookings(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    admin: User = Depends(get_current_admin)
+):
+    """Stream every booking starting in [start, end) as CSV or NDJSON, oldest first"""
+    start = to_naive_utc(start) if start else None
+    end = to_naive_utc(end) if end else None
+    if start and end and start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    
+    rows = _booking_export_rows(store.iter_bookings(status_filter, start, end))
+    return StreamingResponse(
+        encode_rows(fmt, BOOKING_EXPORT_COLUMNS, rows),
+        media_type=MEDIA_TYPES[fmt],
+        headers=attachment_headers("bookings", fmt)
+    )
+
+
+# ============ Reports ============
+
+def _report_window(start, end, max_days=None):
+    try:
+        return report_window(start, end, max_days)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/reports/fleet")
+def get_fleet_report(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    admin: User = Depends(get_current_admin)
+):
+    """Fleet-wide utilization, revenue and auction totals for [start, end]"""
+    start, end = _report_window(start, end)
+    days = (end - start).days + 1
+    cars = store.get_car_count(fleet_cutoff(end))
+    totals = store.get_fleet_totals(day_index(start), day_index(end))
+    
+    return {
+        "start": start,
+        "end": end,
+        "cars": cars,
+        **summarize(totals, days, cars),
+    }
+
+
+@router.get("/reports/cars")
+def get_car_reports(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    admin: User = Depends(get_current_admin)
+):
+    """Per-car totals for [start, end], highest revenue first"""
+    start, end = _report_window(start, end)
+    days = (end - start).days + 1
+    first_day, last_day = day_index(start), day_index(end)
+    
+    totals_by_car = store.get_car_totals(first_day, last_day)
+    empty = [0] * len(METRICS)
+    # A car created after the totals were read has none yet
+    rows = [
+        (car, totals_by_car.get(car.id, empty))
+        for car in store.get_all_cars(active_only=False)
+    ]
+    rows.sort(key=lambda row: row[1][REVENUE], reverse=True)
+    
+    return [
+        {
+            "car_id": str(car.id),
+            "model": car.model,
+            "number_plate": car.number_plate,
+            **summarize(totals, days),
+        }
+        for car, totals in rows
+    ]
+
+
+@router.get("/reports/daily")
+def get_daily_report(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    car_id: Optional[str] = None,
+    admin: User = Depends(get_current_admin)
+):
+    """Per-day series for one car or the fleet; days without activity are omitted"""
+    start, end = _report_window(start, end, MAX_DAILY_REPORT_DAYS)
+    
+    cars = store.get_car_count(fleet_cutoff(end))
+    car_uuid = None
+    if car_id:
+        try:
+            car_uuid = UUID(car_id)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
+        if not store.get_car_by_id(car_uuid):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
+        cars = 1
+    
+    series = store.get_daily_totals(day_index(start), day_index(end), car_uuid)
+    
+    return {
+        "start": start,
+        "end": end,
+        "car_id": car_id,
+        "days": [
+            {"date": day_date(day), **summarize(totals, 1, cars)}
+            for day, totals in series
+        ],
+    }
@@ -1,16 +1,21 @@
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models import User, Auction, Bid, Booking, AuctionStatus, BookingStatus
+from app.models.loaders import AUCTION_DETAILS, AUCTION_SUMMARY
 from app.schemas import (
     AuctionResponse, AuctionWithDetails, AuctionSummary,
     BidCreate, BidResponse, BidWithUser
 )
 from app.api.deps import get_current_active_user
-from app.services import auction_engine
+from app.services import auction_engine, outbox_engine, report_engine
+from app.core.idempotency import fingerprint, IDEMPOTENCY_HEADER
+from app.services.idempotency_engine import idempotency_store
+from app.core.payload_cache import json_response
+from app.core.single_flight import read_coalescer
 
 router = APIRouter(prefix="/auctions", tags=["Auctions"])
 
@@ -20,10 +25,10 @@ def list_auctions(
     status_filter: Optional[str] = Query(None, alias="status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List all auctions"""
-    query = db.query(Auction)
+    query = db.query(Auction).options(*AUCTION_SUMMARY)
     
     if status_filter:
         query = query.filter(Auction.status == status_filter)
@@ -81,17 +86,25 @@ def get_my_auctions(
 def get_auction(
     auction_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get auction details with all bids"""
-    auction = db.query(Auction).filter(Auction.id == auction_id).first()
+    """Get auction details with all bids; concurrent requests share one build"""
+    payload = read_coalescer.do(("auction", auction_id), lambda: _auction_payload(db, auction_id))
     
-    if not auction:
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Auction not found"
         )
     
+    return json_response(payload)
+
+
+def _auction_payload(db: Session, auction_id: UUID) -> Optional[bytes]:
+    auction = db.query(Auction).filter(Auction.id == auction_id).options(*AUCTION_DETAILS).first()
+    if not auction:
+        return None
+    
     return AuctionWithDetails(
         id=auction.id,
         car_id=auction.car_id,
@@ -106,7 +119,7 @@ def get_auction(
         winner=auction.winner,
         bids=auction.bids,
         bid_count=len(auction.bids)
-    )
+    ).model_dump_json().encode()
 
 
 @router.post("/{auction_id}/bid", response_model=BidResponse)
@@ -114,9 +127,22 @@ def place_bid(
     auction_id: UUID,
     bid_data: BidCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
-    """Place or update a bid on an auction"""
+    """Place or update a bid on an auction; retries with the same Idempotency-Key replay the first response"""
+    with idempotency_store(db).call(
+        current_user.id, "POST /auctions/{auction_id}/bid", idempotency_key,
+        fingerprint(auction_id, bid_data)
+    ) as call:
+        if call.replay:
+            return call.replay
+        bid = _place_bid(auction_id, bid_data, current_user, db)
+        read_coalescer.forget(("auction", auction_id))
+        return call.done(BidResponse.model_validate(bid))
+
+
+def _place_bid(auction_id: UUID, bid_data: BidCreate, current_user: User, db: Session) -> Bid:
     auction = db.query(Auction).filter(Auction.id == auction_id).first()
     
     if not auction:
@@ -145,6 +171,7 @@ def place_bid(
         
         # Update the associated booking
         existing_bid.booking.offer_price = bid_data.offer_price
+        outbox_engine.bid_placed(db, existing_bid)
         
         db.commit()
         db.refresh(existing_bid)
@@ -160,8 +187,10 @@ def place_bid(
             status=BookingStatus.COMPETING.value
         )
         db.add(booking)
-        db.commit()
-        db.refresh(booking)
+        db.flush()
+        report_engine.booking_changed(db, booking, None)
+        outbox_engine.booking_changed(db, booking, None)
         
+        # Commits the booking with its bid
         bid = auction_engine.create_or_update_bid(db, auction, booking, current_user)
         return bid
@@ -1,40 +1,46 @@
 from typing import List, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 from datetime import datetime
-from decimal import Decimal
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Header
 from pydantic import BaseModel
-from app.core.mock_store import store, Booking, Bid
+from app.core.mock_store import store, idempotency_store
 from app.api.routes.auth_mock import get_current_user, User
+from app.core.fixed_point import to_paise, paise_to_float, centi_to_float, score_to_float
+from app.core.idempotency import fingerprint, IDEMPOTENCY_HEADER
+from app.core.loaders import StoreLoaders, get_store_loaders
+from app.core.payload_cache import encode_json, json_response
+from app.core.single_flight import read_coalescer
 
 router = APIRouter(prefix="/auctions", tags=["Auctions"])
 
 
 # ============ Helpers ============
 
-def auction_to_response(auction, include_bids=True):
-    car = store.get_car_by_id(auction.car_id)
-    winner = store.get_user_by_id(auction.winner_id) if auction.winner_id else None
-    bids = store.get_auction_bids(auction.id) if include_bids else []
+def auction_to_response(auction, include_bids=True, bids=None, loaders: Optional[StoreLoaders] = None):
+    loaders = loaders or get_store_loaders()
+    car = loaders.cars.load(auction.car_id)
+    winner = loaders.users.load(auction.winner_id)
+    if bids is None:
+        bids = loaders.bids.load(auction.id) if include_bids else []
     
     bids_response = []
     for bid in bids:
-        bid_user = store.get_user_by_id(bid.user_id)
+        bid_user = loaders.users.load(bid.user_id)
         bids_response.append({
             "id": str(bid.id),
             "auction_id": str(bid.auction_id),
             "user_id": str(bid.user_id),
             "booking_id": str(bid.booking_id),
-            "offer_price": float(bid.offer_price),
-            "trust_score_snapshot": float(bid.trust_score_snapshot),
-            "final_score": float(bid.final_score) if bid.final_score else None,
+            "offer_price": paise_to_float(bid.offer_price),
+            "trust_score_snapshot": centi_to_float(bid.trust_score_snapshot),
+            "final_score": score_to_float(bid.final_score) if bid.final_score is not None else None,
             "created_at": bid.created_at.isoformat(),
             "user": {
                 "id": str(bid_user.id),
                 "name": bid_user.name,
                 "total_rides": bid_user.total_rides,
-                "avg_rating": float(bid_user.avg_rating),
-                "trust_score": float(bid_user.trust_score),
+                "avg_rating": centi_to_float(bid_user.avg_rating),
+                "trust_score": centi_to_float(bid_user.trust_score),
                 "is_blocked": bid_user.is_blocked,
             } if bid_user else None
         })
@@ -52,13 +58,13 @@ def auction_to_response(auction, include_bids=True):
         "winner_id": str(auction.winner_id) if auction.winner_id else None,
         "created_at": auction.created_at.isoformat(),
         "bid_count": len(bids),
-        "highest_bid": float(highest_bid) if highest_bid else None,
+        "highest_bid": paise_to_float(highest_bid) if highest_bid else None,
         "car": {
             "id": str(car.id),
             "model": car.model,
             "number_plate": car.number_plate,
-            "daily_price": float(car.daily_price),
-            "deposit": float(car.deposit),
+            "daily_price": paise_to_float(car.daily_price),
+            "deposit": paise_to_float(car.deposit),
             "image_url": car.image_url,
             "seats": car.seats,
             "transmission": car.transmission,
@@ -67,7 +73,7 @@ def auction_to_response(auction, include_bids=True):
         "winner": {
             "id": str(winner.id),
             "name": winner.name,
-            "trust_score": float(winner.trust_score),
+            "trust_score": centi_to_float(winner.trust_score),
         } if winner else None,
         "bids": bids_response if include_bids else [],
     }
@@ -80,18 +86,24 @@ def list_auctions(
     status_filter: Optional[str] = Query(None, alias="status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    loaders: StoreLoaders = Depends(get_store_loaders)
 ):
     """List all auctions"""
     auctions = store.get_all_auctions(status_filter)
     auctions = auctions[skip:skip + limit]
-    return [auction_to_response(a, include_bids=False) for a in auctions]
+    loaders.prime_auctions(auctions)
+    return [auction_to_response(a, include_bids=False, loaders=loaders) for a in auctions]
 
 
 @router.get("/my")
-def get_my_auctions(current_user: User = Depends(get_current_user)):
+def get_my_auctions(
+    current_user: User = Depends(get_current_user),
+    loaders: StoreLoaders = Depends(get_store_loaders)
+):
     """Get auctions the current user is participating in"""
     auctions = store.get_auctions_by_user(current_user.id)
-    return [auction_to_response(a) for a in auctions]
+    loaders.prime_auctions(auctions, bids=True)
+    return [auction_to_response(a, loaders=loaders) for a in auctions]
 
 
 @router.get("/{auction_id}")
@@ -99,25 +111,44 @@ def get_auction(
     auction_id: str,
     current_user: User = Depends(get_current_user)
 ):
-    """Get auction details with all bids"""
+    """Get auction details with all bids; concurrent requests share one build"""
     try:
-        auction = store.get_auction_by_id(UUID(auction_id))
+        auction_uuid = UUID(auction_id)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Auction not found")
     
-    if not auction:
+    payload = read_coalescer.do(("auction", auction_uuid), lambda: _auction_payload(auction_uuid))
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Auction not found")
     
-    return auction_to_response(auction)
+    return json_response(payload)
+
+
+def _auction_payload(auction_id: UUID) -> Optional[bytes]:
+    auction = store.get_auction_by_id(auction_id)
+    return encode_json(auction_to_response(auction)) if auction else None
 
 
 @router.post("/{auction_id}/bid")
 def place_bid(
     auction_id: str,
     offer_price: float = Query(..., gt=0),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
-    """Place or update a bid on an auction"""
+    """Place or update a bid on an auction; retries with the same Idempotency-Key replay the first response"""
+    with idempotency_store.call(
+        current_user.id, "POST /auctions/{auction_id}/bid", idempotency_key,
+        fingerprint(auction_id, offer_price)
+    ) as call:
+        if call.replay:
+            return call.replay
+        response = _place_bid(auction_id, offer_price, current_user)
+        read_coalescer.forget(("auction", UUID(auction_id)))
+        return call.done(response)
+
+
+def _place_bid(auction_id: str, offer_price: float, current_user: User) -> dict:
     try:
         auction = store.get_auction_by_id(UUID(auction_id))
     except ValueError:
@@ -129,55 +160,18 @@ def place_bid(
     if auction.status != "active":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This auction is no longer active")
     
-    # Check for existing bid
-    existing_bid = store.get_bid_by_user_auction(current_user.id, auction.id)
+    # Updates the user's bid or enters them with a new competing booking,
+    # in one store call so a concurrent close or bid cannot interleave
+    placed = store.place_bid(auction.id, current_user.id, to_paise(offer_price), current_user.trust_score)
+    if placed is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This auction is no longer active")
+    bid, created = placed
     
-    if existing_bid:
-        # Update existing bid
-        existing_bid.offer_price = Decimal(str(offer_price))
-        existing_bid.trust_score_snapshot = current_user.trust_score
-        
-        # Update associated booking
-        booking = store.get_booking_by_id(existing_bid.booking_id)
-        if booking:
-            booking.offer_price = Decimal(str(offer_price))
-        
-        return {
-            "id": str(existing_bid.id),
-            "auction_id": str(existing_bid.auction_id),
-            "user_id": str(existing_bid.user_id),
-            "offer_price": float(existing_bid.offer_price),
-            "trust_score_snapshot": float(existing_bid.trust_score_snapshot),
-            "message": "Bid updated successfully"
-        }
-    else:
-        # Create new booking and bid
-        booking = Booking(
-            id=uuid4(),
-            user_id=current_user.id,
-            car_id=auction.car_id,
-            start_time=auction.start_time,
-            end_time=auction.end_time,
-            offer_price=Decimal(str(offer_price)),
-            status="competing"
-        )
-        store.create_booking(booking)
-        
-        bid = Bid(
-            id=uuid4(),
-            auction_id=auction.id,
-            user_id=current_user.id,
-            booking_id=booking.id,
-            offer_price=Decimal(str(offer_price)),
-            trust_score_snapshot=current_user.trust_score
-        )
-        store.create_bid(bid)
-        
-        return {
-            "id": str(bid.id),
-            "auction_id": str(bid.auction_id),
-            "user_id": str(bid.user_id),
-            "offer_price": float(bid.offer_price),
-            "trust_score_snapshot": float(bid.trust_score_snapshot),
-            "message": "Bid placed successfully"
-        }
+    return {
+        "id": str(bid.id),
+        "auction_id": str(bid.auction_id),
+        "user_id": str(bid.user_id),
+        "offer_price": paise_to_float(bid.offer_price),
+        "trust_score_snapshot": centi_to_float(bid.trust_score_snapshot),
+        "message": "Bid placed successfully" if created else "Bid updated successfully"
+    }
@@ -23,12 +23,16 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="Email already registered"
         )
     
+    # Return the connection while hashing; the insert checks out a fresh one
+    db.rollback()
+    password_hash = get_password_hash(user_data.password)
+    
     # Create new user
     user = User(
         name=user_data.name,
         email=user_data.email,
         phone=user_data.phone,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         role="user"
     )
     db.add(user)
@@ -41,7 +45,13 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
 @router.post("/login", response_model=Token)
 def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login and get access token"""
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = (
+        db.query(User.id, User.role, User.password_hash, User.is_blocked)
+        .filter(User.email == form_data.username)
+        .first()
+    )
+    # Return the connection before the deliberately slow password check
+    db.rollback()
     
     if not user or not verify_password(form_data.password, user.password_hash):
         raise HTTPException(
@@ -66,7 +76,13 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 @router.post("/login/json", response_model=Token)
 def login_json(credentials: UserLogin, db: Session = Depends(get_db)):
     """Login with JSON body (alternative to form-data)"""
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = (
+        db.query(User.id, User.role, User.password_hash, User.is_blocked)
+        .filter(User.email == credentials.email)
+        .first()
+    )
+    # Return the connection before the deliberately slow password check
+    db.rollback()
     
     if not user or not verify_password(credentials.password, user.password_hash):
         raise HTTPException(
@@ -7,7 +7,8 @@ from typing import Optional
 from app.core.mock_store import store, User
 from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
 from app.core.config import settings
-from decimal import Decimal
+from app.core.fixed_point import centi_to_float
+from app.core.payload_cache import payload_cache, encode_json, json_response
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -94,14 +95,19 @@ def user_to_response(user: User) -> dict:
         "phone": user.phone,
         "role": user.role,
         "total_rides": user.total_rides,
-        "avg_rating": float(user.avg_rating),
+        "avg_rating": centi_to_float(user.avg_rating),
         "damage_count": user.damage_count,
         "rash_count": user.rash_count,
-        "trust_score": float(user.trust_score),
+        "trust_score": centi_to_float(user.trust_score),
         "is_blocked": user.is_blocked,
     }
 
 
+def user_fragment(user: User) -> bytes:
+    """user_to_response as cached JSON bytes; trust updates bump the version"""
+    return payload_cache.fragment("user", user.id, user.version, lambda: encode_json(user_to_response(user)))
+
+
 # ============ Routes ============
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -122,8 +128,7 @@ def signup(user_data: UserCreate):
         email=user_data.email,
         phone=user_data.phone,
         password_hash=get_password_hash(user_data.password),
-        role="user",
-        trust_score=Decimal("50.00")
+        role="user"
     )
     store.create_user(user)
     
@@ -182,4 +187,4 @@ def login_json(credentials: UserLogin):
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
-    return user_to_response(current_user)
+    return json_response(user_fragment(current_user))
@@ -1,12 +1,20 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models import User, Booking, BookingStatus
+from app.models.loaders import BOOKING_DETAILS, booking_details_options
 from app.schemas import BookingCreate, BookingResponse, BookingWithDetails
 from app.api.deps import get_current_active_user
 from app.services import booking_engine
+from app.core.idempotency import fingerprint, IDEMPOTENCY_HEADER
+from app.services.idempotency_engine import idempotency_store
+from app.core.fieldsets import schema_tree, parse_fields, dump_fields
+from app.core.batch import parse_ids, in_request_order
+
+BOOKING_FIELDS = schema_tree(BookingWithDetails)
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
@@ -15,13 +23,24 @@ router = APIRouter(prefix="/bookings", tags=["Bookings"])
 def request_booking(
     booking_data: BookingCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
     """
     Request a booking for a car.
     
     If there are conflicting bookings, an auction will be triggered.
+    Retries with the same Idempotency-Key replay the first response.
     """
+    with idempotency_store(db).call(
+        current_user.id, "POST /bookings/request", idempotency_key, fingerprint(booking_data)
+    ) as call:
+        if call.replay:
+            return call.replay
+        return call.done(_request_booking(booking_data, current_user, db))
+
+
+def _request_booking(booking_data: BookingCreate, current_user: User, db: Session) -> BookingResponse:
     if booking_data.start_time >= booking_data.end_time:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -49,20 +68,44 @@ def request_booking(
         )
 
 
+@router.get(":batch", response_model=List[BookingWithDetails])
+def get_bookings_batch(
+    ids: List[str] = Query([], description="Up to 100 booking ids, comma-separated or repeated"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get several bookings in one query; ids that do not exist are left out"""
+    booking_ids = parse_ids(ids)
+    bookings = db.query(Booking).filter(Booking.id.in_(booking_ids)).options(*BOOKING_DETAILS).all()
+    
+    # One ownership check over the whole set (unless admin)
+    if not current_user.is_admin and any(b.user_id != current_user.id for b in bookings):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    return in_request_order(booking_ids, {b.id: b for b in bookings})
+
+
 @router.get("/my", response_model=List[BookingWithDetails])
 def get_my_bookings(
     status_filter: Optional[str] = Query(None, alias="status"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,car.model"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get all bookings for the current user"""
-    query = db.query(Booking).filter(Booking.user_id == current_user.id)
+    fields = parse_fields(fields, BOOKING_FIELDS)
+    query = db.query(Booking).filter(Booking.user_id == current_user.id).options(*booking_details_options(fields))
     
     if status_filter:
         query = query.filter(Booking.status == status_filter)
     
     bookings = query.order_by(Booking.created_at.desc()).all()
-    return bookings
+    if fields is None:
+        return bookings
+    return JSONResponse([dump_fields(BookingWithDetails, b, fields) for b in bookings])
 
 
 @router.get("/{booking_id}", response_model=BookingWithDetails)
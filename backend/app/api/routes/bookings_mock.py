@@ -1,12 +1,16 @@
 from typing import List, Optional
 from uuid import UUID, uuid4
-from datetime import datetime, timedelta
-from decimal import Decimal
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Header
 from pydantic import BaseModel
-from app.core.mock_store import store, Booking, Auction, Bid
+from app.core.mock_store import store, idempotency_store, Booking
 from app.api.routes.auth_mock import get_current_user, User
-from app.core.config import settings
+from app.core.fixed_point import to_paise, paise_to_float, centi_to_float
+from app.core.scoring import AUTO_REJECT_THRESHOLD, LATE_CANCEL_PENALTY
+from app.core.idempotency import fingerprint, IDEMPOTENCY_HEADER
+from app.core.loaders import StoreLoaders, get_store_loaders
+from app.core.fieldsets import FieldTree, field_tree, parse_fields, project, wants
+from app.core.batch import parse_ids, in_request_order
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
@@ -31,17 +35,30 @@ class BookingResponse(BaseModel):
     created_at: datetime
 
 
-def booking_to_response(booking: Booking) -> dict:
-    car = store.get_car_by_id(booking.car_id)
-    user = store.get_user_by_id(booking.user_id)
+# Fields a listing may ask for with ?fields=
+BOOKING_FIELDS = field_tree(
+    "id", "user_id", "car_id", "start_time", "end_time", "offer_price", "status", "created_at", "updated_at",
+    car=("id", "model", "number_plate", "daily_price", "deposit", "image_url", "seats", "transmission", "fuel_type"),
+    user=("id", "name", "total_rides", "avg_rating", "trust_score", "is_blocked"),
+)
+
+
+def booking_to_response(
+    booking: Booking,
+    loaders: Optional[StoreLoaders] = None,
+    fields: Optional[FieldTree] = None
+) -> dict:
+    loaders = loaders or get_store_loaders()
+    car = loaders.cars.load(booking.car_id) if wants(fields, "car") else None
+    user = loaders.users.load(booking.user_id) if wants(fields, "user") else None
     
-    return {
+    return project({
         "id": str(booking.id),
         "user_id": str(booking.user_id),
         "car_id": str(booking.car_id),
         "start_time": booking.start_time.isoformat(),
         "end_time": booking.end_time.isoformat(),
-        "offer_price": float(booking.offer_price),
+        "offer_price": paise_to_float(booking.offer_price),
         "status": booking.status,
         "created_at": booking.created_at.isoformat(),
         "updated_at": booking.updated_at.isoformat(),
@@ -49,8 +66,8 @@ def booking_to_response(booking: Booking) -> dict:
             "id": str(car.id),
             "model": car.model,
             "number_plate": car.number_plate,
-            "daily_price": float(car.daily_price),
-            "deposit": float(car.deposit),
+            "daily_price": paise_to_float(car.daily_price),
+            "deposit": paise_to_float(car.deposit),
             "image_url": car.image_url,
             "seats": car.seats,
             "transmission": car.transmission,
@@ -60,11 +77,11 @@ def booking_to_response(booking: Booking) -> dict:
             "id": str(user.id),
             "name": user.name,
             "total_rides": user.total_rides,
-            "avg_rating": float(user.avg_rating),
-            "trust_score": float(user.trust_score),
+            "avg_rating": centi_to_float(user.avg_rating),
+            "trust_score": centi_to_float(user.trust_score),
             "is_blocked": user.is_blocked,
         } if user else None,
-    }
+    }, fields)
 
 
 # ============ Routes ============
@@ -72,9 +89,19 @@ def booking_to_response(booking: Booking) -> dict:
 @router.post("/request")
 def request_booking(
     booking_data: BookingCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
-    """Request a booking for a car"""
+    """Request a booking for a car; retries with the same Idempotency-Key replay the first response"""
+    with idempotency_store.call(
+        current_user.id, "POST /bookings/request", idempotency_key, fingerprint(booking_data)
+    ) as call:
+        if call.replay:
+            return call.replay
+        return call.done(_request_booking(booking_data, current_user))
+
+
+def _request_booking(booking_data: BookingCreate, current_user: User) -> dict:
     if booking_data.start_time >= booking_data.end_time:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,7 +109,7 @@ def request_booking(
         )
     
     # Check if user should be auto-rejected
-    if float(current_user.trust_score) < settings.AUTO_REJECT_THRESHOLD or current_user.is_blocked:
+    if current_user.trust_score < AUTO_REJECT_THRESHOLD or current_user.is_blocked:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Your account is not eligible for bookings at this time."
@@ -98,93 +125,56 @@ def request_booking(
     if not car or not car.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Car not found or not available")
     
-    # Check for confirmed bookings (hard block)
-    for b in store.bookings.values():
-        if b.car_id == car_id and b.status == "confirmed":
-            if b.start_time < booking_data.end_time and b.end_time > booking_data.start_time:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Car is already booked for this time period."
-                )
-    
-    # Create booking
     booking = Booking(
         id=uuid4(),
         user_id=current_user.id,
         car_id=car_id,
         start_time=booking_data.start_time,
         end_time=booking_data.end_time,
-        offer_price=Decimal(str(booking_data.offer_price)),
+        offer_price=to_paise(booking_data.offer_price),
         status="pending"
     )
-    store.create_booking(booking)
-    
-    # Check for conflicts
-    conflicts = store.get_conflicting_bookings(
-        car_id, booking_data.start_time, booking_data.end_time, exclude_id=booking.id
-    )
     
-    if conflicts:
-        # Create or get auction
-        auction = None
-        for a in store.auctions.values():
-            if a.car_id == car_id and a.status == "active":
-                if a.start_time < booking_data.end_time and a.end_time > booking_data.start_time:
-                    auction = a
-                    break
-        
-        if not auction:
-            auction = Auction(
-                id=uuid4(),
-                car_id=car_id,
-                start_time=booking_data.start_time,
-                end_time=booking_data.end_time,
-                auction_end=datetime.utcnow() + timedelta(hours=settings.AUCTION_DURATION_HOURS)
-            )
-            store.create_auction(auction)
-        
-        # Add all conflicts to auction
-        for conflict in conflicts:
-            existing_bid = store.get_bid_by_user_auction(conflict.user_id, auction.id)
-            if not existing_bid:
-                conflict_user = store.get_user_by_id(conflict.user_id)
-                bid = Bid(
-                    id=uuid4(),
-                    auction_id=auction.id,
-                    user_id=conflict.user_id,
-                    booking_id=conflict.id,
-                    offer_price=conflict.offer_price,
-                    trust_score_snapshot=conflict_user.trust_score if conflict_user else Decimal("0")
-                )
-                store.create_bid(bid)
-                conflict.status = "competing"
-        
-        # Add current booking to auction
-        existing_bid = store.get_bid_by_user_auction(current_user.id, auction.id)
-        if not existing_bid:
-            bid = Bid(
-                id=uuid4(),
-                auction_id=auction.id,
-                user_id=current_user.id,
-                booking_id=booking.id,
-                offer_price=booking.offer_price,
-                trust_score_snapshot=current_user.trust_score
-            )
-            store.create_bid(bid)
-        
-        booking.status = "competing"
+    # Confirmed bookings are a hard block; conflicting requests go to an
+    # auction. One store call, so concurrent requests see each other
+    if not store.request_booking(booking):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Car is already booked for this time period."
+        )
     
     return booking_to_response(booking)
 
 
+@router.get(":batch")
+def get_bookings_batch(
+    ids: List[str] = Query([], description="Up to 100 booking ids, comma-separated or repeated"),
+    current_user: User = Depends(get_current_user),
+    loaders: StoreLoaders = Depends(get_store_loaders)
+):
+    """Get several bookings at once; ids that do not exist are left out"""
+    booking_ids = parse_ids(ids)
+    bookings = in_request_order(booking_ids, store.get_bookings_by_ids(booking_ids))
+    
+    if not current_user.is_admin and any(b.user_id != current_user.id for b in bookings):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    
+    loaders.prime_bookings(bookings)
+    return [booking_to_response(b, loaders) for b in bookings]
+
+
 @router.get("/my")
 def get_my_bookings(
     status_filter: Optional[str] = Query(None, alias="status"),
-    current_user: User = Depends(get_current_user)
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,car.model"),
+    current_user: User = Depends(get_current_user),
+    loaders: StoreLoaders = Depends(get_store_loaders)
 ):
     """Get all bookings for the current user"""
+    fields = parse_fields(fields, BOOKING_FIELDS)
     bookings = store.get_bookings_by_user(current_user.id, status_filter)
-    return [booking_to_response(b) for b in bookings]
+    loaders.prime_bookings(bookings, users=wants(fields, "user"), cars=wants(fields, "car"))
+    return [booking_to_response(b, loaders, fields) for b in bookings]
 
 
 @router.get("/{booking_id}")
@@ -231,11 +221,11 @@ def cancel_booking(
     # Make sure both datetimes are offset-naive for comparison
     start_time = booking.start_time.replace(tzinfo=None) if booking.start_time.tzinfo else booking.start_time
     hours_until_start = (start_time - datetime.utcnow()).total_seconds() / 3600
-    if hours_until_start < 24 and booking.status == "confirmed":
-        current_score = float(current_user.trust_score)
-        current_user.trust_score = Decimal(str(max(0, current_score - settings.LATE_CANCEL_PENALTY)))
+    late_penalty = LATE_CANCEL_PENALTY if hours_until_start < 24 else 0
     
-    booking.status = "cancelled"
-    booking.updated_at = datetime.utcnow()
+    # Applied by the store only if the booking is still confirmed when cancelled
+    cancelled = store.cancel_booking(booking.id, late_penalty)
+    if not cancelled:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This booking cannot be cancelled")
     
-    return booking_to_response(booking)
+    return booking_to_response(cancelled)
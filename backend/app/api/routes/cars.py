@@ -1,14 +1,27 @@
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models import Car, Availability, AvailabilityStatus
-from app.schemas import CarResponse, CarWithAvailability, AvailabilityResponse
+from app.core.database import get_read_db
+from app.models import Car, Booking, BookingStatus
+from app.schemas import CarResponse, CarWithAvailability, AvailabilityRange
 from app.api.deps import get_optional_user
+from app.services import calendar_engine
+from app.core.availability_calendar import MAX_HORIZON
+from app.core.store_indexes import to_naive_utc
+from app.core.payload_cache import payload_cache, encode_json, json_response, json_list_response
+from app.core.fieldsets import FieldTree, schema_tree, parse_fields, dump_fields, key
+from app.core.batch import parse_ids, in_request_order
+from app.core.single_flight import read_coalescer
+from app.models.loaders import columns_only
 
 router = APIRouter(prefix="/cars", tags=["Cars"])
 
+# Fields the listing may ask for with ?fields=
+CAR_FIELDS = schema_tree(CarResponse)
+
 
 @router.get("", response_model=List[CarResponse])
 def list_cars(
@@ -16,44 +29,128 @@ def list_cars(
     limit: int = Query(20, ge=1, le=100),
     transmission: Optional[str] = None,
     fuel_type: Optional[str] = None,
+    seats: Optional[int] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-    db: Session = Depends(get_db)
+    sort: Optional[str] = Query(None, pattern="^(price_asc|price_desc)$"),
+    q: Optional[str] = Query(None, max_length=200),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,model,daily_price"),
+    db: Session = Depends(get_read_db)
 ):
-    """List all active cars with optional filters"""
+    """
+    List all active cars with optional filters.
+    
+    q searches model and description (ranked best match first unless sorted by price);
+    start/end keep only cars free for that period; fields limits each car to those keys.
+    """
+    fields = parse_fields(fields, CAR_FIELDS)
+    if (start is None) != (end is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Both start and end are required to search by availability"
+        )
+    
     query = db.query(Car).filter(Car.is_active == True)
+    if fields is not None:
+        # updated_at versions the cached fragment
+        query = query.options(columns_only(Car, fields, always=("id", "updated_at")))
+    
+    if start is not None:
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        if start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="End time must be after start time"
+            )
+        # Anti-join against the occupancy index on bookings(car_id, status, start_time, end_time)
+        occupied = db.query(Booking.id).filter(
+            Booking.car_id == Car.id,
+            Booking.status.in_([BookingStatus.CONFIRMED.value, BookingStatus.COMPETING.value]),
+            Booking.start_time < end,
+            Booking.end_time > start
+        )
+        query = query.filter(~occupied.exists())
     
     if transmission:
         query = query.filter(Car.transmission == transmission)
     if fuel_type:
         query = query.filter(Car.fuel_type == fuel_type)
+    if seats is not None:
+        query = query.filter(Car.seats == seats)
     if min_price is not None:
         query = query.filter(Car.daily_price >= min_price)
     if max_price is not None:
         query = query.filter(Car.daily_price <= max_price)
     
-    return query.offset(skip).limit(limit).all()
+    search_query = None
+    if q:
+        # Matched through the GIN index on search_vector
+        search_query = func.websearch_to_tsquery('english', q)
+        query = query.filter(Car.search_vector.op('@@')(search_query))
+    
+    # Price order walks ix_cars_active_price instead of sorting
+    if sort == "price_asc":
+        query = query.order_by(Car.daily_price.asc(), Car.id)
+    elif sort == "price_desc":
+        query = query.order_by(Car.daily_price.desc(), Car.id.desc())
+    elif search_query is not None:
+        query = query.order_by(func.ts_rank(Car.search_vector, search_query).desc(), Car.id)
+    
+    return json_list_response(car_fragment(car, fields) for car in query.offset(skip).limit(limit).all())
+
+
+def car_fragment(car: Car, fields: Optional[FieldTree] = None) -> bytes:
+    """CarResponse JSON cached per car and fieldset; updated_at changes with every write"""
+    if fields is None:
+        return payload_cache.fragment(
+            "car", car.id, car.updated_at,
+            lambda: CarResponse.model_validate(car).model_dump_json().encode()
+        )
+    return payload_cache.fragment(
+        f"car[{key(fields)}]", car.id, car.updated_at,
+        lambda: encode_json(dump_fields(CarResponse, car, fields))
+    )
+
+
+@router.get(":batch", response_model=List[CarResponse])
+def get_cars_batch(
+    ids: List[str] = Query([], description="Up to 100 car ids, comma-separated or repeated"),
+    db: Session = Depends(get_read_db)
+):
+    """Get several cars in one query; ids that do not exist are left out"""
+    car_ids = parse_ids(ids)
+    cars = {car.id: car for car in db.query(Car).filter(Car.id.in_(car_ids))}
+    return json_list_response(car_fragment(car) for car in in_request_order(car_ids, cars))
 
 
 @router.get("/{car_id}", response_model=CarWithAvailability)
-def get_car(car_id: UUID, db: Session = Depends(get_db)):
-    """Get car details with availability"""
-    car = db.query(Car).filter(Car.id == car_id).first()
-    if not car:
+def get_car(car_id: UUID, db: Session = Depends(get_read_db)):
+    """Get car details with availability; concurrent requests share one build"""
+    payload = read_coalescer.do(("car", car_id), lambda: _car_payload(db, car_id))
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Car not found"
         )
-    return car
+    return json_response(payload)
 
 
-@router.get("/{car_id}/availability", response_model=List[AvailabilityResponse])
+def _car_payload(db: Session, car_id: UUID) -> Optional[bytes]:
+    car = db.query(Car).filter(Car.id == car_id).first()
+    return CarWithAvailability.model_validate(car).model_dump_json().encode() if car else None
+
+
+@router.get("/{car_id}/availability", response_model=List[AvailabilityRange])
 def get_car_availability(
     car_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
     status_filter: Optional[str] = Query(None, alias="status"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get availability slots for a car"""
+    """Get the car's calendar as available/locked/booked ranges (defaults to the next 30 days)"""
     car = db.query(Car).filter(Car.id == car_id).first()
     if not car:
         raise HTTPException(
@@ -61,9 +158,13 @@ def get_car_availability(
             detail="Car not found"
         )
     
-    query = db.query(Availability).filter(Availability.car_id == car_id)
+    start = to_naive_utc(start) if start else datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    end = to_naive_utc(end) if end else start + timedelta(days=30)
     
-    if status_filter:
-        query = query.filter(Availability.status == status_filter)
+    if end <= start or end - start > MAX_HORIZON:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"End must be after start and within {MAX_HORIZON.days} days of it"
+        )
     
-    return query.order_by(Availability.start_time).all()
+    return calendar_engine.get_ranges(db, car_id, start, end, status_filter)
@@ -1,8 +1,16 @@
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, status, Query
 from pydantic import BaseModel
 from app.core.mock_store import store, Car
+from app.core.availability_calendar import MAX_HORIZON
+from app.core.store_indexes import to_naive_utc
+from app.core.fixed_point import to_paise, paise_to_float
+from app.core.payload_cache import payload_cache, encode_json, json_response, json_list_response
+from app.core.fieldsets import FieldTree, field_tree, parse_fields, project, key
+from app.core.batch import parse_ids, in_request_order
+from app.core.single_flight import read_coalescer
 
 router = APIRouter(prefix="/cars", tags=["Cars"])
 
@@ -23,13 +31,20 @@ class CarResponse(BaseModel):
     is_active: bool
 
 
+# Fields a listing may ask for with ?fields=
+CAR_FIELDS = field_tree(
+    "id", "model", "number_plate", "daily_price", "deposit", "image_url",
+    "seats", "transmission", "fuel_type", "description", "is_active",
+)
+
+
 def car_to_response(car: Car) -> dict:
     return {
         "id": str(car.id),
         "model": car.model,
         "number_plate": car.number_plate,
-        "daily_price": float(car.daily_price),
-        "deposit": float(car.deposit),
+        "daily_price": paise_to_float(car.daily_price),
+        "deposit": paise_to_float(car.deposit),
         "image_url": car.image_url,
         "seats": car.seats,
         "transmission": car.transmission,
@@ -39,6 +54,14 @@ def car_to_response(car: Car) -> dict:
     }
 
 
+def car_fragment(car: Car, fields: Optional[FieldTree] = None) -> bytes:
+    """car_to_response as cached JSON bytes, one entry per fieldset"""
+    view = "car" if fields is None else f"car[{key(fields)}]"
+    return payload_cache.fragment(
+        view, car.id, car.version, lambda: encode_json(project(car_to_response(car), fields))
+    )
+
+
 # ============ Routes ============
 
 @router.get("", response_model=List[CarResponse])
@@ -47,45 +70,88 @@ def list_cars(
     limit: int = Query(20, ge=1, le=100),
     transmission: Optional[str] = None,
     fuel_type: Optional[str] = None,
+    seats: Optional[int] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
+    sort: Optional[str] = Query(None, pattern="^(price_asc|price_desc)$"),
+    q: Optional[str] = Query(None, max_length=200),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,model,daily_price"),
 ):
-    """List all active cars with optional filters"""
-    cars = store.get_all_cars(active_only=True)
+    """
+    List all active cars with optional filters.
     
-    # Apply filters
-    if transmission:
-        cars = [c for c in cars if c.transmission == transmission]
-    if fuel_type:
-        cars = [c for c in cars if c.fuel_type == fuel_type]
-    if min_price is not None:
-        cars = [c for c in cars if float(c.daily_price) >= min_price]
-    if max_price is not None:
-        cars = [c for c in cars if float(c.daily_price) <= max_price]
+    q searches model and description (ranked best match first unless sorted by price);
+    start/end keep only cars free for that period; fields limits each car to those keys.
+    """
+    fields = parse_fields(fields, CAR_FIELDS)
+    if (start is None) != (end is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Both start and end are required to search by availability"
+        )
     
-    # Pagination
-    cars = cars[skip:skip + limit]
+    if start is not None:
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        if start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="End time must be after start time"
+            )
     
-    return [car_to_response(car) for car in cars]
+    cars = store.search_cars(
+        transmission=transmission,
+        fuel_type=fuel_type,
+        seats=seats,
+        min_price=to_paise(min_price) if min_price is not None else None,
+        max_price=to_paise(max_price) if max_price is not None else None,
+        sort=sort,
+        text=q,
+        available_from=start,
+        available_to=end,
+        skip=skip,
+        limit=limit
+    )
+    
+    return json_list_response(car_fragment(car, fields) for car in cars)
+
+
+@router.get(":batch", response_model=List[CarResponse])
+def get_cars_batch(ids: List[str] = Query([], description="Up to 100 car ids, comma-separated or repeated")):
+    """Get several cars at once; ids that do not exist are left out"""
+    car_ids = parse_ids(ids)
+    return json_list_response(car_fragment(car) for car in in_request_order(car_ids, store.get_cars_by_ids(car_ids)))
 
 
 @router.get("/{car_id}", response_model=CarResponse)
 def get_car(car_id: str):
-    """Get car details"""
+    """Get car details; concurrent requests share one lookup"""
     try:
-        car = store.get_car_by_id(UUID(car_id))
+        car_uuid = UUID(car_id)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
     
-    if not car:
+    payload = read_coalescer.do(("car", car_uuid), lambda: _car_payload(car_uuid))
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
     
-    return car_to_response(car)
+    return json_response(payload)
+
+
+def _car_payload(car_id: UUID) -> Optional[bytes]:
+    car = store.get_car_by_id(car_id)
+    return car_fragment(car) if car else None
 
 
 @router.get("/{car_id}/availability")
-def get_car_availability(car_id: str):
-    """Get availability for a car (simplified - all cars available)"""
+def get_car_availability(
+    car_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+):
+    """Get the car's calendar as available/locked/booked ranges (defaults to the next 30 days)"""
     try:
         car = store.get_car_by_id(UUID(car_id))
     except ValueError:
@@ -94,5 +160,13 @@ def get_car_availability(car_id: str):
     if not car:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
     
-    # Return simplified availability (always available for now)
-    return []
+    start = to_naive_utc(start) if start else datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    end = to_naive_utc(end) if end else start + timedelta(days=30)
+    
+    if end <= start or end - start > MAX_HORIZON:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"End must be after start and within {MAX_HORIZON.days} days of it"
+        )
+    
+    return store.get_calendar_ranges(car.id, start, end, status_filter)
@@ -0,0 +1,161 @@
+"""
+Record Archive
+Terminal bookings and closed auctions moved out of the working set into
+compressed, append-only segments that admin history views still read
+"""
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from app.core.store_protocol import Codec
+
+
+# Archived record kinds
+BOOKINGS = "bookings"
+AUCTIONS = "auctions"
+
+# Only records in these statuses are ever archived; nothing moves them out again
+ARCHIVABLE_BOOKING_STATUSES = ("cancelled", "rejected", "completed")
+ARCHIVABLE_AUCTION_STATUSES = ("closed",)
+
+# Records per segment, and decoded segments kept for repeated reads
+SEGMENT_RECORDS = 512
+CACHED_SEGMENTS = 8
+
+# (record id, status, created_at, bundle). A bundle is a dict holding the
+# record and its dependents: {"booking", "ride", "rating"} or {"auction", "bids"}
+ArchiveEntry = Tuple[UUID, str, datetime, dict]
+
+
+def pack_segment(codec: Codec, entries: List[ArchiveEntry]) -> bytes:
+    return zlib.compress(codec.encode(entries), 6)
+
+
+def unpack_segment(codec: Codec, data: bytes) -> List[ArchiveEntry]:
+    return codec.decode(zlib.decompress(data))
+
+
+def chunk_entries(entries: List[ArchiveEntry], size: int = SEGMENT_RECORDS) -> Iterator[List[ArchiveEntry]]:
+    """Oldest first, so later segments hold newer records"""
+    entries = sorted(entries, key=lambda entry: entry[2])
+    for start in range(0, len(entries), size):
+        yield entries[start:start + size]
+
+
+class _Segment:
+    __slots__ = ("kind", "data", "count", "statuses", "created_at")
+
+    def __init__(self, kind: str, data: bytes, entries: List[ArchiveEntry]):
+        self.kind = kind
+        self.data = data
+        self.count = len(entries)
+        self.statuses = Counter(entry[1] for entry in entries)
+        self.created_at = datetime.utcnow()
+
+
+class RecordArchive:
+    """
+    In-memory archive for the in-memory store. Segments are immutable once
+    written; the store only keeps an id -> segment index per archived
+    record and a few recently decoded segments.
+    """
+
+    def __init__(self, codec: Codec, segment_records: int = SEGMENT_RECORDS, cached_segments: int = CACHED_SEGMENTS):
+        self.codec = codec
+        self.segment_records = segment_records
+        self.cached_segments = cached_segments
+        self._segments: List[_Segment] = []
+        self._index: Dict[UUID, int] = {}
+        self._decoded: "OrderedDict[int, Dict[UUID, ArchiveEntry]]" = OrderedDict()
+
+    def append(self, kind: str, entries: List[ArchiveEntry]) -> int:
+        for chunk in chunk_entries(entries, self.segment_records):
+            number = len(self._segments)
+            self._segments.append(_Segment(kind, pack_segment(self.codec, chunk), chunk))
+            for record_id, _, _, _ in chunk:
+                self._index[record_id] = number
+        return len(entries)
+
+    def _entries(self, number: int) -> Dict[UUID, ArchiveEntry]:
+        entries = self._decoded.get(number)
+        if entries is None:
+            entries = {entry[0]: entry for entry in unpack_segment(self.codec, self._segments[number].data)}
+            self._decoded[number] = entries
+            if len(self._decoded) > self.cached_segments:
+                self._decoded.popitem(last=False)
+        else:
+            self._decoded.move_to_end(number)
+        return entries
+
+    def __contains__(self, record_id: UUID) -> bool:
+        return record_id in self._index
+
+    def get(self, record_id: UUID) -> Optional[dict]:
+        number = self._index.get(record_id)
+        if number is None:
+            return None
+        return self._entries(number)[record_id][3]
+
+    def scan(self, kind: str, status: str = None, skip: int = 0, limit: int = None) -> List[dict]:
+        """Bundles of one kind, newest segment first, skipping segments with no matching status"""
+        found = []
+        for number in range(len(self._segments) - 1, -1, -1):
+            segment = self._segments[number]
+            if segment.kind != kind:
+                continue
+            matching = segment.statuses[status] if status else segment.count
+            if skip >= matching:
+                skip -= matching
+                continue
+            entries = sorted(self._entries(number).values(), key=lambda entry: entry[2], reverse=True)
+            for _, entry_status, _, bundle in entries:
+                if status and entry_status != status:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                found.append(bundle)
+                if limit is not None and len(found) >= limit:
+                    return found
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        kinds: Dict[str, Dict[str, int]] = {}
+        for segment in self._segments:
+            totals = kinds.setdefault(segment.kind, {"segments": 0, "records": 0, "bytes": 0})
+            totals["segments"] += 1
+            totals["records"] += segment.count
+            totals["bytes"] += len(segment.data)
+        return kinds
+
+
+class PeriodicJob:
+    """Runs `job` every `interval` seconds on a daemon thread; failures are logged and retried next time"""
+
+    def __init__(self, name: str, job: Callable[[], Any], interval: float):
+        self.name = name
+        self.job = job
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.job()
+            except Exception as e:
+                print(f"⚠️  {self.name} failed, retrying in {self.interval:.0f}s: {e}")
+
+    def start(self) -> None:
+        if self._thread is None and self.interval > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,166 @@
+"""
+Availability Calendar
+Per-car hour-granularity bitsets for booked and locked time, served as run-length encoded ranges
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+from app.core.store_indexes import to_naive_utc
+
+
+# Slots are numbered in hours from this one (earlier hours are negative)
+CALENDAR_EPOCH = datetime(2024, 1, 1)
+SLOT = timedelta(hours=1)
+DAY_SLOTS = 24
+
+# Longest window a single availability query may span
+MAX_HORIZON = timedelta(days=731)
+
+AVAILABLE = "available"
+LOCKED = "locked"
+BOOKED = "booked"
+
+
+def slot_index(value: datetime, round_up: bool = False) -> int:
+    """Hour slot containing `value`, or the first slot after it when round_up is set"""
+    seconds = (to_naive_utc(value) - CALENDAR_EPOCH).total_seconds()
+    slot, remainder = divmod(int(seconds), 3600)
+    if round_up and remainder:
+        slot += 1
+    return slot
+
+
+def slot_time(index: int) -> datetime:
+    return CALENDAR_EPOCH + index * SLOT
+
+
+def _runs(bits: int) -> Iterator[Tuple[int, int]]:
+    """Yield (first, last) slot runs of consecutive set bits, lowest first"""
+    position = 0
+    while bits:
+        skip = (bits & -bits).bit_length() - 1
+        bits >>= skip
+        position += skip
+        # Lowest clear bit of `bits` sits just past the run of ones
+        length = (~bits & (bits + 1)).bit_length() - 1
+        yield position, position + length
+        bits >>= length
+        position += length
+
+
+class AvailabilityCalendar:
+    """
+    Booked and locked hours of one car as two integer bitsets.
+
+    Bit 0 is slot `base`; trim() moves the base forward and drops the bits
+    behind it, so the bitsets span the retention window and the future
+    instead of every hour since CALENDAR_EPOCH. Hours before the base are
+    no longer tracked: marks are clipped to it and they read as available.
+
+    A year of hourly slots is ~1.1 KB per state. Booked wins over locked when
+    both bits are set; every other hour is available.
+    """
+    __slots__ = ("booked", "locked", "base")
+
+    def __init__(self, booked: int = 0, locked: int = 0, base: int = 0):
+        self.booked = booked
+        self.locked = locked
+        self.base = base
+
+    def _span_mask(self, start: datetime, end: datetime) -> int:
+        first = max(slot_index(start), self.base)
+        last = slot_index(end, round_up=True)
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << (first - self.base)
+
+    def _window(self, bits: int, first: int, width: int) -> int:
+        """`width` bits of `bits` from slot `first` on; slots before the base read as clear"""
+        offset = first - self.base
+        shifted = bits >> offset if offset >= 0 else bits << -offset
+        return shifted & ((1 << width) - 1)
+
+    def trim(self, before: datetime) -> None:
+        """Forget the hours before `before`, a whole day at a time"""
+        base = slot_index(before) // DAY_SLOTS * DAY_SLOTS
+        if base > self.base:
+            self.booked >>= base - self.base
+            self.locked >>= base - self.base
+            self.base = base
+
+    def mark(self, state: str, start: datetime, end: datetime) -> None:
+        mask = self._span_mask(start, end)
+        if state == BOOKED:
+            self.booked |= mask
+        elif state == LOCKED:
+            self.locked |= mask
+
+    def release(
+        self,
+        state: str,
+        start: datetime,
+        end: datetime,
+        keep: Iterable[Tuple[datetime, datetime]] = ()
+    ) -> None:
+        """Clear a span, then re-mark spans of other records that still hold it"""
+        mask = self._span_mask(start, end)
+        if state == BOOKED:
+            self.booked &= ~mask
+        elif state == LOCKED:
+            self.locked &= ~mask
+        for keep_start, keep_end in keep:
+            self.mark(state, keep_start, keep_end)
+
+    def is_free(self, start: datetime, end: datetime, state: str = BOOKED) -> bool:
+        bits = self.booked if state == BOOKED else self.booked | self.locked
+        return not bits & self._span_mask(start, end)
+
+    def ranges(
+        self,
+        start: datetime,
+        end: datetime,
+        status: Optional[str] = None
+    ) -> List[dict]:
+        """Run-length encoded ranges covering [start, end), optionally for one status only"""
+        first = slot_index(start)
+        last = slot_index(end, round_up=True)
+        width = last - first
+        if width <= 0:
+            return []
+
+        booked = self._window(self.booked, first, width)
+        locked = self._window(self.locked, first, width) & ~booked
+
+        runs = sorted(
+            [(a, b, BOOKED) for a, b in _runs(booked)] +
+            [(a, b, LOCKED) for a, b in _runs(locked)]
+        )
+
+        ranges = []
+        cursor = 0
+        for run_start, run_end, state in runs:
+            if run_start > cursor:
+                ranges.append((cursor, run_start, AVAILABLE))
+            ranges.append((run_start, run_end, state))
+            cursor = run_end
+        if cursor < width:
+            ranges.append((cursor, width, AVAILABLE))
+
+        return [
+            {
+                "start_time": slot_time(first + a),
+                "end_time": slot_time(first + b),
+                "status": state,
+            }
+            for a, b, state in ranges
+            if status is None or state == status
+        ]
+
+    # ============ Persistence ============
+
+    @staticmethod
+    def encode(bits: int) -> bytes:
+        return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+    @staticmethod
+    def decode(data: Optional[bytes]) -> int:
+        return int.from_bytes(data, "little") if data else 0
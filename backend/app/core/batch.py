@@ -0,0 +1,40 @@
+"""
+Batch Lookups
+`GET /cars:batch?ids=a,b,c` fetches up to MAX_BATCH_IDS records in one
+request and one query, instead of one round trip (token decode, user
+lookup, connection checkout) per id.
+"""
+from typing import Dict, Hashable, List, TypeVar
+from uuid import UUID
+from fastapi import HTTPException, status
+
+MAX_BATCH_IDS = 100
+
+T = TypeVar("T")
+
+
+def parse_ids(values: List[str]) -> List[UUID]:
+    """
+    Distinct ids in request order, from comma-separated and/or repeated
+    `ids` parameters. Malformed ids and more than MAX_BATCH_IDS are a 400.
+    """
+    ids: Dict[UUID, None] = {}
+    for value in values:
+        for part in filter(None, (part.strip() for part in value.split(","))):
+            try:
+                ids[UUID(part)] = None
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid id {part!r}")
+            if len(ids) > MAX_BATCH_IDS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"At most {MAX_BATCH_IDS} ids per request"
+                )
+    if not ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids is required")
+    return list(ids)
+
+
+def in_request_order(ids: List[UUID], found: Dict[Hashable, T]) -> List[T]:
+    """Records in the order they were asked for; ids that do not exist are left out"""
+    return [found[record_id] for record_id in ids if record_id in found]
@@ -1,7 +1,16 @@
-from sqlalchemy import create_engine
+import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.db_metrics import pool_metrics
 
 # Create database engine
 engine = create_engine(
@@ -11,6 +20,12 @@ engine = create_engine(
     max_overflow=20
 )
 
+# Read replica engines (none unless DATABASE_REPLICA_URLS is set)
+replica_engines = [
+    create_engine(url, pool_pre_ping=True, pool_size=10, max_overflow=20)
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -18,10 +33,195 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
+# Seconds of replay lag; 0 when the replica has replayed everything it received,
+# so an idle primary doesn't read as a lagging replica
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# Clients remembered for read-after-write routing
+MAX_TRACKED_WRITERS = 10000
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for a read-only request.
+
+    Replicas are used round-robin while their measured lag is within
+    REPLICA_MAX_LAG_SECONDS; unreachable or lagging replicas fall back to the
+    primary. A client that wrote within READ_AFTER_WRITE_SECONDS is only sent
+    to a replica whose lag is shorter than the time since that write, so it
+    always sees its own changes.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: List[Engine],
+        max_lag: float,
+        check_interval: float,
+        read_after_write: float
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_after_write = read_after_write
+        self._cycle = itertools.cycle(replicas) if replicas else None
+        self._lags: Dict[Engine, Tuple[float, Optional[float]]] = {}
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def client_key(request: Request) -> str:
+        credential = request.headers.get("authorization") or (
+            request.client.host if request.client else ""
+        )
+        return hashlib.blake2b(credential.encode(), digest_size=16).hexdigest()
+
+    def note_write(self, key: str) -> None:
+        with self._lock:
+            self._writes[key] = time.monotonic()
+            self._writes.move_to_end(key)
+            while len(self._writes) > MAX_TRACKED_WRITERS:
+                self._writes.popitem(last=False)
+
+    def _since_write(self, key: str) -> Optional[float]:
+        with self._lock:
+            written_at = self._writes.get(key)
+        if written_at is None:
+            return None
+        since = time.monotonic() - written_at
+        return since if since < self.read_after_write else None
+
+    def lag(self, replica: Engine) -> Optional[float]:
+        """Cached replay lag in seconds, or None while the replica is unreachable"""
+        now = time.monotonic()
+        checked_at, lag = self._lags.get(replica, (None, None))
+        if checked_at is not None and now - checked_at < self.check_interval:
+            return lag
+
+        try:
+            with replica.connect() as connection:
+                lag = float(connection.execute(REPLICA_LAG_SQL).scalar() or 0)
+        except Exception:
+            lag = None
+        self._lags[replica] = (now, lag)
+        return lag
+
+    def engine_for_read(self, key: Optional[str] = None) -> Engine:
+        if not self.replicas:
+            return self.primary
+
+        since_write = self._since_write(key) if key else None
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            lag = self.lag(replica)
+            if lag is None or lag > self.max_lag:
+                continue
+            if since_write is not None and lag >= since_write:
+                continue
+            return replica
+        return self.primary
+
+
+read_router = ReplicaRouter(
+    engine,
+    replica_engines,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_SECONDS,
+    read_after_write=settings.READ_AFTER_WRITE_SECONDS
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+
+# A session holds a pooled connection from the start of its transaction to its end
+@event.listens_for(Session, "after_begin")
+def _track_checkout(session, transaction, connection):
+    if "route" in session.info and "checked_out_at" not in session.info:
+        session.info["checked_out_at"] = pool_metrics.checkout()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _track_checkin(session, transaction):
+    if transaction.parent is None and "checked_out_at" in session.info:
+        pool_metrics.checkin(session.info["route"], session.info.pop("checked_out_at"))
+
+
+class LazySession:
+    """
+    Proxy handed to routes in place of a Session. The Session is only built
+    on first attribute access, so requests that fail validation or return
+    early never create one; it checks out a connection on its first
+    statement and returns it when the transaction ends or the request closes.
+    """
+    __slots__ = ("_factory", "_session", "route", "replica_used")
+
+    def __init__(self, factory: Callable[[], Session], route: str):
+        self._factory = factory
+        self._session: Optional[Session] = None
+        self.route = route
+        # Set by get_read_db when the request read from a replica session instead
+        self.replica_used = False
+
+    @property
+    def used(self) -> bool:
+        return self._session is not None
+
+    def _get(self) -> Session:
+        if self._session is None:
+            self._session = self._factory()
+            self._session.info["route"] = self.route
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+def route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return f"{request.method} {getattr(route, 'path', request.url.path)}"
+
+
+def get_db(request: Request):
+    """Dependency to get a primary database session; writes pin the client to fresh reads"""
+    db = LazySession(SessionLocal, route_label(request))
     try:
         yield db
     finally:
+        if db.used and db.info.get("wrote"):
+            read_router.note_write(ReplicaRouter.client_key(request))
         db.close()
+        pool_metrics.request_finished(db.route, db.used or db.replica_used)
+
+
+def get_read_db(request: Request, primary: LazySession = Depends(get_db)):
+    """
+    Dependency to get a session for read-only routes, on a replica when one is
+    fresh enough. Otherwise it is the request's primary session, the one the
+    auth lookup already uses, so a request never holds two primary connections.
+    """
+    key = ReplicaRouter.client_key(request)
+
+    def session() -> Session:
+        read_engine = read_router.engine_for_read(key)
+        if read_engine is read_router.primary:
+            return primary._get()
+        return SessionLocal(bind=read_engine)
+
+    db = LazySession(session, primary.route)
+    try:
+        yield db
+    finally:
+        if db.used and db._session is not primary._session:
+            db.close()
+            primary.replica_used = True
@@ -0,0 +1,74 @@
+"""
+Database Pool Metrics
+Per-route counts of requests, sessions actually used and pooled connection
+checkouts, with how long each checkout was held
+"""
+import threading
+import time
+from typing import Dict, List
+
+
+class RouteStats:
+    __slots__ = ("requests", "sessions", "checkouts", "held_ms", "max_held_ms")
+
+    def __init__(self):
+        self.requests = 0
+        self.sessions = 0
+        self.checkouts = 0
+        self.held_ms = 0.0
+        self.max_held_ms = 0.0
+
+    def as_dict(self, route: str) -> dict:
+        return {
+            "route": route,
+            "requests": self.requests,
+            "sessions_used": self.sessions,
+            "unused_sessions": self.requests - self.sessions,
+            "checkouts": self.checkouts,
+            "avg_held_ms": round(self.held_ms / self.checkouts, 3) if self.checkouts else 0.0,
+            "max_held_ms": round(self.max_held_ms, 3),
+        }
+
+
+class PoolMetrics:
+    """Thread-safe counters keyed by route label ("GET /api/cars")"""
+
+    def __init__(self):
+        self._routes: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, route: str) -> RouteStats:
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = RouteStats()
+        return stats
+
+    def request_finished(self, route: str, session_used: bool) -> None:
+        with self._lock:
+            stats = self._stats(route)
+            stats.requests += 1
+            if session_used:
+                stats.sessions += 1
+
+    def checkout(self) -> float:
+        return time.perf_counter()
+
+    def checkin(self, route: str, checked_out_at: float) -> None:
+        held_ms = (time.perf_counter() - checked_out_at) * 1000
+        with self._lock:
+            stats = self._stats(route)
+            stats.checkouts += 1
+            stats.held_ms += held_ms
+            stats.max_held_ms = max(stats.max_held_ms, held_ms)
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            rows = [stats.as_dict(route) for route, stats in self._routes.items()]
+        return sorted(rows, key=lambda row: row["checkouts"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,87 @@
+"""
+Streaming Exports
+Row-at-a-time CSV/NDJSON encoders for admin exports; memory stays bounded by one batch
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Iterator, Sequence, Tuple
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+MEDIA_TYPES = {
+    CSV: "text/csv",
+    NDJSON: "application/x-ndjson",
+}
+
+# Rows fetched per database round trip / encoded per emitted chunk
+EXPORT_BATCH_SIZE = 1000
+
+BOOKING_EXPORT_COLUMNS: Tuple[str, ...] = (
+    "booking_id",
+    "status",
+    "start_time",
+    "end_time",
+    "offer_price",
+    "created_at",
+    "updated_at",
+    "car_id",
+    "car_model",
+    "number_plate",
+    "user_id",
+    "user_name",
+    "user_email",
+    "user_trust_score",
+)
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _csv_chunks(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([_plain(value) for value in row])
+        pending += 1
+        if pending >= EXPORT_BATCH_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunks(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, (_plain(value) for value in row)))))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def encode_rows(fmt: str, columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """Encode tuples laid out as `columns` into byte chunks of EXPORT_BATCH_SIZE rows"""
+    if fmt == NDJSON:
+        return _ndjson_chunks(columns, rows)
+    return _csv_chunks(columns, rows)
+
+
+def attachment_headers(name: str, fmt: str) -> dict:
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    return {"Content-Disposition": f'attachment; filename="{name}-{stamp}.{fmt}"'}
@@ -0,0 +1,134 @@
+"""
+Sparse Fieldsets
+`fields=id,model,car.image_url` on list endpoints: only the named fields are
+loaded and serialized. A relation named on its own ("car") is returned
+whole; "car.model" narrows it. One level of nesting.
+"""
+import typing
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter
+
+
+# name -> None for a plain field (or a whole relation), or the chosen subfields
+FieldTree = Dict[str, Optional["FieldTree"]]
+
+MAX_FIELDS_LENGTH = 1000
+
+
+def field_tree(*names: str, **relations: Iterable[str]) -> FieldTree:
+    """Allowed fields for an endpoint: plain names plus relations with their own fields"""
+    tree: FieldTree = {name: None for name in names}
+    for relation, fields in relations.items():
+        tree[relation] = {name: None for name in fields}
+    return tree
+
+
+def parse_fields(raw: Optional[str], allowed: FieldTree) -> Optional[FieldTree]:
+    """The requested subset of `allowed`, or None for every field. Unknown names are a 400."""
+    if raw is None:
+        return None
+    if len(raw) > MAX_FIELDS_LENGTH:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="fields is too long")
+
+    tree: FieldTree = {}
+    for path in filter(None, (part.strip() for part in raw.split(","))):
+        head, _, rest = path.partition(".")
+        sub_allowed = allowed.get(head, False)
+        if sub_allowed is False or (rest and (sub_allowed is None or rest not in sub_allowed)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field {path!r}; choose from {', '.join(_paths(allowed))}"
+            )
+        if not rest:
+            tree[head] = None
+        elif head not in tree:
+            tree[head] = {rest: None}
+        elif tree[head] is not None:
+            tree[head][rest] = None
+    if not tree:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="fields must name at least one field")
+    return tree
+
+
+def _paths(tree: FieldTree) -> List[str]:
+    paths = []
+    for name, sub in tree.items():
+        paths.append(name)
+        if sub:
+            paths.extend(f"{name}.{child}" for child in sub)
+    return paths
+
+
+def wants(fields: Optional[FieldTree], name: str) -> bool:
+    return fields is None or name in fields
+
+
+def key(fields: Optional[FieldTree]) -> str:
+    """Canonical spelling of a fieldset, for cache keys"""
+    return "*" if fields is None else ",".join(sorted(_leaf_paths(fields)))
+
+
+def _leaf_paths(tree: FieldTree) -> List[str]:
+    return [
+        path for name, sub in tree.items()
+        for path in ([name] if sub is None else [f"{name}.{child}" for child in sub])
+    ]
+
+
+def project(payload: Optional[dict], fields: Optional[FieldTree]) -> Optional[dict]:
+    """Keep only the requested keys of an already serialized dict"""
+    if payload is None or fields is None:
+        return payload
+    return {name: project(payload[name], sub) for name, sub in fields.items()}
+
+
+# ============ Pydantic Schemas ============
+
+def _relation_model(annotation) -> Optional[type]:
+    for candidate in (annotation, *typing.get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+def schema_tree(schema: type) -> FieldTree:
+    """Allowed fields of a response schema: its fields, and one level into nested schemas"""
+    tree: FieldTree = {}
+    for name, info in schema.model_fields.items():
+        nested = _relation_model(info.annotation)
+        tree[name] = {child: None for child in nested.model_fields} if nested else None
+    return tree
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: type, name: str) -> TypeAdapter:
+    return TypeAdapter(schema.model_fields[name].annotation)
+
+
+def dump_fields(schema: type, obj, fields: FieldTree) -> dict:
+    """
+    JSON-ready values of the requested fields of an ORM row, serialized the
+    way `schema` would. Only the named attributes are read, so columns left
+    out by load_only are never fetched.
+    """
+    out = {}
+    for name, sub in fields.items():
+        value = getattr(obj, name)
+        nested = _relation_model(schema.model_fields[name].annotation)
+        if value is None:
+            out[name] = None
+        elif nested is not None and sub is not None:
+            out[name] = dump_fields(nested, value, sub)
+        elif nested is not None:
+            out[name] = nested.model_validate(value).model_dump(mode="json")
+        else:
+            out[name] = _adapter(schema, name).dump_python(value, mode="json")
+    return out
+
+
+def column_names(model: type, fields: FieldTree, always: Iterable[str] = ("id",)) -> List[str]:
+    """Mapped columns of `model` among the requested fields, plus `always` (ids and join keys)"""
+    columns = set(model.__table__.columns.keys())
+    return [name for name in dict.fromkeys([*always, *fields]) if name in columns]
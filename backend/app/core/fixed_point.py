@@ -0,0 +1,73 @@
+"""
+Fixed-Point Units
+Money is carried as integer paise, trust scores and ratings as integer hundredths
+of a point, and auction final scores as integer ten-thousandths. Decimal and float
+only appear where values cross the API or ORM boundary.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Union
+
+Number = Union[Decimal, float, int, str]
+
+PAISE_PLACES = 2   # 1 rupee = 100 paise
+CENTI_PLACES = 2   # 1 trust/rating point = 100 centipoints
+SCORE_PLACES = 4   # final_score 0.0000 - 1.0000
+
+
+def _to_fixed(value: Number, places: int) -> int:
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.scaleb(places).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _from_fixed(value: int, places: int) -> Decimal:
+    return Decimal(value).scaleb(-places)
+
+
+# ============ Inbound (API/ORM -> fixed point) ============
+
+def to_paise(rupees: Number) -> int:
+    return _to_fixed(rupees, PAISE_PLACES)
+
+
+def to_centi(points: Number) -> int:
+    return _to_fixed(points, CENTI_PLACES)
+
+
+def to_score(score: Number) -> int:
+    return _to_fixed(score, SCORE_PLACES)
+
+
+# ============ Outbound (fixed point -> JSON/ORM) ============
+
+def paise_to_float(paise: int) -> float:
+    return paise / 100
+
+
+def centi_to_float(centi: int) -> float:
+    return centi / 100
+
+
+def score_to_float(score: int) -> float:
+    return score / 10000
+
+
+def paise_to_decimal(paise: int) -> Decimal:
+    return _from_fixed(paise, PAISE_PLACES)
+
+
+def centi_to_decimal(centi: int) -> Decimal:
+    return _from_fixed(centi, CENTI_PLACES)
+
+
+def score_to_decimal(score: int) -> Decimal:
+    return _from_fixed(score, SCORE_PLACES)
+
+
+# ============ Arithmetic ============
+
+def div_half_up(numerator: int, denominator: int) -> int:
+    """Integer division rounding halves away from zero (denominator > 0)"""
+    if numerator >= 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    return -((-2 * numerator + denominator) // (2 * denominator))
@@ -0,0 +1,169 @@
+"""
+Idempotency Keys
+Replays the stored response when a client retries a POST with the same
+Idempotency-Key, instead of running the request again
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from app.core.payload_cache import encode_json
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable digest of a request's inputs, so a reused key with a different payload is caught"""
+    canonical = json.dumps(jsonable_encoder(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+# (fingerprint, response body) of a key already claimed; the body is None
+# while the first request is still running
+Claimed = Tuple[str, Optional[bytes]]
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "expires_at", "claimed_until", "body")
+
+    def __init__(self, fingerprint: str, expires_at: float, claimed_until: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.claimed_until = claimed_until
+        self.body: Optional[bytes] = None
+
+
+class IdempotencyKeys:
+    """
+    Bounded TTL map of (user, route, key) -> request fingerprint and
+    response body, for the in-memory store. Oldest keys are evicted past
+    `max_keys`. A claim whose request has not finished within
+    `lease_seconds` (its worker died) can be taken by the next retry.
+    """
+
+    def __init__(self, ttl_seconds: float, max_keys: int, lease_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self.lease_seconds = lease_seconds
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, slot: tuple, request_fingerprint: str) -> Optional[Claimed]:
+        """None if the key was free and is now held for this request, else what it holds"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(slot)
+            if entry is not None and entry.body is None and entry.claimed_until <= now:
+                del self._entries[slot]
+                entry = None
+            if entry is None:
+                self._entries[slot] = _Entry(
+                    request_fingerprint, now + self.ttl_seconds, now + self.lease_seconds
+                )
+                while len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+                return None
+            return entry.fingerprint, entry.body
+
+    def _expire(self, now: float) -> None:
+        # Entries are in insertion order and share one TTL, so expired ones are at the front
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry.expires_at > now:
+                break
+            self._entries.popitem(last=False)
+
+    def finish(self, slot: tuple, body: bytes) -> None:
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None:
+                entry.body = body
+
+    def abandon(self, slot: tuple) -> None:
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry.body is None:
+                del self._entries[slot]
+
+
+class IdempotentCall:
+    """
+    Context manager for one keyed request. `replay` is the stored response
+    when this is a retry; otherwise run the request and pass its result
+    through `done`. A request that raises or never calls `done` frees the
+    key so the client can try again.
+    """
+
+    def __init__(self, store: "IdempotencyStore", slot: Optional[tuple], replay: Optional[Response]):
+        self._store = store
+        self._slot = slot
+        self._done = False
+        self.replay = replay
+
+    def done(self, result: Any) -> Any:
+        if self._slot is not None:
+            self._store.backend.finish_idempotency_key(*self._slot, encode_json(jsonable_encoder(result)))
+            self._done = True
+        return result
+
+    def __enter__(self) -> "IdempotentCall":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._slot is not None and not self._done and self.replay is None:
+            self._store.backend.abandon_idempotency_key(*self._slot)
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key handling for the keyed POST routes. The keys live in
+    `backend`, which every worker shares: the in-memory store (or its
+    client) or an IdempotencyEngine on the request's session. Either provides
+    claim_idempotency_key(user_id, route, key, fingerprint) -> Claimed or
+    None, finish_idempotency_key(user_id, route, key, body) and
+    abandon_idempotency_key(user_id, route, key).
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def call(self, user_id: UUID, route: str, key: Optional[str], request_fingerprint: str) -> IdempotentCall:
+        if key is None:
+            return IdempotentCall(self, None, None)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters"
+            )
+
+        slot = (user_id, route, key)
+        claimed = self.backend.claim_idempotency_key(*slot, request_fingerprint)
+        if claimed is None:
+            return IdempotentCall(self, slot, None)
+        stored_fingerprint, body = claimed
+
+        if stored_fingerprint != request_fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_HEADER} was already used with a different request"
+            )
+        if body is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress"
+            )
+        replay = Response(
+            content=body,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"}
+        )
+        return IdempotentCall(self, slot, replay)
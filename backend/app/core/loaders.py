@@ -0,0 +1,72 @@
+"""
+Batch Loaders
+Request-scoped lookups for serializers: a page's related ids are collected
+up front and fetched in one store call per relation, then memoized for the
+rest of the request. Database routes get the same effect from the
+selectinload options in app.models.loaders.
+"""
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+from app.core.mock_store import store
+
+
+class BatchLoader:
+    """Memo of records by key; `prime` fetches every key not seen yet in one call"""
+
+    def __init__(self, fetch_many: Callable[[List[Hashable]], Dict[Hashable, object]]):
+        self._fetch_many = fetch_many
+        self._cache: Dict[Hashable, object] = {}
+
+    def prime(self, keys: Iterable[Hashable]) -> None:
+        missing = list({key for key in keys if key is not None and key not in self._cache})
+        if missing:
+            found = self._fetch_many(missing)
+            for key in missing:
+                self._cache[key] = found.get(key)
+
+    def load(self, key: Optional[Hashable]):
+        if key is None:
+            return None
+        if key not in self._cache:
+            self.prime([key])
+        return self._cache[key]
+
+
+class StoreLoaders:
+    """
+    One set of loaders per request (see get_store_loaders). Routes prime a
+    whole page before serializing it; a serializer called without priming
+    still works, one fetch per missing key.
+    """
+
+    def __init__(self, store):
+        self.users = BatchLoader(store.get_users_by_ids)
+        self.cars = BatchLoader(store.get_cars_by_ids)
+        self.rides = BatchLoader(store.get_rides_by_bookings)  # keyed by booking id
+        self.ratings = BatchLoader(store.get_ratings_by_rides)  # keyed by ride id
+        self.bids = BatchLoader(store.get_bids_by_auctions)  # keyed by auction id, lists
+
+    def prime_bookings(self, bookings: list, rides: bool = False, users: bool = True, cars: bool = True) -> None:
+        if users:
+            self.users.prime(b.user_id for b in bookings)
+        if cars:
+            self.cars.prime(b.car_id for b in bookings)
+        if rides:
+            self.rides.prime(b.id for b in bookings)
+            self.ratings.prime(
+                ride.id for ride in map(self.rides.load, (b.id for b in bookings)) if ride
+            )
+
+    def prime_auctions(self, auctions: list, bids: bool = False) -> None:
+        self.cars.prime(a.car_id for a in auctions)
+        self.users.prime(a.winner_id for a in auctions)
+        if bids:
+            self.bids.prime(a.id for a in auctions)
+            self.users.prime(
+                bid.user_id for a in auctions for bid in (self.bids.load(a.id) or ())
+            )
+
+
+def get_store_loaders() -> StoreLoaders:
+    """FastAPI dependency; dependencies are resolved once per request, so the memo is request scoped"""
+    return StoreLoaders(store)
+
@@ -2,17 +2,46 @@
 In-Memory Data Store
 Use this instead of PostgreSQL for development/testing without a database
 """
+import sys
+import threading
 from datetime import datetime, timedelta
-from decimal import Decimal
 from uuid import uuid4, UUID
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
+from functools import wraps
+from inspect import isfunction, isgeneratorfunction
+from app.core.config import settings
 from app.core.security import get_password_hash
+from app.core.fixed_point import to_paise, to_centi
+from app.core.scoring import trust_score, running_average, final_scores, TRUST_THRESHOLD, AUTO_BLOCK_THRESHOLD
+from app.core.store_indexes import OccupancyIndex, CarCatalogIndex, CarTextIndex, TrustLeaderboard, OCCUPYING_STATUSES
+from app.core.availability_calendar import AvailabilityCalendar, BOOKED, LOCKED
+from app.core.trust_history import TrustHistory, REASON_RATING, REASON_LATE_CANCEL, REASON_RECOMPUTE
+from app.core.reporting import ReportAggregates, booking_deltas, auction_deltas, ride_deltas
+from app.core.outbox import (
+    Event, MemoryOutbox, booking_event, auction_opened_event, auction_closed_event, bid_event, ride_event
+)
+from app.core.store_protocol import Codec
+from app.core.idempotency import IdempotencyKeys, IdempotencyStore, Claimed
+from app.core.archive import (
+    RecordArchive, ArchiveEntry, BOOKINGS, AUCTIONS, ARCHIVABLE_BOOKING_STATUSES, ARCHIVABLE_AUCTION_STATUSES
+)
 
 
 # ============ Data Classes ============
+# Money fields are integer paise; trust scores and ratings are integer
+# hundredths of a point; final_score is integer ten-thousandths.
+#
+# Records are slotted (no per-instance __dict__) and status/role strings
+# are interned, so a million bookings share one "pending" string instead of
+# one each when they arrive from request bodies or the store protocol. The
+# store also points each record's foreign keys at the referenced record's
+# own id object (see InMemoryStore._share_ids).
+#
+# User and Car carry a version that update_user/update_car bump, so
+# serialized copies (app.core.payload_cache) can tell they are stale.
 
-@dataclass
+@dataclass(slots=True)
 class User:
     id: UUID
     name: str
@@ -21,34 +50,32 @@ class User:
     password_hash: str
     role: str = "user"
     total_rides: int = 0
-    avg_rating: Decimal = Decimal("0.00")
+    avg_rating: int = 0
     damage_count: int = 0
     rash_count: int = 0
-    trust_score: Decimal = Decimal("50.00")
+    trust_score: int = 5000
     is_blocked: bool = False
     created_at: datetime = field(default_factory=datetime.utcnow)
+    version: int = 0
+    
+    def __post_init__(self):
+        self.role = sys.intern(self.role)
     
     @property
     def is_admin(self) -> bool:
         return self.role == "admin"
     
-    def calculate_trust_score(self) -> Decimal:
-        score = (
-            (float(self.avg_rating) * 20) +
-            (self.total_rides * 0.5) -
-            (self.damage_count * 15) -
-            (self.rash_count * 10)
-        )
-        return Decimal(str(max(score, 0)))
+    def calculate_trust_score(self) -> int:
+        return trust_score(self.avg_rating, self.total_rides, self.damage_count, self.rash_count)
 
 
-@dataclass
+@dataclass(slots=True)
 class Car:
     id: UUID
     model: str
     number_plate: str
-    daily_price: Decimal
-    deposit: Decimal
+    daily_price: int
+    deposit: int
     image_url: Optional[str] = None
     seats: int = 5
     transmission: str = "automatic"
@@ -56,22 +83,26 @@ class Car:
     description: Optional[str] = None
     is_active: bool = True
     created_at: datetime = field(default_factory=datetime.utcnow)
+    version: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Booking:
     id: UUID
     user_id: UUID
     car_id: UUID
     start_time: datetime
     end_time: datetime
-    offer_price: Decimal
+    offer_price: int
     status: str = "pending"
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
+    
+    def __post_init__(self):
+        self.status = sys.intern(self.status)
 
 
-@dataclass
+@dataclass(slots=True)
 class Auction:
     id: UUID
     car_id: UUID
@@ -82,30 +113,36 @@ class Auction:
     status: str = "active"
     winner_id: Optional[UUID] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
+    
+    def __post_init__(self):
+        self.status = sys.intern(self.status)
 
 
-@dataclass
+@dataclass(slots=True)
 class Bid:
     id: UUID
     auction_id: UUID
     user_id: UUID
     booking_id: UUID
-    offer_price: Decimal
-    trust_score_snapshot: Decimal
-    final_score: Optional[Decimal] = None
+    offer_price: int
+    trust_score_snapshot: int
+    final_score: Optional[int] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
 
 
-@dataclass
+@dataclass(slots=True)
 class Ride:
     id: UUID
     booking_id: UUID
     status: str = "active"
     started_at: datetime = field(default_factory=datetime.utcnow)
     ended_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        self.status = sys.intern(self.status)
 
 
-@dataclass
+@dataclass(slots=True)
 class Rating:
     id: UUID
     ride_id: UUID
@@ -116,10 +153,45 @@ class Rating:
     created_at: datetime = field(default_factory=datetime.utcnow)
 
 
+# Record types the store server protocol can carry, in wire order
+RECORD_TYPES = (User, Car, Booking, Auction, Bid, Ride, Rating, Event)
+
+
+# Creation positions scanned per call while paging through iter_bookings
+BOOKING_PAGE_SIZE = 1000
+
+CANCELLABLE_STATUSES = ("pending", "competing", "confirmed")
+
+
 # ============ In-Memory Store ============
 
+def _locked(method: Callable) -> Callable:
+    @wraps(method)
+    def call(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return call
+
+
+def _serialized(cls: type) -> type:
+    """
+    Run each public method under the store's lock, one call at a time, as
+    the store server does for its clients. Request threads, the outbox
+    dispatcher and the archive job share one store within a process too,
+    and archive_terminal walks and deletes from the same dicts the request
+    handlers add to.
+    """
+    for name, value in list(vars(cls).items()):
+        if isfunction(value) and not isgeneratorfunction(value) and not name.startswith("_"):
+            setattr(cls, name, _locked(value))
+    return cls
+
+
+@_serialized
 class InMemoryStore:
     def __init__(self):
+        self._lock = threading.RLock()
+        
         self.users: Dict[UUID, User] = {}
         self.cars: Dict[UUID, Car] = {}
         self.bookings: Dict[UUID, Booking] = {}
@@ -128,6 +200,32 @@ class InMemoryStore:
         self.rides: Dict[UUID, Ride] = {}
         self.ratings: Dict[UUID, Rating] = {}
         
+        # Booking ids in creation order. Archived bookings leave a None
+        # behind and leading Nones are trimmed into booking_order_base, so
+        # booking_order_base + index is a stable cursor
+        self.booking_order: List[Optional[UUID]] = []
+        self.booking_order_base = 0
+        
+        # Secondary indexes
+        self.occupancy = OccupancyIndex()
+        self.catalog = CarCatalogIndex()
+        self.text_index = CarTextIndex()
+        self.leaderboard = TrustLeaderboard()
+        self.calendars: Dict[UUID, AvailabilityCalendar] = {}
+        self.trust_history: Dict[UUID, TrustHistory] = {}
+        self.reports = ReportAggregates()
+        
+        # Domain events, appended by the same method call as the change
+        self.outbox = MemoryOutbox()
+        
+        # Idempotency-Key responses, shared by every worker using this store
+        self.idempotency_keys = IdempotencyKeys(
+            settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_MAX_KEYS, settings.IDEMPOTENCY_LEASE_SECONDS
+        )
+        
+        # Terminal bookings and closed auctions moved out by archive_terminal
+        self.archive = RecordArchive(Codec(RECORD_TYPES))
+        
         # Initialize with seed data
         self._seed_data()
     
@@ -137,15 +235,15 @@ class InMemoryStore:
         # ============ USERS ============
         # Admin user
         admin_id = uuid4()
-        self.users[admin_id] = User(
+        self.create_user(User(
             id=admin_id,
             name="Admin User",
             email="admin@surya.com",
             phone="+91-9876543210",
             password_hash=get_password_hash("admin123"),
             role="admin",
-            trust_score=Decimal("100.00")
-        )
+            trust_score=to_centi("100.00")
+        ))
         
         # Regular users with varying trust scores
         users_data = [
@@ -154,69 +252,69 @@ class InMemoryStore:
                 "email": "rahul@example.com",
                 "phone": "+91-9876543211",
                 "total_rides": 25,
-                "avg_rating": Decimal("4.80"),
+                "avg_rating": to_centi("4.80"),
                 "damage_count": 0,
                 "rash_count": 0,
-                "trust_score": Decimal("108.50"),  # Excellent driver
+                "trust_score": to_centi("108.50"),  # Excellent driver
             },
             {
                 "name": "Priya Patel",
                 "email": "priya@example.com",
                 "phone": "+91-9876543212",
                 "total_rides": 15,
-                "avg_rating": Decimal("4.50"),
+                "avg_rating": to_centi("4.50"),
                 "damage_count": 0,
                 "rash_count": 1,
-                "trust_score": Decimal("87.50"),  # Good driver
+                "trust_score": to_centi("87.50"),  # Good driver
             },
             {
                 "name": "Amit Singh",
                 "email": "amit@example.com",
                 "phone": "+91-9876543213",
                 "total_rides": 8,
-                "avg_rating": Decimal("4.00"),
+                "avg_rating": to_centi("4.00"),
                 "damage_count": 1,
                 "rash_count": 0,
-                "trust_score": Decimal("69.00"),  # Average driver
+                "trust_score": to_centi("69.00"),  # Average driver
             },
             {
                 "name": "Neha Gupta",
                 "email": "neha@example.com",
                 "phone": "+91-9876543214",
                 "total_rides": 3,
-                "avg_rating": Decimal("3.50"),
+                "avg_rating": to_centi("3.50"),
                 "damage_count": 1,
                 "rash_count": 1,
-                "trust_score": Decimal("36.50"),  # Below average
+                "trust_score": to_centi("36.50"),  # Below average
             },
             {
                 "name": "Vikram Reddy",
                 "email": "vikram@example.com",
                 "phone": "+91-9876543215",
                 "total_rides": 0,
-                "avg_rating": Decimal("0.00"),
+                "avg_rating": to_centi("0.00"),
                 "damage_count": 0,
                 "rash_count": 0,
-                "trust_score": Decimal("50.00"),  # New user
+                "trust_score": to_centi("50.00"),  # New user
             },
         ]
         
         for data in users_data:
             user_id = uuid4()
-            self.users[user_id] = User(
+            self.create_user(User(
                 id=user_id,
                 password_hash=get_password_hash("password123"),
                 role="user",
                 **data
-            )
+            ))
         
         # ============ CARS ============
         cars_data = [
             {
                 "model": "Maruti Swift Dzire",
                 "number_plate": "KA-01-AB-1234",
-                "daily_price": Decimal("1500.00"),
-                "deposit": Decimal("5000.00"),
+                "daily_price": to_paise("1500.00"),
+                "deposit": to_paise("5000.00"),
                 "seats": 5,
                 "transmission": "manual",
                 "fuel_type": "petrol",
@@ -226,8 +324,8 @@ class InMemoryStore:
             {
                 "model": "Hyundai Creta",
                 "number_plate": "KA-01-CD-5678",
-                "daily_price": Decimal("2500.00"),
-                "deposit": Decimal("10000.00"),
+                "daily_price": to_paise("2500.00"),
+                "deposit": to_paise("10000.00"),
                 "seats": 5,
                 "transmission": "automatic",
                 "fuel_type": "diesel",
@@ -237,8 +335,8 @@ class InMemoryStore:
             {
                 "model": "Toyota Innova Crysta",
                 "number_plate": "KA-01-EF-9012",
-                "daily_price": Decimal("3500.00"),
-                "deposit": Decimal("15000.00"),
+                "daily_price": to_paise("3500.00"),
+                "deposit": to_paise("15000.00"),
                 "seats": 7,
                 "transmission": "automatic",
                 "fuel_type": "diesel",
@@ -248,8 +346,8 @@ class InMemoryStore:
             {
                 "model": "Mahindra Thar",
                 "number_plate": "KA-01-GH-3456",
-                "daily_price": Decimal("3000.00"),
-                "deposit": Decimal("12000.00"),
+                "daily_price": to_paise("3000.00"),
+                "deposit": to_paise("12000.00"),
                 "seats": 4,
                 "transmission": "manual",
                 "fuel_type": "diesel",
@@ -259,8 +357,8 @@ class InMemoryStore:
             {
                 "model": "Honda City",
                 "number_plate": "KA-01-IJ-7890",
-                "daily_price": Decimal("2000.00"),
-                "deposit": Decimal("8000.00"),
+                "daily_price": to_paise("2000.00"),
+                "deposit": to_paise("8000.00"),
                 "seats": 5,
                 "transmission": "automatic",
                 "fuel_type": "petrol",
@@ -270,8 +368,8 @@ class InMemoryStore:
             {
                 "model": "Kia Seltos",
                 "number_plate": "KA-01-KL-1122",
-                "daily_price": Decimal("2200.00"),
-                "deposit": Decimal("9000.00"),
+                "daily_price": to_paise("2200.00"),
+                "deposit": to_paise("9000.00"),
                 "seats": 5,
                 "transmission": "automatic",
                 "fuel_type": "petrol",
@@ -282,7 +380,7 @@ class InMemoryStore:
         
         for data in cars_data:
             car_id = uuid4()
-            self.cars[car_id] = Car(id=car_id, **data)
+            self.create_car(Car(id=car_id, **data))
         
         print("\n✅ In-Memory Store initialized with seed data!")
         print("\n📧 Login Credentials:")
@@ -304,31 +402,167 @@ class InMemoryStore:
     def get_user_by_id(self, user_id: UUID) -> Optional[User]:
         return self.users.get(user_id)
     
+    def get_users_by_ids(self, user_ids: List[UUID]) -> Dict[UUID, User]:
+        return {user_id: self.users[user_id] for user_id in user_ids if user_id in self.users}
+    
     def create_user(self, user: User) -> User:
         self.users[user.id] = user
+        self.leaderboard.add(user)
         return user
     
-    def get_all_users(self, role: str = None, blocked_only: bool = False) -> List[User]:
-        users = list(self.users.values())
-        if role:
-            users = [u for u in users if u.role == role]
-        if blocked_only:
-            users = [u for u in users if u.is_blocked]
-        return sorted(users, key=lambda u: float(u.trust_score), reverse=True)
+    def update_user(self, user_id: UUID, data: dict, reason: str = REASON_RECOMPUTE) -> Optional[User]:
+        """Apply updates; trust score changes are appended to the user's history under `reason`"""
+        user = self.users.get(user_id)
+        if user:
+            previous_score = user.trust_score
+            for key, value in data.items():
+                if hasattr(user, key):
+                    setattr(user, key, value)
+            user.version += 1
+            if user.trust_score != previous_score:
+                history = self.trust_history.get(user_id)
+                if history is None:
+                    history = self.trust_history[user_id] = TrustHistory()
+                history.append(
+                    datetime.utcnow(), user.trust_score - previous_score, reason, previous_score
+                )
+            self.leaderboard.add(user)
+        return user
+    
+    def record_rating(self, user_id: UUID, driving_rating: int, damage: bool, rash: bool) -> Optional[User]:
+        """
+        Count a rated ride in the user's totals and recompute the trust score,
+        blocking the user below AUTO_BLOCK_THRESHOLD. One call, so ratings
+        recorded by concurrent workers all count
+        """
+        user = self.users.get(user_id)
+        if user is None:
+            return None
+        total_rides = user.total_rides + 1
+        updates = {
+            "total_rides": total_rides,
+            "avg_rating": running_average(user.avg_rating, total_rides, driving_rating),
+            "damage_count": user.damage_count + (1 if damage else 0),
+            "rash_count": user.rash_count + (1 if rash else 0),
+        }
+        updates["trust_score"] = trust_score(
+            updates["avg_rating"], total_rides, updates["damage_count"], updates["rash_count"]
+        )
+        if updates["trust_score"] < AUTO_BLOCK_THRESHOLD:
+            updates["is_blocked"] = True
+        return self.update_user(user_id, updates, reason=REASON_RATING)
+    
+    def get_trust_history(self, user_id: UUID) -> TrustHistory:
+        return self.trust_history.get(user_id) or TrustHistory()
+    
+    def get_trust_events(
+        self,
+        user_id: UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[tuple]:
+        return list(self.get_trust_history(user_id).events(start, end))
+    
+    def get_all_users(
+        self,
+        role: str = None,
+        blocked_only: bool = False,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[User]:
+        """Users by descending trust score, read off the leaderboard index"""
+        user_ids = self.leaderboard.top(
+            role=role, blocked=True if blocked_only else None, skip=skip, limit=limit
+        )
+        return [self.users[user_id] for user_id in user_ids]
+    
+    def get_leaderboard(self, limit: int, role: str = "user") -> List[User]:
+        """Top non-blocked users by trust score"""
+        user_ids = self.leaderboard.top(role=role, blocked=False, limit=limit)
+        return [self.users[user_id] for user_id in user_ids]
+    
+    def get_user_rank(self, user_id: UUID) -> Optional[tuple]:
+        """(rank, out_of) among users sharing this user's role and block status"""
+        return self.leaderboard.rank(user_id)
+    
+    def get_counts(self) -> Dict[str, int]:
+        """Record counts for the admin dashboard"""
+        users = [u for u in self.users.values() if u.role == "user"]
+        return {
+            "users": len(users),
+            "blocked_users": len([u for u in users if u.is_blocked]),
+            "cars": len(self.cars),
+            "active_cars": len([c for c in self.cars.values() if c.is_active]),
+            "pending_bookings": len([b for b in self.bookings.values() if b.status == "pending"]),
+            "confirmed_bookings": len([b for b in self.bookings.values() if b.status == "confirmed"]),
+            "active_auctions": len([a for a in self.auctions.values() if a.status == "active"]),
+            "active_rides": len([r for r in self.rides.values() if r.status == "active"]),
+        }
     
     # ============ Car Methods ============
     
+    def get_car_count(self, created_before: datetime) -> int:
+        """Cars, active or not, created before `created_before`"""
+        return sum(1 for car in self.cars.values() if car.created_at < created_before)
+    
     def get_car_by_id(self, car_id: UUID) -> Optional[Car]:
         return self.cars.get(car_id)
     
+    def get_cars_by_ids(self, car_ids: List[UUID]) -> Dict[UUID, Car]:
+        return {car_id: self.cars[car_id] for car_id in car_ids if car_id in self.cars}
+    
+    def get_car_by_plate(self, number_plate: str) -> Optional[Car]:
+        for car in self.cars.values():
+            if car.number_plate == number_plate:
+                return car
+        return None
+    
     def get_all_cars(self, active_only: bool = True) -> List[Car]:
         cars = list(self.cars.values())
         if active_only:
             cars = [c for c in cars if c.is_active]
         return cars
     
+    def search_cars(
+        self,
+        transmission: Optional[str] = None,
+        fuel_type: Optional[str] = None,
+        seats: Optional[int] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        sort: Optional[str] = None,
+        text: Optional[str] = None,
+        available_from: Optional[datetime] = None,
+        available_to: Optional[datetime] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Car]:
+        """Active cars matching the filters, served from the catalog index"""
+        busy = None
+        if available_from is not None and available_to is not None:
+            busy = self.occupancy.busy_car_ids(available_from, available_to)
+        
+        ranked = self.text_index.search(text) if text else None
+        
+        car_ids = self.catalog.search(
+            transmission=transmission,
+            fuel_type=fuel_type,
+            seats=seats,
+            min_price=min_price,
+            max_price=max_price,
+            sort=sort,
+            exclude=busy,
+            ranked=ranked,
+            skip=skip,
+            limit=limit
+        )
+        return [self.cars[car_id] for car_id in car_ids]
+    
     def create_car(self, car: Car) -> Car:
         self.cars[car.id] = car
+        if car.is_active:
+            self.catalog.add(car)
+            self.text_index.add(car)
         return car
     
     def update_car(self, car_id: UUID, data: dict) -> Optional[Car]:
@@ -337,19 +571,75 @@ class InMemoryStore:
             for key, value in data.items():
                 if hasattr(car, key):
                     setattr(car, key, value)
+            car.version += 1
+            if car.is_active:
+                self.catalog.add(car)
+                self.text_index.add(car)
+            else:
+                self.catalog.remove(car_id)
+                self.text_index.remove(car_id)
         return car
     
     def delete_car(self, car_id: UUID) -> bool:
         if car_id in self.cars:
             del self.cars[car_id]
+            self.catalog.forget(car_id)
+            self.text_index.remove(car_id)
+            self.occupancy.drop_car(car_id)
+            self.calendars.pop(car_id, None)
+            self.reports.drop_car(car_id)
             return True
         return False
     
+    def get_calendar(self, car_id: UUID) -> AvailabilityCalendar:
+        calendar = self.calendars.get(car_id)
+        if calendar is None:
+            calendar = self.calendars[car_id] = AvailabilityCalendar()
+        return calendar
+    
+    def get_calendar_ranges(
+        self,
+        car_id: UUID,
+        start: datetime,
+        end: datetime,
+        status: Optional[str] = None
+    ) -> List[dict]:
+        return self.get_calendar(car_id).ranges(start, end, status)
+    
+    def _writable_calendar(self, car_id: UUID) -> AvailabilityCalendar:
+        """The car's calendar, trimmed to CALENDAR_RETENTION_DAYS before a change"""
+        calendar = self.get_calendar(car_id)
+        calendar.trim(datetime.utcnow() - timedelta(days=settings.CALENDAR_RETENTION_DAYS))
+        return calendar
+    
+    # ============ Report Methods ============
+    
+    def get_fleet_totals(self, first_day: int, last_day: int) -> List[int]:
+        return self.reports.fleet_totals(first_day, last_day)
+    
+    def get_car_totals(self, first_day: int, last_day: int) -> Dict[UUID, List[int]]:
+        """Window totals for every car, keyed by car id"""
+        return {
+            car_id: self.reports.car_totals(car_id, first_day, last_day)
+            for car_id in self.cars
+        }
+    
+    def get_daily_totals(
+        self,
+        first_day: int,
+        last_day: int,
+        car_id: Optional[UUID] = None
+    ) -> List[Tuple[int, List[int]]]:
+        return self.reports.daily(first_day, last_day, car_id)
+    
     # ============ Booking Methods ============
     
     def get_booking_by_id(self, booking_id: UUID) -> Optional[Booking]:
         return self.bookings.get(booking_id)
     
+    def get_bookings_by_ids(self, booking_ids: List[UUID]) -> Dict[UUID, Booking]:
+        return {booking_id: self.bookings[booking_id] for booking_id in booking_ids if booking_id in self.bookings}
+    
     def get_bookings_by_user(self, user_id: UUID, status: str = None) -> List[Booking]:
         bookings = [b for b in self.bookings.values() if b.user_id == user_id]
         if status:
@@ -362,10 +652,188 @@ class InMemoryStore:
             bookings = [b for b in bookings if b.status == status]
         return sorted(bookings, key=lambda b: b.created_at, reverse=True)
     
+    def iter_bookings(
+        self,
+        status: str = None,
+        start: datetime = None,
+        end: datetime = None
+    ) -> Iterator[Booking]:
+        """
+        Bookings in creation order, optionally starting within [start, end).
+        Walks the creation-order ids up to their length at the first step
+        rather than materializing or sorting records, so bookings created
+        mid-iteration are not included. Fetched a page of positions per
+        locked get_bookings_page call, so the walk never holds the store.
+        """
+        position = 0
+        until = self.get_booking_count()
+        while position < until:
+            page, position = self.get_bookings_page(position, until, BOOKING_PAGE_SIZE, status, start, end)
+            yield from page
+    
+    def get_booking_count(self) -> int:
+        """Creation positions handed out so far, archived bookings included"""
+        return self.booking_order_base + len(self.booking_order)
+    
+    def get_bookings_page(
+        self,
+        after: int,
+        until: int,
+        limit: int,
+        status: str = None,
+        start: datetime = None,
+        end: datetime = None
+    ) -> Tuple[List[Booking], int]:
+        """
+        Matching bookings among creation positions [after, min(after + limit, until)),
+        and the position to resume from. Lets a remote caller page through
+        iter_bookings without holding the store for the whole walk.
+        """
+        base = self.booking_order_base
+        stop = max(after, min(after + limit, until, self.get_booking_count()))
+        page = [
+            booking
+            for booking in map(self.bookings.get, self.booking_order[max(after - base, 0):max(stop - base, 0)])
+            if booking is not None and _booking_matches(booking, status, start, end)
+        ]
+        return page, stop
+    
+    def car_has_bookings(self, car_id: UUID, statuses: List[str]) -> bool:
+        return any(
+            b.car_id == car_id and b.status in statuses
+            for b in self.bookings.values()
+        )
+    
+    def get_confirmed_overlaps(self, car_id: UUID, start_time: datetime, end_time: datetime) -> List[Booking]:
+        """Confirmed bookings of the car overlapping [start_time, end_time), read off the occupancy index"""
+        return [
+            b for b in map(self.bookings.get, self.occupancy.overlapping(car_id, start_time, end_time))
+            if b.status == "confirmed"
+        ]
+    
     def create_booking(self, booking: Booking) -> Booking:
+        self._share_ids(booking, user_id=self.users, car_id=self.cars)
         self.bookings[booking.id] = booking
+        self.booking_order.append(booking.id)
+        self._index_booking(booking)
+        self.reports.apply(booking.car_id, booking_deltas(
+            booking.start_time, booking.end_time, booking.offer_price, None, booking.status
+        ))
+        self._booking_event(booking, None)
         return booking
     
+    def request_booking(self, booking: Booking) -> Optional[Booking]:
+        """
+        Add a requested booking, unless a confirmed booking of the car
+        overlaps it (None). Pending and competing bookings it overlaps go to
+        the car's active auction for the period, opened if there is none, and
+        the new booking joins them as competing
+        """
+        if self.get_confirmed_overlaps(booking.car_id, booking.start_time, booking.end_time):
+            return None
+        self.create_booking(booking)
+        
+        conflicts = self.get_conflicting_bookings(
+            booking.car_id, booking.start_time, booking.end_time, exclude_id=booking.id
+        )
+        if not conflicts:
+            return booking
+        
+        auction = self.get_active_auction(booking.car_id, booking.start_time, booking.end_time)
+        if not auction:
+            auction = self.create_auction(Auction(
+                id=uuid4(),
+                car_id=booking.car_id,
+                start_time=booking.start_time,
+                end_time=booking.end_time,
+                auction_end=datetime.utcnow() + timedelta(hours=settings.AUCTION_DURATION_HOURS)
+            ))
+        
+        for entrant in conflicts + [booking]:
+            if not self.get_bid_by_user_auction(entrant.user_id, auction.id):
+                user = self.users.get(entrant.user_id)
+                self.create_bid(Bid(
+                    id=uuid4(),
+                    auction_id=auction.id,
+                    user_id=entrant.user_id,
+                    booking_id=entrant.id,
+                    offer_price=entrant.offer_price,
+                    trust_score_snapshot=user.trust_score if user else 0
+                ))
+                if entrant is not booking:
+                    self.update_booking_status(entrant, "competing")
+        
+        return self.update_booking_status(booking, "competing")
+    
+    def update_booking_status(
+        self,
+        booking: Booking,
+        status: str,
+        only_from: Optional[List[str]] = None
+    ) -> Optional[Booking]:
+        """Set the status; with only_from, only if the stored status is one of those (None otherwise)"""
+        # Callers may hold a copy (store server clients); update the stored record
+        booking = self.bookings.get(booking.id, booking)
+        previous = booking.status
+        if only_from is not None and previous not in only_from:
+            return None
+        booking.status = sys.intern(status)
+        booking.updated_at = datetime.utcnow()
+        self._index_booking(booking)
+        self.reports.apply(booking.car_id, booking_deltas(
+            booking.start_time, booking.end_time, booking.offer_price, previous, status
+        ))
+        self._booking_event(booking, previous)
+        
+        calendar = self._writable_calendar(booking.car_id)
+        if status == "confirmed":
+            calendar.mark(BOOKED, booking.start_time, booking.end_time)
+        elif previous == "confirmed" and status in ("cancelled", "rejected"):
+            still_booked = [
+                (b.start_time, b.end_time)
+                for b in map(self.bookings.get, self.occupancy.overlapping(
+                    booking.car_id, booking.start_time, booking.end_time
+                ))
+                if b.status == "confirmed"
+            ]
+            calendar.release(BOOKED, booking.start_time, booking.end_time, keep=still_booked)
+        return booking
+    
+    def cancel_booking(self, booking_id: UUID, late_penalty: int = 0) -> Optional[Booking]:
+        """
+        Cancel a pending, competing or confirmed booking (None if it is in
+        another status). Cancelling a confirmed booking takes late_penalty
+        off its user's trust score
+        """
+        booking = self.bookings.get(booking_id)
+        if booking is None or booking.status not in CANCELLABLE_STATUSES:
+            return None
+        if booking.status == "confirmed" and late_penalty:
+            user = self.users.get(booking.user_id)
+            if user:
+                self.update_user(user.id, {
+                    "trust_score": max(0, user.trust_score - late_penalty)
+                }, reason=REASON_LATE_CANCEL)
+        return self.update_booking_status(booking, "cancelled")
+    
+    def update_booking_offer(self, booking_id: UUID, offer_price: int) -> Optional[Booking]:
+        booking = self.bookings.get(booking_id)
+        if booking:
+            booking.offer_price = offer_price
+        return booking
+    
+    def _booking_event(self, booking: Booking, previous: Optional[str]) -> None:
+        self.outbox.append(*booking_event(
+            booking.id, booking.car_id, booking.user_id, previous, booking.status,
+            booking.offer_price, booking.start_time, booking.end_time
+        ))
+    
+    def _index_booking(self, booking: Booking) -> None:
+        if booking.status in OCCUPYING_STATUSES:
+            self.occupancy.add(booking.id, booking.car_id, booking.start_time, booking.end_time)
+        else:
+            self.occupancy.remove(booking.id)
+    
     def get_conflicting_bookings(self, car_id: UUID, start_time: datetime, end_time: datetime, exclude_id: UUID = None) -> List[Booking]:
         conflicts = []
         for booking in self.bookings.values():
@@ -387,6 +855,14 @@ class InMemoryStore:
                 user_auction_ids.add(bid.auction_id)
         return [a for a in self.auctions.values() if a.id in user_auction_ids and a.status == "active"]
     
+    def get_active_auction(self, car_id: UUID, start_time: datetime, end_time: datetime) -> Optional[Auction]:
+        """An active auction of the car overlapping [start_time, end_time)"""
+        for auction in self.auctions.values():
+            if auction.car_id == car_id and auction.status == "active":
+                if auction.start_time < end_time and auction.end_time > start_time:
+                    return auction
+        return None
+    
     def get_all_auctions(self, status: str = None) -> List[Auction]:
         auctions = list(self.auctions.values())
         if status:
@@ -394,12 +870,98 @@ class InMemoryStore:
         return sorted(auctions, key=lambda a: a.created_at, reverse=True)
     
     def create_auction(self, auction: Auction) -> Auction:
+        self._share_ids(auction, car_id=self.cars)
         self.auctions[auction.id] = auction
+        self.reports.apply(auction.car_id, auction_deltas(auction.start_time))
+        self.outbox.append(*auction_opened_event(
+            auction.id, auction.car_id, auction.start_time, auction.end_time
+        ))
+        if auction.status == "active":
+            self._writable_calendar(auction.car_id).mark(LOCKED, auction.start_time, auction.end_time)
+        return auction
+    
+    def update_auction_status(self, auction: Auction, status: str) -> Auction:
+        auction = self.auctions.get(auction.id, auction)
+        previous = auction.status
+        auction.status = sys.intern(status)
+        if previous == "active" and status != "active":
+            still_locked = [
+                (a.start_time, a.end_time)
+                for a in self.auctions.values()
+                if a.car_id == auction.car_id and a.status == "active"
+            ]
+            self._writable_calendar(auction.car_id).release(
+                LOCKED, auction.start_time, auction.end_time, keep=still_locked
+            )
+            self.outbox.append(*auction_closed_event(auction.id, auction.car_id, auction.winner_id))
+        return auction
+    
+    def update_auction(self, auction_id: UUID, data: dict) -> Optional[Auction]:
+        """Set result fields; status changes go through update_auction_status"""
+        auction = self.auctions.get(auction_id)
+        if auction:
+            for key, value in data.items():
+                if key != "status" and hasattr(auction, key):
+                    setattr(auction, key, value)
         return auction
     
+    def close_auction(self, auction_id: UUID) -> Optional[Tuple[Auction, Optional[Bid]]]:
+        """
+        Score an active auction's bids, pick the winner and close it: the
+        winning booking is confirmed, the others rejected. Returns the closed
+        auction and winning bid (None without bids), or None if the auction
+        was not active, so only one of several concurrent closes does it.
+        
+        The winner is the best final score among bids whose trust snapshot
+        reaches TRUST_THRESHOLD, else the highest offer.
+        """
+        auction = self.auctions.get(auction_id)
+        if auction is None or auction.status != "active":
+            return None
+        
+        bids = self.get_auction_bids(auction_id)
+        if not bids:
+            return self.update_auction_status(auction, "closed"), None
+        
+        rides = []
+        for bid in bids:
+            user = self.users.get(bid.user_id)
+            rides.append(user.total_rides if user else 0)
+        scores = final_scores(
+            [b.trust_score_snapshot for b in bids], rides, [b.offer_price for b in bids]
+        )
+        for bid, score in zip(bids, scores):
+            bid.final_score = score
+        
+        eligible_bids = [b for b in bids if b.trust_score_snapshot >= TRUST_THRESHOLD]
+        if eligible_bids:
+            winner_bid = max(eligible_bids, key=lambda b: b.final_score)
+        else:
+            winner_bid = max(bids, key=lambda b: b.offer_price)
+        
+        # Winner first, so the closed event carries it
+        auction.winner_id = winner_bid.user_id
+        auction.auction_end = datetime.utcnow()
+        self.update_auction_status(auction, "closed")
+        
+        for bid in bids:
+            booking = self.bookings.get(bid.booking_id)
+            if booking:
+                self.update_booking_status(booking, "confirmed" if bid.id == winner_bid.id else "rejected")
+        return auction, winner_bid
+    
     def get_auction_bids(self, auction_id: UUID) -> List[Bid]:
         return [b for b in self.bids.values() if b.auction_id == auction_id]
     
+    def get_bids_by_auctions(self, auction_ids: List[UUID]) -> Dict[UUID, List[Bid]]:
+        """Bids of several auctions in one pass; every requested auction gets a list"""
+        wanted = set(auction_ids)
+        found: Dict[UUID, List[Bid]] = {auction_id: [] for auction_id in wanted}
+        for bid in self.bids.values():
+            if bid.auction_id in wanted:
+                found[bid.auction_id].append(bid)
+        return found
+    
     # ============ Bid Methods ============
     
     def get_bid_by_user_auction(self, user_id: UUID, auction_id: UUID) -> Optional[Bid]:
@@ -409,9 +971,71 @@ class InMemoryStore:
         return None
     
     def create_bid(self, bid: Bid) -> Bid:
+        self._share_ids(bid, auction_id=self.auctions, user_id=self.users, booking_id=self.bookings)
         self.bids[bid.id] = bid
+        self._bid_event(bid)
         return bid
     
+    def place_bid(
+        self,
+        auction_id: UUID,
+        user_id: UUID,
+        offer_price: int,
+        trust_score_snapshot: int
+    ) -> Optional[Tuple[Bid, bool]]:
+        """
+        Update the user's bid on an active auction, or enter them with a new
+        competing booking for the auction's period. Returns the bid and
+        whether it is new, or None if the auction is not active
+        """
+        auction = self.auctions.get(auction_id)
+        if auction is None or auction.status != "active":
+            return None
+        
+        bid = self.get_bid_by_user_auction(user_id, auction_id)
+        if bid:
+            self.update_bid(bid.id, {
+                "offer_price": offer_price,
+                "trust_score_snapshot": trust_score_snapshot,
+            })
+            self.update_booking_offer(bid.booking_id, offer_price)
+            return bid, False
+        
+        booking = self.create_booking(Booking(
+            id=uuid4(),
+            user_id=user_id,
+            car_id=auction.car_id,
+            start_time=auction.start_time,
+            end_time=auction.end_time,
+            offer_price=offer_price,
+            status="competing"
+        ))
+        bid = self.create_bid(Bid(
+            id=uuid4(),
+            auction_id=auction_id,
+            user_id=user_id,
+            booking_id=booking.id,
+            offer_price=offer_price,
+            trust_score_snapshot=trust_score_snapshot
+        ))
+        return bid, True
+    
+    def update_bid(self, bid_id: UUID, data: dict) -> Optional[Bid]:
+        """Apply updates; a new offer is published as a bid event, scoring is not"""
+        bid = self.bids.get(bid_id)
+        if bid:
+            for key, value in data.items():
+                if hasattr(bid, key):
+                    setattr(bid, key, value)
+            if "offer_price" in data:
+                self._bid_event(bid)
+        return bid
+    
+    def _bid_event(self, bid: Bid) -> None:
+        self.outbox.append(*bid_event(
+            bid.id, bid.auction_id, bid.user_id, bid.booking_id, bid.offer_price
+        ))
+    
     # ============ Ride Methods ============
     
     def get_ride_by_booking(self, booking_id: UUID) -> Optional[Ride]:
@@ -420,13 +1044,58 @@ class InMemoryStore:
                 return ride
         return None
     
-    def create_ride(self, ride: Ride) -> Ride:
+    def get_rides_by_bookings(self, booking_ids: List[UUID]) -> Dict[UUID, Ride]:
+        """Rides keyed by booking id, in one pass"""
+        wanted = set(booking_ids)
+        return {ride.booking_id: ride for ride in self.rides.values() if ride.booking_id in wanted}
+    
+    def create_ride(self, ride: Ride) -> Optional[Ride]:
+        """Add the booking's ride; None if the booking already has one"""
+        if self.get_ride_by_booking(ride.booking_id):
+            return None
+        self._share_ids(ride, booking_id=self.bookings)
         self.rides[ride.id] = ride
+        self.outbox.append(*ride_event(ride.id, ride.booking_id, None, ride.status))
         return ride
     
     def get_ride_by_id(self, ride_id: UUID) -> Optional[Ride]:
         return self.rides.get(ride_id)
     
+    def update_ride_status(self, ride: Ride, status: str, only_from: Optional[List[str]] = None) -> Optional[Ride]:
+        """Set the status; with only_from, only if the stored status is one of those (None otherwise)"""
+        ride = self.rides.get(ride.id, ride)
+        previous = ride.status
+        if only_from is not None and previous not in only_from:
+            return None
+        ride.status = sys.intern(status)
+        if status == "completed" and previous == "active":
+            ride.ended_at = datetime.utcnow()
+            booking = self.bookings.get(ride.booking_id)
+            if booking:
+                self.reports.apply(booking.car_id, ride_deltas(ride.ended_at))
+        if status != previous:
+            self.outbox.append(*ride_event(ride.id, ride.booking_id, previous, status))
+        return ride
+    
+    # ============ Outbox Methods ============
+    
+    def claim_events(self, limit: int, lease_seconds: float) -> List[Event]:
+        return self.outbox.claim(limit, lease_seconds)
+    
+    def ack_events(self, event_ids: List[int]) -> None:
+        self.outbox.ack(event_ids)
+    
+    # ============ Idempotency Methods ============
+    
+    def claim_idempotency_key(self, user_id: UUID, route: str, key: str, fingerprint: str) -> Optional[Claimed]:
+        return self.idempotency_keys.claim((user_id, route, key), fingerprint)
+    
+    def finish_idempotency_key(self, user_id: UUID, route: str, key: str, body: bytes) -> None:
+        self.idempotency_keys.finish((user_id, route, key), body)
+    
+    def abandon_idempotency_key(self, user_id: UUID, route: str, key: str) -> None:
+        self.idempotency_keys.abandon((user_id, route, key))
+    
     # ============ Rating Methods ============
     
     def get_rating_by_ride(self, ride_id: UUID) -> Optional[Rating]:
@@ -435,10 +1104,128 @@ class InMemoryStore:
                 return rating
         return None
     
-    def create_rating(self, rating: Rating) -> Rating:
+    def get_ratings_by_rides(self, ride_ids: List[UUID]) -> Dict[UUID, Rating]:
+        """Ratings keyed by ride id, in one pass"""
+        wanted = set(ride_ids)
+        return {rating.ride_id: rating for rating in self.ratings.values() if rating.ride_id in wanted}
+    
+    def create_rating(self, rating: Rating) -> Optional[Rating]:
+        """Add the ride's rating; None if the ride is already rated"""
+        if self.get_rating_by_ride(rating.ride_id):
+            return None
+        self._share_ids(rating, ride_id=self.rides)
         self.ratings[rating.id] = rating
         return rating
+    
+    @staticmethod
+    def _share_ids(record, **tables: Dict[UUID, object]) -> None:
+        """Point foreign key fields at the referenced record's id object instead of an equal copy"""
+        for name, table in tables.items():
+            target = table.get(getattr(record, name))
+            if target is not None:
+                setattr(record, name, target.id)
+    
+    # ============ Archive Methods ============
+    
+    def archive_terminal(self, cutoff: datetime) -> Dict[str, int]:
+        """
+        Move closed auctions (with their bids) and finished bookings (with
+        their ride and rating) last touched before `cutoff` into the archive.
+        Bookings still referenced by a bid of a live auction stay. Reports,
+        trust scores and trust history are kept separately and are unchanged.
+        """
+        auction_entries: List[ArchiveEntry] = []
+        bids_by_auction: Dict[UUID, List[Bid]] = {}
+        for bid in self.bids.values():
+            bids_by_auction.setdefault(bid.auction_id, []).append(bid)
+        for auction in list(self.auctions.values()):
+            ended = auction.auction_end or auction.created_at
+            if auction.status not in ARCHIVABLE_AUCTION_STATUSES or ended >= cutoff:
+                continue
+            bids = sorted(bids_by_auction.pop(auction.id, []), key=lambda b: b.created_at)
+            auction_entries.append((auction.id, auction.status, auction.created_at, {"auction": auction, "bids": bids}))
+            del self.auctions[auction.id]
+            for bid in bids:
+                del self.bids[bid.id]
+        
+        bid_bookings = {bid.booking_id for bids in bids_by_auction.values() for bid in bids}
+        rides_by_booking = {ride.booking_id: ride for ride in self.rides.values()}
+        ratings_by_ride = {rating.ride_id: rating for rating in self.ratings.values()}
+        booking_entries: List[ArchiveEntry] = []
+        for booking in list(self.bookings.values()):
+            if (
+                booking.status not in ARCHIVABLE_BOOKING_STATUSES
+                or booking.updated_at >= cutoff
+                or booking.id in bid_bookings
+            ):
+                continue
+            ride = rides_by_booking.get(booking.id)
+            if ride and ride.status == "active":
+                continue
+            rating = ratings_by_ride.get(ride.id) if ride else None
+            booking_entries.append((
+                booking.id, booking.status, booking.created_at,
+                {"booking": booking, "ride": ride, "rating": rating}
+            ))
+            del self.bookings[booking.id]
+            self.occupancy.remove(booking.id)
+            if ride:
+                del self.rides[ride.id]
+            if rating:
+                del self.ratings[rating.id]
+        
+        if booking_entries:
+            self._compact_booking_order()
+        self.archive.append(AUCTIONS, auction_entries)
+        self.archive.append(BOOKINGS, booking_entries)
+        return {AUCTIONS: len(auction_entries), BOOKINGS: len(booking_entries)}
+    
+    def _compact_booking_order(self) -> None:
+        order = [booking_id if booking_id in self.bookings else None for booking_id in self.booking_order]
+        leading = next((i for i, booking_id in enumerate(order) if booking_id is not None), len(order))
+        self.booking_order = order[leading:]
+        self.booking_order_base += leading
+    
+    def get_archived(self, record_id: UUID) -> Optional[dict]:
+        """The archived bundle for a booking or auction id, if it was archived"""
+        return self.archive.get(record_id)
+    
+    def get_archived_bookings(self, status: str = None, skip: int = 0, limit: int = None) -> List[dict]:
+        return self.archive.scan(BOOKINGS, status, skip, limit)
+    
+    def get_archived_auctions(self, status: str = None, skip: int = 0, limit: int = None) -> List[dict]:
+        return self.archive.scan(AUCTIONS, status, skip, limit)
+    
+    def get_archive_stats(self) -> Dict[str, Dict[str, int]]:
+        stats = self.archive.stats()
+        stats["hot"] = {
+            "bookings": len(self.bookings),
+            "auctions": len(self.auctions),
+            "bids": len(self.bids),
+            "rides": len(self.rides),
+            "ratings": len(self.ratings),
+        }
+        return stats
+
+
+def _booking_matches(booking: Booking, status: str, start: datetime, end: datetime) -> bool:
+    if status and booking.status != status:
+        return False
+    if start and booking.start_time < start:
+        return False
+    if end and booking.start_time >= end:
+        return False
+    return True
+
+
+def _create_store():
+    """The process-local store, or a client of the shared store server when STORE_SOCKET is set"""
+    if settings.STORE_SOCKET:
+        from app.core.store_client import StoreClient
+        return StoreClient(settings.STORE_SOCKET)
+    return InMemoryStore()
 
 
 # Global store instance
-store = InMemoryStore()
+store = _create_store()
+idempotency_store = IdempotencyStore(store)
@@ -0,0 +1,257 @@
+"""
+Transactional Outbox
+Domain events recorded alongside the state change that caused them, and a
+batching dispatcher that delivers them to subscribers at least once
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+
+# ============ Event Types ============
+
+BOOKING_REQUESTED = "booking.requested"
+BOOKING_STATUS_CHANGED = "booking.status_changed"
+AUCTION_OPENED = "auction.opened"
+AUCTION_CLOSED = "auction.closed"
+BID_PLACED = "bid.placed"
+RIDE_STARTED = "ride.started"
+RIDE_STATUS_CHANGED = "ride.status_changed"
+
+# (event type, aggregate id, JSON-ready payload)
+EventSpec = Tuple[str, UUID, dict]
+
+
+@dataclass
+class Event:
+    id: int
+    type: str
+    aggregate_id: UUID
+    payload: dict
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    attempts: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "aggregate_id": str(self.aggregate_id),
+            "payload": self.payload,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _str(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+# Payload builders take plain values so the in-memory store and the
+# database engines emit identical events. Money is integer paise.
+
+def booking_event(
+    booking_id: UUID,
+    car_id: UUID,
+    user_id: UUID,
+    previous: Optional[str],
+    status: str,
+    offer_price: int,
+    start_time: datetime,
+    end_time: datetime
+) -> EventSpec:
+    return (BOOKING_REQUESTED if previous is None else BOOKING_STATUS_CHANGED), booking_id, {
+        "booking_id": str(booking_id),
+        "car_id": str(car_id),
+        "user_id": str(user_id),
+        "previous_status": previous,
+        "status": status,
+        "offer_price": offer_price,
+        "start_time": _iso(start_time),
+        "end_time": _iso(end_time),
+    }
+
+
+def auction_opened_event(auction_id: UUID, car_id: UUID, start_time: datetime, end_time: datetime) -> EventSpec:
+    return AUCTION_OPENED, auction_id, {
+        "auction_id": str(auction_id),
+        "car_id": str(car_id),
+        "start_time": _iso(start_time),
+        "end_time": _iso(end_time),
+    }
+
+
+def auction_closed_event(auction_id: UUID, car_id: UUID, winner_id: Optional[UUID]) -> EventSpec:
+    return AUCTION_CLOSED, auction_id, {
+        "auction_id": str(auction_id),
+        "car_id": str(car_id),
+        "winner_id": _str(winner_id),
+    }
+
+
+def bid_event(bid_id: UUID, auction_id: UUID, user_id: UUID, booking_id: UUID, offer_price: int) -> EventSpec:
+    return BID_PLACED, auction_id, {
+        "bid_id": str(bid_id),
+        "auction_id": str(auction_id),
+        "user_id": str(user_id),
+        "booking_id": str(booking_id),
+        "offer_price": offer_price,
+    }
+
+
+def ride_event(ride_id: UUID, booking_id: UUID, previous: Optional[str], status: str) -> EventSpec:
+    return (RIDE_STARTED if previous is None else RIDE_STATUS_CHANGED), ride_id, {
+        "ride_id": str(ride_id),
+        "booking_id": str(booking_id),
+        "previous_status": previous,
+        "status": status,
+    }
+
+
+# ============ In-Memory Outbox ============
+
+class MemoryOutbox:
+    """
+    Pending events in id order. Store methods append in the same call that
+    mutates the record, which is the in-memory store's unit of atomicity.
+    Delivered events are dropped once acknowledged.
+
+    Ids are consecutive, so events never claimed are exactly those from
+    `_cursor` up; claim starts there instead of walking past every leased
+    event. Leases share one length and are kept in the order they were
+    granted, so expired ones are at the front of `_leases`.
+    """
+
+    def __init__(self):
+        self._next_id = 1
+        self._cursor = 1
+        self._pending: Dict[int, Event] = {}
+        self._leases: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def append(self, event_type: str, aggregate_id: UUID, payload: dict) -> Event:
+        with self._lock:
+            event = Event(self._next_id, event_type, aggregate_id, payload)
+            self._next_id += 1
+            self._pending[event.id] = event
+        return event
+
+    def claim(self, limit: int, lease_seconds: float) -> List[Event]:
+        """
+        Events whose lease expired, then the oldest never claimed, leased so
+        no other dispatcher takes them meanwhile
+        """
+        now = time.monotonic()
+        claimed = []
+        with self._lock:
+            while self._leases and len(claimed) < limit:
+                event_id, expires_at = next(iter(self._leases.items()))
+                if expires_at > now:
+                    break
+                del self._leases[event_id]
+                claimed.append(self._pending[event_id])
+            while self._cursor < self._next_id and len(claimed) < limit:
+                claimed.append(self._pending[self._cursor])
+                self._cursor += 1
+            for event in claimed:
+                self._leases[event.id] = now + lease_seconds
+                event.attempts += 1
+        return claimed
+
+    def ack(self, event_ids: Iterable[int]) -> None:
+        with self._lock:
+            for event_id in event_ids:
+                if self._leases.pop(event_id, None) is not None:
+                    del self._pending[event_id]
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+# ============ Delivery ============
+
+Handler = Callable[[List[Event]], None]
+
+
+class FileSink:
+    """Appends each batch to a local NDJSON file and fsyncs before the batch is acknowledged"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, events: List[Event]) -> None:
+        lines = "".join(json.dumps(event.as_dict(), separators=(",", ":")) + "\n" for event in events)
+        with self._lock, open(self.path, "a", encoding="utf-8") as sink:
+            sink.write(lines)
+            sink.flush()
+            os.fsync(sink.fileno())
+
+
+class OutboxDispatcher:
+    """
+    Claims batches from an outbox source and hands each batch to every
+    subscriber, acknowledging it only after all of them return. A batch
+    whose delivery fails stays leased until the lease expires and is then
+    delivered again, so subscribers see every event at least once and
+    should dedupe by event id.
+
+    `source` provides claim_events(limit, lease_seconds) and
+    ack_events(event_ids): the in-memory store (or its client) and the
+    database OutboxEngine both do.
+    """
+
+    def __init__(self, source, batch_size: int, poll_seconds: float, lease_seconds: float):
+        self.source = source
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self._subscribers: List[Tuple[Handler, Optional[frozenset]]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, handler: Handler, event_types: Optional[Iterable[str]] = None) -> None:
+        """Deliver batches to `handler`, optionally only events of the given types"""
+        self._subscribers.append((handler, frozenset(event_types) if event_types else None))
+
+    def dispatch_once(self) -> int:
+        """Deliver one batch; returns how many events were claimed"""
+        events = self.source.claim_events(self.batch_size, self.lease_seconds)
+        if not events:
+            return 0
+        for handler, event_types in self._subscribers:
+            batch = events if event_types is None else [e for e in events if e.type in event_types]
+            if batch:
+                handler(batch)
+        self.source.ack_events([event.id for event in events])
+        return len(events)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = self.dispatch_once()
+            except Exception as e:
+                print(f"⚠️  Outbox dispatch failed, retrying after the lease expires: {e}")
+                claimed = 0
+            if claimed < self.batch_size:
+                self._stop.wait(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,68 @@
+"""
+Serialized Payload Cache
+JSON fragments for records that rarely change (cars, users), keyed by
+record id and version, so list endpoints join cached bytes instead of
+rebuilding and re-encoding each entry
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Tuple
+from fastapi import Response
+from app.core.config import settings
+
+
+def encode_json(content) -> bytes:
+    """Same encoding as FastAPI's JSONResponse"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(fragment: bytes, status_code: int = 200) -> Response:
+    return Response(content=fragment, status_code=status_code, media_type="application/json")
+
+
+def json_list_response(fragments: Iterable[bytes]) -> Response:
+    return json_response(b"[" + b",".join(fragments) + b"]")
+
+
+class PayloadCache:
+    """
+    LRU of (view, record id) -> (version, bytes). A view is one serializer,
+    such as "car" or "user". An entry whose version no longer matches the
+    record is rebuilt, so any update that bumps the version (store
+    update_user/update_car, a row's updated_at) invalidates it in every
+    worker without coordination. Deletes call invalidate to free the entry.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Hashable, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fragment(self, view: str, key: Hashable, version: Hashable, build: Callable[[], bytes]) -> bytes:
+        slot = (view, key)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        data = build()
+        with self._lock:
+            self._entries[slot] = (version, data)
+            self._entries.move_to_end(slot)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            for slot in [slot for slot in self._entries if slot[1] == key]:
+                del self._entries[slot]
+
+
+payload_cache = PayloadCache(settings.PAYLOAD_CACHE_MAX_ENTRIES)
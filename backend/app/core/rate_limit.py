@@ -0,0 +1,199 @@
+"""
+Rate Limiting and Admission Control
+Per-IP and per-user token buckets with per-route limits, plus load
+shedding once too many requests are already in flight
+"""
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.security import decode_access_token
+
+
+UNITS = {"second": 1.0, "minute": 60.0, "hour": 3600.0}
+
+# Buckets remembered per process; the least recently used are dropped first.
+# A dropped bucket comes back full, which is what an idle client would have anyway.
+MAX_BUCKETS = 100_000
+
+# Never rate limited or shed
+EXEMPT_PATHS = frozenset({"/api/health"})
+
+
+def parse_rate(spec: str) -> Tuple[float, float]:
+    """
+    "10/minute" -> (capacity 10, refill 10/60 tokens per second). A client
+    may burst the whole allowance at once, then gets one request per
+    interval / count.
+    """
+    count, _, unit = spec.partition("/")
+    if unit not in UNITS:
+        raise ValueError(f"Rate {spec!r} must look like '<count>/<second|minute|hour>'")
+    capacity = float(count)
+    if capacity <= 0:
+        raise ValueError(f"Rate {spec!r} must allow at least one request")
+    return capacity, capacity / UNITS[unit]
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, capacity: float, refill: float, now: float) -> float:
+        """Spend a token; returns 0 when allowed, else seconds until one is available"""
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * refill)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / refill
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by (scope, route, client). Every route gets the
+    default per-IP bucket; routes listed in `ip_routes` / `user_routes` get
+    an extra bucket per IP or per authenticated user. Requests without a
+    valid token fall back to their IP for per-user limits.
+
+    Runs on the event loop thread only, so needs no locking.
+    """
+
+    def __init__(
+        self,
+        default: Optional[str],
+        ip_routes: Dict[str, str],
+        user_routes: Dict[str, str],
+        max_buckets: int = MAX_BUCKETS
+    ):
+        self.default = parse_rate(default) if default else None
+        self.ip_routes = {route: parse_rate(spec) for route, spec in ip_routes.items()}
+        self.user_routes = {route: parse_rate(spec) for route, spec in user_routes.items()}
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[tuple, TokenBucket]" = OrderedDict()
+
+    def _take(self, key: tuple, rate: Tuple[float, float], now: float) -> float:
+        capacity, refill = rate
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(capacity, now)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(capacity, refill, now)
+
+    def check(self, route: str, ip: str, authorization: Optional[str]) -> float:
+        """0 when the request may proceed, else seconds the client should wait"""
+        now = time.monotonic()
+        wait = 0.0
+        if self.default:
+            wait = max(wait, self._take(("ip", "*", ip), self.default, now))
+        rate = self.ip_routes.get(route)
+        if rate:
+            wait = max(wait, self._take(("ip", route, ip), rate, now))
+        rate = self.user_routes.get(route)
+        if rate:
+            user_id = _token_subject(authorization)
+            client = ("user", route, user_id) if user_id else ("ip", route + " (anonymous)", ip)
+            wait = max(wait, self._take(client, rate, now))
+        return wait
+
+
+def _token_subject(authorization: Optional[str]) -> Optional[str]:
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    payload = decode_access_token(authorization[7:])
+    return payload.get("sub") if payload else None
+
+
+class AdmissionControl:
+    """
+    Counts requests in flight and sheds new ones once `max_in_flight` are
+    already queued or running, so admitted requests keep a bounded wait
+    instead of everyone timing out together.
+    """
+
+    def __init__(self, max_in_flight: int, retry_after: float):
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.shed = 0
+
+    def admit(self) -> bool:
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            self.shed += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware answering 429 when a bucket is empty and 503 while
+    shedding load, both with Retry-After. Limits are per process; with
+    several workers each enforces its own share. The client IP is the ASGI
+    peer, so run uvicorn with --proxy-headers behind a trusted proxy.
+    """
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None, admission: Optional[AdmissionControl] = None):
+        self.app = app
+        self.limiter = limiter if limiter is not None else RateLimiter(
+            settings.RATE_LIMIT_DEFAULT,
+            settings.RATE_LIMIT_IP_ROUTES,
+            settings.RATE_LIMIT_USER_ROUTES
+        )
+        self.admission = admission if admission is not None else AdmissionControl(
+            settings.LOAD_SHED_MAX_IN_FLIGHT,
+            settings.LOAD_SHED_RETRY_AFTER_SECONDS
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        if not self.admission.admit():
+            await _reject(send, 503, "Server is busy, retry shortly", self.admission.retry_after)
+            return
+
+        try:
+            client = scope.get("client")
+            authorization = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    authorization = value.decode("latin-1")
+                    break
+            wait = self.limiter.check(
+                f"{scope['method']} {scope['path']}",
+                client[0] if client else "",
+                authorization
+            )
+            if wait:
+                await _reject(send, 429, "Too many requests", wait)
+                return
+            await self.app(scope, receive, send)
+        finally:
+            self.admission.release()
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,238 @@
+"""
+Reporting Aggregates
+Daily per-car counters maintained on booking/auction/ride transitions, with
+Fenwick-tree range sums so report windows of any length cost O(log days)
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from app.core.fixed_point import paise_to_float
+from app.core.store_indexes import to_naive_utc
+
+
+REPORT_EPOCH = date(2024, 1, 1)
+
+# Day indexes past this are clamped; ~179 years from REPORT_EPOCH
+DAY_CAPACITY = 1 << 16
+
+# Default window and the longest window a per-day series may span
+DEFAULT_REPORT_DAYS = 30
+MAX_DAILY_REPORT_DAYS = 731
+
+# Bookings that hold the car and earn revenue
+REVENUE_STATUSES = ("confirmed", "completed")
+
+METRICS = (
+    "requests",
+    "conflicts",
+    "auctions",
+    "confirmed",
+    "booked_minutes",
+    "revenue",
+    "rides_completed",
+)
+REQUESTS, CONFLICTS, AUCTIONS, CONFIRMED, BOOKED_MINUTES, REVENUE, RIDES_COMPLETED = range(len(METRICS))
+
+# (day index, metric index, amount); revenue amounts are paise
+Delta = Tuple[int, int, int]
+
+
+def day_index(value) -> int:
+    if isinstance(value, datetime):
+        value = to_naive_utc(value).date()
+    return min(max((value - REPORT_EPOCH).days, 0), DAY_CAPACITY - 1)
+
+
+def day_date(index: int) -> date:
+    return REPORT_EPOCH + timedelta(days=index)
+
+
+def _minutes_by_day(start: datetime, end: datetime) -> Iterable[Tuple[int, int]]:
+    start, end = to_naive_utc(start), to_naive_utc(end)
+    cursor = start
+    while cursor < end:
+        midnight = datetime.combine(cursor.date() + timedelta(days=1), datetime.min.time())
+        boundary = min(midnight, end)
+        minutes = int((boundary - cursor).total_seconds()) // 60
+        if minutes:
+            yield day_index(cursor), minutes
+        cursor = boundary
+
+
+def report_window(
+    start: Optional[date],
+    end: Optional[date],
+    max_days: Optional[int] = None
+) -> Tuple[date, date]:
+    """Inclusive [start, end] dates, defaulting to the last DEFAULT_REPORT_DAYS days"""
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    if start > end:
+        raise ValueError("start must not be after end")
+    if start < REPORT_EPOCH:
+        raise ValueError(f"Reports start at {REPORT_EPOCH.isoformat()}")
+    if max_days is not None and (end - start).days + 1 > max_days:
+        raise ValueError(f"Window cannot exceed {max_days} days")
+    return start, end
+
+
+def fleet_cutoff(end: date) -> datetime:
+    """
+    Cars created before this existed during a window ending on `end`; the
+    fleet size for utilization counts those (deleted cars are not counted)
+    """
+    return datetime.combine(end + timedelta(days=1), datetime.min.time())
+
+
+# ============ Transition deltas ============
+
+def booking_deltas(
+    start_time: datetime,
+    end_time: datetime,
+    offer_price: int,
+    previous: Optional[str],
+    status: str
+) -> List[Delta]:
+    """
+    Counter changes for a booking moving from `previous` (None when created)
+    to `status`. Requests, conflicts and revenue land on the rental's start
+    day; booked minutes are split across the days they cover.
+    """
+    start_day = day_index(start_time)
+    deltas: List[Delta] = []
+
+    if previous is None:
+        deltas.append((start_day, REQUESTS, 1))
+    if status == "competing" and previous != "competing":
+        deltas.append((start_day, CONFLICTS, 1))
+
+    was_held = previous in REVENUE_STATUSES
+    is_held = status in REVENUE_STATUSES
+    if was_held != is_held:
+        sign = 1 if is_held else -1
+        deltas.append((start_day, CONFIRMED, sign))
+        deltas.append((start_day, REVENUE, sign * offer_price))
+        deltas.extend(
+            (day, BOOKED_MINUTES, sign * minutes)
+            for day, minutes in _minutes_by_day(start_time, end_time)
+        )
+    return deltas
+
+
+def auction_deltas(start_time: datetime) -> List[Delta]:
+    return [(day_index(start_time), AUCTIONS, 1)]
+
+
+def ride_deltas(ended_at: datetime) -> List[Delta]:
+    return [(day_index(ended_at), RIDES_COMPLETED, 1)]
+
+
+def summarize(totals: List[int], days: int, cars: int = 1) -> dict:
+    """Response fields for summed counters over `days` days of `cars` cars"""
+    requests = totals[REQUESTS]
+    capacity_minutes = days * 24 * 60 * cars
+    return {
+        "requests": requests,
+        "conflicts": totals[CONFLICTS],
+        "conflict_rate": round(totals[CONFLICTS] / requests, 4) if requests else 0.0,
+        "auctions": totals[AUCTIONS],
+        "confirmed_bookings": totals[CONFIRMED],
+        "booked_hours": round(totals[BOOKED_MINUTES] / 60, 2),
+        "utilization": round(totals[BOOKED_MINUTES] / capacity_minutes, 4) if capacity_minutes else 0.0,
+        "revenue": paise_to_float(totals[REVENUE]),
+        "rides_completed": totals[RIDES_COMPLETED],
+    }
+
+
+# ============ In-memory aggregates ============
+
+class _DayTree:
+    """Sparse Fenwick tree of metric vectors over day indexes"""
+    __slots__ = ("nodes",)
+
+    def __init__(self):
+        self.nodes: Dict[int, List[int]] = {}
+
+    def add(self, day: int, metric: int, amount: int) -> None:
+        index = day + 1
+        while index <= DAY_CAPACITY:
+            node = self.nodes.get(index)
+            if node is None:
+                node = self.nodes[index] = [0] * len(METRICS)
+            node[metric] += amount
+            index += index & -index
+
+    def prefix(self, day: int) -> List[int]:
+        """Sums over days [0, day]"""
+        totals = [0] * len(METRICS)
+        index = day + 1
+        while index > 0:
+            node = self.nodes.get(index)
+            if node is not None:
+                for metric, value in enumerate(node):
+                    totals[metric] += value
+            index -= index & -index
+        return totals
+
+    def range(self, first_day: int, last_day: int) -> List[int]:
+        upper = self.prefix(last_day)
+        if first_day <= 0:
+            return upper
+        lower = self.prefix(first_day - 1)
+        return [a - b for a, b in zip(upper, lower)]
+
+
+class ReportAggregates:
+    """
+    Daily counters per car and for the whole fleet. Every delta updates the
+    day's vector and two Fenwick trees, so writes are O(log days) and any
+    window total is two prefix sums per car.
+    """
+
+    def __init__(self):
+        self._days: Dict[UUID, Dict[int, List[int]]] = {}
+        self._trees: Dict[UUID, _DayTree] = {}
+        self._fleet_days: Dict[int, List[int]] = {}
+        self._fleet_tree = _DayTree()
+
+    def apply(self, car_id: UUID, deltas: Iterable[Delta]) -> None:
+        days = self._days.setdefault(car_id, {})
+        tree = self._trees.get(car_id)
+        if tree is None:
+            tree = self._trees[car_id] = _DayTree()
+
+        for day, metric, amount in deltas:
+            if not amount:
+                continue
+            for bucket in (days, self._fleet_days):
+                vector = bucket.get(day)
+                if vector is None:
+                    vector = bucket[day] = [0] * len(METRICS)
+                vector[metric] += amount
+            tree.add(day, metric, amount)
+            self._fleet_tree.add(day, metric, amount)
+
+    def drop_car(self, car_id: UUID) -> None:
+        """Forget a deleted car's per-car rows; fleet history is kept"""
+        self._days.pop(car_id, None)
+        self._trees.pop(car_id, None)
+
+    def car_totals(self, car_id: UUID, first_day: int, last_day: int) -> List[int]:
+        tree = self._trees.get(car_id)
+        return tree.range(first_day, last_day) if tree else [0] * len(METRICS)
+
+    def fleet_totals(self, first_day: int, last_day: int) -> List[int]:
+        return self._fleet_tree.range(first_day, last_day)
+
+    def daily(self, first_day: int, last_day: int, car_id: Optional[UUID] = None) -> List[Tuple[int, List[int]]]:
+        """Non-empty days in [first_day, last_day] for one car or the fleet, as copies"""
+        days = self._fleet_days if car_id is None else self._days.get(car_id, {})
+        if len(days) < last_day - first_day + 1:
+            return sorted(
+                (day, list(vector)) for day, vector in days.items()
+                if first_day <= day <= last_day
+            )
+        return [
+            (day, list(days[day])) for day in range(first_day, last_day + 1)
+            if day in days
+        ]
@@ -0,0 +1,62 @@
+"""
+Scoring Formulas
+Trust and auction scoring on fixed-point integers (see app.core.fixed_point),
+shared by the database engines and the in-memory routes.
+"""
+from typing import List, Sequence
+from app.core.config import settings
+from app.core.fixed_point import div_half_up, to_centi
+
+# Trust policy settings in centipoints, converted once at import
+TRUST_THRESHOLD = to_centi(settings.TRUST_THRESHOLD)
+AUTO_REJECT_THRESHOLD = to_centi(settings.AUTO_REJECT_THRESHOLD)
+AUTO_BLOCK_THRESHOLD = to_centi(settings.AUTO_BLOCK_THRESHOLD)
+LATE_CANCEL_PENALTY = to_centi(settings.LATE_CANCEL_PENALTY)
+
+
+def trust_score(avg_rating: int, total_rides: int, damage_count: int, rash_count: int) -> int:
+    """
+    Trust score in centipoints from an average rating in centipoints:
+    trust_score = (avg_rating × 20) + (total_rides × 0.5)
+                  - (damage_count × 15) - (rash_count × 10)
+    """
+    score = (
+        avg_rating * 20 +
+        total_rides * 50 -
+        damage_count * 1500 -
+        rash_count * 1000
+    )
+    return max(score, 0)
+
+
+def running_average(avg_rating: int, count: int, new_rating: int) -> int:
+    """Average rating in centipoints after adding a whole-star rating as the count-th sample"""
+    return div_half_up(avg_rating * (count - 1) + new_rating * 100, count)
+
+
+def final_scores(
+    trust_snapshots: Sequence[int],
+    total_rides: Sequence[int],
+    offer_prices: Sequence[int]
+) -> List[int]:
+    """
+    Auction final scores in ten-thousandths:
+    final_score = 0.5 × normalized_trust_score
+                + 0.3 × normalized_rides
+                + 0.2 × normalized_offer_price
+    """
+    max_trust = max(trust_snapshots, default=0) or 1
+    max_rides = max(total_rides, default=0) or 1
+    max_price = max(offer_prices, default=0) or 1
+
+    # One rounding of the exact sum, over the common denominator
+    denominator = max_trust * max_rides * max_price
+    return [
+        div_half_up(
+            5000 * trust * max_rides * max_price +
+            3000 * rides * max_trust * max_price +
+            2000 * price * max_trust * max_rides,
+            denominator
+        )
+        for trust, rides, price in zip(trust_snapshots, total_rides, offer_prices)
+    ]
@@ -0,0 +1,94 @@
+"""
+Request Coalescing
+Concurrent identical reads (GET /auctions/{id}, GET /cars/{id}) share one
+in-flight build of the response instead of each rebuilding it. Optionally,
+while a rebuild is in flight, requests are answered with the previous
+result if it is younger than the stale window (stale-while-revalidate).
+Per worker; results are encoded JSON bytes, so sharing them is safe.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    do(key, build) runs build() once per key at a time; callers that arrive
+    while it runs wait for that result (or its exception). With
+    stale_seconds > 0 they get the last result instead, if it is that
+    recent, and only the caller that starts a build waits for it.
+
+    Writes call forget(key) after committing, so later reads neither join a
+    build that started before the write nor are answered from before it.
+    """
+
+    def __init__(self, stale_seconds: float = 0.0):
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._last: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()  # oldest first
+        self.builds = 0
+        self.shared = 0
+        self.stale = 0
+
+    def do(self, key: Hashable, build: Callable[[], object]):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.builds += 1
+                leader = True
+            else:
+                leader = False
+                last = self._last.get(key)
+                if last is not None and time.monotonic() - last[0] <= self.stale_seconds:
+                    self.stale += 1
+                    return last[1]
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = build()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                    if call.error is None and self.stale_seconds > 0:
+                        self._remember(key, call.result)
+            call.done.set()
+        return call.result
+
+    def _remember(self, key: Hashable, result) -> None:
+        now = time.monotonic()
+        self._last[key] = (now, result)
+        self._last.move_to_end(key)
+        while self._last and now - next(iter(self._last.values()))[0] > self.stale_seconds:
+            self._last.popitem(last=False)
+
+    def forget(self, key: Hashable) -> None:
+        """Detach any in-flight build and drop the last result; callers already waiting still get theirs"""
+        with self._lock:
+            self._calls.pop(key, None)
+            self._last.pop(key, None)
+
+
+read_coalescer = SingleFlight(settings.COALESCE_STALE_SECONDS)
@@ -0,0 +1,87 @@
+"""
+Store Client
+Stand-in for InMemoryStore that forwards every call to the store server,
+so the *_mock routes run unchanged across several worker processes
+"""
+import socket
+import threading
+from dataclasses import fields
+from datetime import datetime
+from functools import partial
+from typing import Iterator
+from app.core.mock_store import InMemoryStore, RECORD_TYPES, BOOKING_PAGE_SIZE, Booking
+from app.core.store_protocol import Codec, RemoteError, recv_frame, send_frame
+from app.core.store_server import store_methods
+
+
+_RECORD_FIELDS = {cls: tuple(f.name for f in fields(cls)) for cls in RECORD_TYPES}
+
+
+class StoreClient:
+    """
+    Calls are sent over one Unix socket connection per thread. Records come
+    back as copies: when a method is given a record and returns the same
+    record, the caller's copy is refreshed from the result so code that
+    keeps using it (booking.status after update_booking_status) sees the
+    stored values.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.codec = Codec(RECORD_TYPES)
+        self.methods = store_methods(InMemoryStore)
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def _call(self, method: str, *args, **kwargs):
+        sock = self._connection()
+        try:
+            send_frame(sock, self.codec.encode((method, args, kwargs)))
+            ok, result = self.codec.decode(recv_frame(sock))
+        except Exception:
+            # The connection is in an unknown state; the next call opens a new one
+            self._local.sock = None
+            sock.close()
+            raise
+
+        if not ok:
+            raise RemoteError(*result)
+        for arg in args:
+            _refresh(arg, result)
+        return result
+
+    def __getattr__(self, name: str):
+        if name not in self.__dict__.get("methods", ()):
+            raise AttributeError(f"Store client has no attribute {name!r}")
+        method = partial(self._call, name)
+        setattr(self, name, method)
+        return method
+
+    def iter_bookings(
+        self,
+        status: str = None,
+        start: datetime = None,
+        end: datetime = None
+    ) -> Iterator[Booking]:
+        """Same snapshot semantics as InMemoryStore.iter_bookings, fetched a page per call"""
+        position = 0
+        until = self._call("get_booking_count")
+        while position < until:
+            page, position = self._call(
+                "get_bookings_page", position, until, BOOKING_PAGE_SIZE, status, start, end
+            )
+            yield from page
+
+
+def _refresh(target, result) -> None:
+    """Copy a returned record's fields onto the caller's copy of the same record"""
+    if type(target) is type(result) and type(target) in _RECORD_FIELDS and target.id == result.id:
+        for name in _RECORD_FIELDS[type(target)]:
+            setattr(target, name, getattr(result, name))
@@ -0,0 +1,441 @@
+"""
+In-Memory Store Indexes
+Secondary indexes kept in step with the InMemoryStore so hot queries avoid full scans
+"""
+import heapq
+import math
+import re
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+
+# Booking statuses that take a car off the market for their time slot
+OCCUPYING_STATUSES = ("confirmed", "competing")
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Normalize aware datetimes to naive UTC so they compare with utcnow()"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# ============ Occupancy Index ============
+
+class CarOccupancy:
+    """
+    Occupied intervals of a single car, sorted by start time.
+
+    max_ends[i] holds the latest end time among the first i + 1 intervals, so
+    "does anything overlap [start, end)" is one bisect plus one lookup.
+    """
+    __slots__ = ("starts", "ends", "booking_ids", "max_ends")
+
+    def __init__(self):
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+        self.booking_ids: List[UUID] = []
+        self.max_ends: List[datetime] = []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def add(self, booking_id: UUID, start: datetime, end: datetime) -> None:
+        i = bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.booking_ids.insert(i, booking_id)
+        self.max_ends.insert(i, end)
+        self._refresh_max_ends(i)
+
+    def remove(self, booking_id: UUID, start: datetime) -> None:
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.booking_ids[i] != booking_id:
+            i += 1
+        if i == len(self.starts):
+            return
+        del self.starts[i]
+        del self.ends[i]
+        del self.booking_ids[i]
+        del self.max_ends[i]
+        self._refresh_max_ends(i)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        # Intervals [0, i) start before `end`; one of them overlaps iff it ends after `start`
+        i = bisect_left(self.starts, end)
+        return i > 0 and self.max_ends[i - 1] > start
+
+    def overlapping(self, start: datetime, end: datetime) -> List[UUID]:
+        i = bisect_left(self.starts, end)
+        return [self.booking_ids[j] for j in range(i) if self.ends[j] > start]
+
+    def _refresh_max_ends(self, i: int) -> None:
+        running = self.max_ends[i - 1] if i > 0 else None
+        for j in range(i, len(self.ends)):
+            if running is None or self.ends[j] > running:
+                running = self.ends[j]
+            self.max_ends[j] = running
+
+
+class OccupancyIndex:
+    """Per-car occupancy built from confirmed and competing bookings"""
+
+    def __init__(self):
+        self._cars: Dict[UUID, CarOccupancy] = {}
+        self._entries: Dict[UUID, Tuple[UUID, datetime]] = {}
+
+    def add(self, booking_id: UUID, car_id: UUID, start: datetime, end: datetime) -> None:
+        if booking_id in self._entries:
+            return
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        self._cars.setdefault(car_id, CarOccupancy()).add(booking_id, start, end)
+        self._entries[booking_id] = (car_id, start)
+
+    def remove(self, booking_id: UUID) -> None:
+        entry = self._entries.pop(booking_id, None)
+        if entry is None:
+            return
+        car_id, start = entry
+        occupancy = self._cars[car_id]
+        occupancy.remove(booking_id, start)
+        if not occupancy:
+            del self._cars[car_id]
+
+    def drop_car(self, car_id: UUID) -> None:
+        occupancy = self._cars.pop(car_id, None)
+        if occupancy:
+            for booking_id in occupancy.booking_ids:
+                self._entries.pop(booking_id, None)
+
+    def busy_car_ids(self, start: datetime, end: datetime) -> Set[UUID]:
+        """Cars with at least one occupying booking overlapping [start, end), in one pass"""
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        return {car_id for car_id, occupancy in self._cars.items() if occupancy.overlaps(start, end)}
+
+    def overlapping(self, car_id: UUID, start: datetime, end: datetime) -> List[UUID]:
+        """Ids of occupying bookings of one car that overlap [start, end)"""
+        occupancy = self._cars.get(car_id)
+        if occupancy is None:
+            return []
+        return occupancy.overlapping(to_naive_utc(start), to_naive_utc(end))
+
+
+# ============ Catalog Index ============
+
+class CarCatalogIndex:
+    """
+    Active cars kept in catalog (creation) order and in price order, plus
+    buckets on transmission, fuel type and seats.
+
+    Each listing walks the ordering it was asked for and stops once a page
+    is filled, so prices are compared as stored and nothing is re-sorted
+    per request. A filtered listing in catalog order instead starts from the
+    bisected price range or the smallest bucket, whichever holds fewer cars,
+    and only orders those.
+    """
+    BUCKETED = ("transmission", "fuel_type", "seats")
+
+    def __init__(self):
+        self._next_seq = 0
+        self._seq: Dict[UUID, int] = {}
+        self._price: Dict[UUID, int] = {}
+        # Catalog order: (seq, id) pairs, ascending
+        self._catalog: List[Tuple[int, UUID]] = []
+        # Price order: parallel arrays sorted by (price, seq)
+        self._price_keys: List[Tuple[int, int]] = []
+        self._price_ids: List[UUID] = []
+        self._buckets: Dict[str, Dict[object, Set[UUID]]] = {name: {} for name in self.BUCKETED}
+
+    def __contains__(self, car_id: UUID) -> bool:
+        return car_id in self._price
+
+    def add(self, car) -> None:
+        if car.id in self._price:
+            self.remove(car.id)
+        seq = self._seq.get(car.id)
+        if seq is None:
+            seq = self._seq[car.id] = self._next_seq
+            self._next_seq += 1
+
+        key = (car.daily_price, seq)
+        i = bisect_left(self._price_keys, key)
+        self._price_keys.insert(i, key)
+        self._price_ids.insert(i, car.id)
+        self._price[car.id] = car.daily_price
+
+        j = bisect_left(self._catalog, (seq,))
+        self._catalog.insert(j, (seq, car.id))
+
+        for name in self.BUCKETED:
+            self._buckets[name].setdefault(getattr(car, name), set()).add(car.id)
+
+    def remove(self, car_id: UUID) -> None:
+        price = self._price.pop(car_id, None)
+        if price is None:
+            return
+        seq = self._seq[car_id]
+
+        i = bisect_left(self._price_keys, (price, seq))
+        del self._price_keys[i]
+        del self._price_ids[i]
+
+        j = bisect_left(self._catalog, (seq,))
+        del self._catalog[j]
+
+        for buckets in self._buckets.values():
+            for key, members in list(buckets.items()):
+                if car_id in members:
+                    members.discard(car_id)
+                    if not members:
+                        del buckets[key]
+
+    def forget(self, car_id: UUID) -> None:
+        """Remove a deleted car, including its catalog position"""
+        self.remove(car_id)
+        self._seq.pop(car_id, None)
+
+    def search(
+        self,
+        transmission: Optional[str] = None,
+        fuel_type: Optional[str] = None,
+        seats: Optional[int] = None,
+        min_price=None,
+        max_price=None,
+        sort: Optional[str] = None,
+        exclude: Optional[Set[UUID]] = None,
+        ranked: Optional[List[UUID]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[UUID]:
+        """
+        Ids of matching cars in the requested order, sliced to [skip, skip + limit).
+
+        `ranked` restricts results to text-search hits; without a price sort they
+        come back in rank order.
+        """
+        required = []
+        for name, value in (("transmission", transmission), ("fuel_type", fuel_type), ("seats", seats)):
+            if value is not None:
+                members = self._buckets[name].get(value)
+                if not members:
+                    return []
+                required.append(members)
+        # Probe the smallest buckets first
+        required.sort(key=len)
+
+        lo = 0 if min_price is None else bisect_left(self._price_keys, (min_price, -1))
+        hi = len(self._price_keys) if max_price is None else bisect_right(self._price_keys, (max_price, self._next_seq))
+        narrowed = lo > 0 or hi < len(self._price_keys)
+
+        if sort in ("price_asc", "price_desc"):
+            positions = range(lo, hi) if sort == "price_asc" else range(hi - 1, lo - 1, -1)
+            candidates = (self._price_ids[i] for i in positions)
+            if ranked is not None:
+                hits = set(ranked)
+                candidates = (car_id for car_id in candidates if car_id in hits)
+            price_checked = True
+        elif ranked is not None:
+            candidates = (car_id for car_id in ranked if car_id in self._price)
+            price_checked = False
+        elif required or narrowed:
+            # Catalog order over a filtered subset: start from the smaller of the
+            # price range and the smallest bucket, and sort just those by seq
+            if required and (not narrowed or len(required[0]) < hi - lo):
+                pool = required.pop(0)
+                price_checked = not narrowed
+            else:
+                pool = self._price_ids[lo:hi]
+                price_checked = True
+            candidates = iter(sorted(pool, key=self._seq.__getitem__))
+        else:
+            candidates = (car_id for _, car_id in self._catalog)
+            price_checked = False
+
+        matched = []
+        wanted = None if limit is None else skip + limit
+        for car_id in candidates:
+            if exclude and car_id in exclude:
+                continue
+            if not price_checked:
+                price = self._price[car_id]
+                if (min_price is not None and price < min_price) or (max_price is not None and price > max_price):
+                    continue
+            if any(car_id not in members for members in required):
+                continue
+            matched.append(car_id)
+            if wanted is not None and len(matched) >= wanted:
+                break
+        return matched[skip:]
+
+
+# ============ Text Index ============
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Matches in the model name count for more than matches in the description
+MODEL_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+# A query term that only matches as a prefix ("inno" -> "innova") scores less
+PREFIX_FACTOR = 0.5
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class CarTextIndex:
+    """
+    Inverted index over car model and description.
+
+    Postings map term -> {car_id: weight}. A sorted vocabulary lets each query
+    term also match as a prefix. Every query term must match, and results are
+    ranked by the sum of weight x idf.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[UUID, float]] = {}
+        self._doc_terms: Dict[UUID, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+
+    def add(self, car) -> None:
+        """Index a car, replacing whatever was indexed for it before"""
+        self.remove(car.id)
+        weights: Dict[str, float] = {}
+        for term in tokenize(car.model):
+            weights[term] = weights.get(term, 0.0) + MODEL_WEIGHT
+        for term in tokenize(car.description):
+            weights[term] = weights.get(term, 0.0) + DESCRIPTION_WEIGHT
+
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[car.id] = weight
+        self._doc_terms[car.id] = weights
+
+    def remove(self, car_id: UUID) -> None:
+        weights = self._doc_terms.pop(car_id, None)
+        if not weights:
+            return
+        for term in weights:
+            postings = self._postings[term]
+            del postings[car_id]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+
+    def _expand(self, term: str) -> List[str]:
+        i = bisect_left(self._vocabulary, term)
+        matches = []
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+            matches.append(self._vocabulary[i])
+            i += 1
+        return matches
+
+    def search(self, query: str) -> List[UUID]:
+        """Ids of cars matching every query term, best match first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        total = len(self._doc_terms)
+        scores: Optional[Dict[UUID, float]] = None
+        for term in terms:
+            term_scores: Dict[UUID, float] = {}
+            for match in self._expand(term):
+                postings = self._postings[match]
+                idf = math.log(1 + total / len(postings))
+                factor = 1.0 if match == term else PREFIX_FACTOR
+                for car_id, weight in postings.items():
+                    score = weight * idf * factor
+                    if score > term_scores.get(car_id, 0.0):
+                        term_scores[car_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    car_id: score + term_scores[car_id]
+                    for car_id, score in scores.items()
+                    if car_id in term_scores
+                }
+            if not scores:
+                return []
+
+        return sorted(scores, key=scores.__getitem__, reverse=True)
+
+
+# ============ Trust Leaderboard ============
+
+class TrustLeaderboard:
+    """
+    Users ordered by trust score, highest first, partitioned by (role, is_blocked).
+
+    Each partition is a sorted array of (-trust_score, seq) keys with a parallel
+    id array: rank lookups are a bisect and top-K is a slice. Ties keep
+    registration order.
+    """
+
+    def __init__(self):
+        self._next_seq = 0
+        self._seq: Dict[UUID, int] = {}
+        self._entries: Dict[UUID, Tuple[Tuple[str, bool], Tuple[int, int]]] = {}
+        self._keys: Dict[Tuple[str, bool], List[Tuple[int, int]]] = {}
+        self._ids: Dict[Tuple[str, bool], List[UUID]] = {}
+
+    def add(self, user) -> None:
+        """Insert a user, or move them after their score, role or block flag changed"""
+        self.remove(user.id)
+        seq = self._seq.get(user.id)
+        if seq is None:
+            seq = self._seq[user.id] = self._next_seq
+            self._next_seq += 1
+
+        partition = (user.role, user.is_blocked)
+        key = (-user.trust_score, seq)
+        keys = self._keys.setdefault(partition, [])
+        ids = self._ids.setdefault(partition, [])
+        i = bisect_left(keys, key)
+        keys.insert(i, key)
+        ids.insert(i, user.id)
+        self._entries[user.id] = (partition, key)
+
+    def remove(self, user_id: UUID) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        partition, key = entry
+        i = bisect_left(self._keys[partition], key)
+        del self._keys[partition][i]
+        del self._ids[partition][i]
+
+    def top(
+        self,
+        role: Optional[str] = None,
+        blocked: Optional[bool] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[UUID]:
+        """Ids by descending trust; role/blocked of None means "any" """
+        partitions = [
+            p for p in self._keys
+            if (role is None or p[0] == role) and (blocked is None or p[1] == blocked)
+        ]
+        stop = None if limit is None else skip + limit
+        if len(partitions) == 1:
+            return self._ids[partitions[0]][skip:stop]
+        merged = heapq.merge(*(zip(self._keys[p], self._ids[p]) for p in partitions))
+        return [user_id for _, user_id in islice(merged, skip, stop)]
+
+    def rank(self, user_id: UUID) -> Optional[Tuple[int, int]]:
+        """(1-based rank, partition size) within the user's own partition"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        partition, (neg_score, _) = entry
+        keys = self._keys[partition]
+        # Competition ranking: one more than the number of strictly higher scores
+        return bisect_left(keys, (neg_score, -1)) + 1, len(keys)
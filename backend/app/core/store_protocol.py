@@ -0,0 +1,243 @@
+"""
+Store Server Protocol
+Compact tagged binary encoding for calls between uvicorn workers and the
+shared in-memory store server, framed with a 4-byte length prefix
+"""
+import struct
+from dataclasses import fields
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Sequence, Tuple
+from uuid import UUID
+
+
+# Largest frame either side will accept
+MAX_FRAME = 64 * 1024 * 1024
+
+FRAME_HEADER = struct.Struct(">I")
+_FLOAT = struct.Struct(">d")
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Value tags
+(
+    NONE, FALSE, TRUE, INT, FLOAT, STR, BYTES, UUID_, DATETIME, DATETIME_TZ,
+    DATE, LIST, TUPLE, DICT, RECORD, DECIMAL,
+) = range(16)
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class RemoteError(Exception):
+    """An exception raised inside the store server, re-raised in the caller"""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+class Codec:
+    """
+    Encoder/decoder for plain values plus the store's dataclass records.
+
+    Records travel as a type code and their field values in declaration
+    order, so both sides must share `record_types`.
+    """
+
+    def __init__(self, record_types: Sequence[type]):
+        self.record_types = tuple(record_types)
+        self._codes = {cls: code for code, cls in enumerate(self.record_types)}
+        self._fields = [tuple(f.name for f in fields(cls)) for cls in self.record_types]
+
+    # ============ Encoding ============
+
+    def encode(self, value: Any) -> bytes:
+        out = bytearray()
+        self._write(out, value)
+        return bytes(out)
+
+    @staticmethod
+    def _varint(out: bytearray, value: int) -> None:
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def _write(self, out: bytearray, value: Any) -> None:
+        if value is None:
+            out.append(NONE)
+        elif value is True:
+            out.append(TRUE)
+        elif value is False:
+            out.append(FALSE)
+        elif type(value) is int:
+            out.append(INT)
+            self._varint(out, _zigzag(value))
+        elif type(value) is float:
+            out.append(FLOAT)
+            out += _FLOAT.pack(value)
+        elif isinstance(value, str):
+            data = value.encode()
+            out.append(STR)
+            self._varint(out, len(data))
+            out += data
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            out.append(BYTES)
+            self._varint(out, len(value))
+            out += value
+        elif isinstance(value, UUID):
+            out.append(UUID_)
+            out += value.bytes
+        elif isinstance(value, datetime):
+            if value.tzinfo is None:
+                out.append(DATETIME)
+                self._varint(out, _zigzag((value - _EPOCH) // _MICROSECOND))
+            else:
+                out.append(DATETIME_TZ)
+                self._varint(out, _zigzag((value - _EPOCH_UTC) // _MICROSECOND))
+                self._varint(out, _zigzag(int(value.utcoffset().total_seconds())))
+        elif isinstance(value, Decimal):
+            data = str(value).encode()
+            out.append(DECIMAL)
+            self._varint(out, len(data))
+            out += data
+        elif isinstance(value, date):
+            out.append(DATE)
+            self._varint(out, value.toordinal())
+        elif isinstance(value, (list, tuple)):
+            out.append(LIST if isinstance(value, list) else TUPLE)
+            self._varint(out, len(value))
+            for item in value:
+                self._write(out, item)
+        elif isinstance(value, dict):
+            out.append(DICT)
+            self._varint(out, len(value))
+            for key, item in value.items():
+                self._write(out, key)
+                self._write(out, item)
+        elif type(value) in self._codes:
+            code = self._codes[type(value)]
+            out.append(RECORD)
+            out.append(code)
+            for name in self._fields[code]:
+                self._write(out, getattr(value, name))
+        elif isinstance(value, int):
+            self._write(out, int(value))
+        else:
+            raise TypeError(f"Cannot encode {type(value).__name__} for the store protocol")
+
+    # ============ Decoding ============
+
+    def decode(self, data: bytes) -> Any:
+        value, position = self._read(memoryview(data), 0)
+        if position != len(data):
+            raise ProtocolError("Trailing bytes after value")
+        return value
+
+    @staticmethod
+    def _read_varint(data: memoryview, position: int) -> Tuple[int, int]:
+        result = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result, position
+            shift += 7
+
+    def _read(self, data: memoryview, position: int) -> Tuple[Any, int]:
+        tag = data[position]
+        position += 1
+        if tag == NONE:
+            return None, position
+        if tag == TRUE:
+            return True, position
+        if tag == FALSE:
+            return False, position
+        if tag == INT:
+            value, position = self._read_varint(data, position)
+            return _unzigzag(value), position
+        if tag == FLOAT:
+            return _FLOAT.unpack_from(data, position)[0], position + 8
+        if tag in (STR, BYTES):
+            size, position = self._read_varint(data, position)
+            raw = bytes(data[position:position + size])
+            return (raw.decode() if tag == STR else raw), position + size
+        if tag == DECIMAL:
+            size, position = self._read_varint(data, position)
+            return Decimal(bytes(data[position:position + size]).decode()), position + size
+        if tag == UUID_:
+            return UUID(bytes=bytes(data[position:position + 16])), position + 16
+        if tag == DATETIME:
+            micros, position = self._read_varint(data, position)
+            return _EPOCH + _unzigzag(micros) * _MICROSECOND, position
+        if tag == DATETIME_TZ:
+            micros, position = self._read_varint(data, position)
+            offset, position = self._read_varint(data, position)
+            tz = timezone(timedelta(seconds=_unzigzag(offset)))
+            return (_EPOCH_UTC + _unzigzag(micros) * _MICROSECOND).astimezone(tz), position
+        if tag == DATE:
+            ordinal, position = self._read_varint(data, position)
+            return date.fromordinal(ordinal), position
+        if tag in (LIST, TUPLE):
+            size, position = self._read_varint(data, position)
+            items = []
+            for _ in range(size):
+                item, position = self._read(data, position)
+                items.append(item)
+            return (items if tag == LIST else tuple(items)), position
+        if tag == DICT:
+            size, position = self._read_varint(data, position)
+            result = {}
+            for _ in range(size):
+                key, position = self._read(data, position)
+                result[key], position = self._read(data, position)
+            return result, position
+        if tag == RECORD:
+            code = data[position]
+            position += 1
+            if code >= len(self.record_types):
+                raise ProtocolError(f"Unknown record type {code}")
+            values = []
+            for _ in self._fields[code]:
+                value, position = self._read(data, position)
+                values.append(value)
+            return self.record_types[code](*values), position
+        raise ProtocolError(f"Unknown tag {tag}")
+
+
+# ============ Framing ============
+
+def recv_exact(sock, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Store connection closed")
+        received += count
+    return bytes(buffer)
+
+
+def send_frame(sock, payload: bytes) -> None:
+    sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock) -> bytes:
+    (size,) = FRAME_HEADER.unpack(recv_exact(sock, FRAME_HEADER.size))
+    if size > MAX_FRAME:
+        raise ProtocolError(f"Frame of {size} bytes exceeds {MAX_FRAME}")
+    return recv_exact(sock, size)
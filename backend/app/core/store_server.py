@@ -0,0 +1,96 @@
+"""
+Store Server
+Owns one InMemoryStore and serves its public methods over a Unix socket,
+so several uvicorn workers can share the in-memory data.
+
+    python -m app.core.store_server --socket /tmp/surya-store.sock
+    STORE_SOCKET=/tmp/surya-store.sock uvicorn app.main:app --workers 4
+
+Each request frame is (method, args, kwargs); each response frame is
+(True, result) or (False, (exception type, message)). Calls are applied one
+at a time, so every store method stays atomic across workers.
+"""
+import argparse
+import os
+import signal
+import socketserver
+import sys
+import threading
+from app.core.config import settings
+from app.core.store_protocol import Codec, ProtocolError, recv_frame, send_frame
+
+
+def store_methods(store_class: type) -> frozenset:
+    """Public methods a client may call"""
+    return frozenset(
+        name for name, value in vars(store_class).items()
+        if callable(value) and not name.startswith("_")
+    )
+
+
+class StoreRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: "StoreServer" = self.server
+        while True:
+            try:
+                frame = recv_frame(self.request)
+            except (ConnectionError, ProtocolError, OSError):
+                return
+            send_frame(self.request, server.dispatch(frame))
+
+
+class StoreServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, store, codec: Codec):
+        self.store = store
+        self.codec = codec
+        self.methods = store_methods(type(store))
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, StoreRequestHandler)
+        os.chmod(path, 0o600)
+
+    def dispatch(self, frame: bytes) -> bytes:
+        try:
+            method, args, kwargs = self.codec.decode(frame)
+            if method not in self.methods:
+                raise AttributeError(f"Store has no method {method!r}")
+            with self.lock:
+                result = getattr(self.store, method)(*args, **kwargs)
+            return self.codec.encode((True, result))
+        except Exception as e:
+            return self.codec.encode((False, (type(e).__name__, str(e))))
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the in-memory store over a Unix socket")
+    parser.add_argument("--socket", default=settings.STORE_SOCKET, help="Unix socket path (default: STORE_SOCKET)")
+    args = parser.parse_args()
+    if not args.socket:
+        parser.error("--socket or STORE_SOCKET is required")
+
+    from app.core import mock_store
+    store = mock_store.store
+    if not isinstance(store, mock_store.InMemoryStore):
+        store = mock_store.InMemoryStore()
+
+    server = StoreServer(args.socket, store, Codec(mock_store.RECORD_TYPES))
+    print(f"🗄️  Store server listening on {args.socket}")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
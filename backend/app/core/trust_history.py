@@ -0,0 +1,264 @@
+"""
+Trust History
+Append-only per-user trust score history in compact columnar chunks, downsampled for display
+"""
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from app.core.fixed_point import centi_to_float
+from app.core.store_indexes import to_naive_utc
+
+
+REASON_RATING = "rating"
+REASON_LATE_CANCEL = "late_cancel"
+REASON_RECOMPUTE = "recompute"
+
+# One byte per event on disk; codes are append-only, never renumber
+REASON_CODES = {
+    REASON_RATING: 1,
+    REASON_LATE_CANCEL: 2,
+    REASON_RECOMPUTE: 3,
+}
+REASON_NAMES = {code: name for name, code in REASON_CODES.items()}
+
+# Events per chunk before it is sealed; bounds the work of a single append
+CHUNK_SIZE = 512
+
+EPOCH = datetime(1970, 1, 1)
+
+# base_score, first_ts, count
+_HEADER = struct.Struct("<qqI")
+
+# Open chunk on disk, uncompressed: base_score and first_ts, then one
+# (offset, delta, reason code) record per event in append order
+_OPEN_HEADER = struct.Struct("<qq")
+_OPEN_RECORD = struct.Struct("<IiB")
+
+# (timestamp, delta, reason code, score after the event)
+Event = Tuple[int, int, int, int]
+
+
+def to_timestamp(value: datetime) -> int:
+    return int((to_naive_utc(value) - EPOCH).total_seconds())
+
+
+def from_timestamp(value: int) -> datetime:
+    return EPOCH + timedelta(seconds=value)
+
+
+def _little_endian(column: array) -> array:
+    if sys.byteorder != "little":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+class TrustHistoryChunk:
+    """
+    Up to CHUNK_SIZE events held column by column: second offsets from the
+    first event, score deltas in centipoints and one-byte reason codes.
+
+    base_score is the score before the first event, so any chunk can be
+    replayed without touching the ones before it.
+    """
+    __slots__ = ("base_score", "first_ts", "last_ts", "offsets", "deltas", "reasons")
+
+    def __init__(self, base_score: int, first_ts: int):
+        self.base_score = base_score
+        self.first_ts = first_ts
+        self.last_ts = first_ts
+        self.offsets = array("I")
+        self.deltas = array("i")
+        self.reasons = array("B")
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+    @property
+    def full(self) -> bool:
+        return len(self.deltas) >= CHUNK_SIZE
+
+    def append(self, timestamp: int, delta: int, reason_code: int) -> None:
+        # Out-of-order clocks are clamped so offsets stay non-decreasing
+        timestamp = max(timestamp, self.last_ts)
+        self.offsets.append(timestamp - self.first_ts)
+        self.deltas.append(delta)
+        self.reasons.append(reason_code)
+        self.last_ts = timestamp
+
+    def events(self) -> Iterator[Event]:
+        score = self.base_score
+        for offset, delta, reason in zip(self.offsets, self.deltas, self.reasons):
+            score += delta
+            yield self.first_ts + offset, delta, reason, score
+
+    # ============ Persistence ============
+    # Sealed chunks are stored columnar and compressed. The open chunk is
+    # stored as fixed-width records, so an append adds one record's bytes
+    # without decoding the chunk, and compression happens once, at sealing.
+
+    def encode(self) -> bytes:
+        header = _HEADER.pack(self.base_score, self.first_ts, len(self))
+        body = b"".join(
+            _little_endian(column).tobytes()
+            for column in (self.offsets, self.deltas, self.reasons)
+        )
+        return zlib.compress(header + body)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "TrustHistoryChunk":
+        raw = zlib.decompress(data)
+        base_score, first_ts, count = _HEADER.unpack_from(raw)
+        chunk = cls(base_score, first_ts)
+
+        position = _HEADER.size
+        for column in (chunk.offsets, chunk.deltas, chunk.reasons):
+            width = column.itemsize * count
+            column.frombytes(raw[position:position + width])
+            if sys.byteorder != "little":
+                column.byteswap()
+            position += width
+
+        if count:
+            chunk.last_ts = first_ts + chunk.offsets[-1]
+        return chunk
+
+    def encode_open(self) -> bytes:
+        return _OPEN_HEADER.pack(self.base_score, self.first_ts) + b"".join(
+            _OPEN_RECORD.pack(offset, delta, reason)
+            for offset, delta, reason in zip(self.offsets, self.deltas, self.reasons)
+        )
+
+    @staticmethod
+    def open_record(first_ts: int, timestamp: int, delta: int, reason_code: int) -> bytes:
+        """Bytes to append to an encoded open chunk starting at first_ts"""
+        return _OPEN_RECORD.pack(timestamp - first_ts, delta, reason_code)
+
+    @classmethod
+    def decode_open(cls, data: bytes) -> "TrustHistoryChunk":
+        base_score, first_ts = _OPEN_HEADER.unpack_from(data)
+        chunk = cls(base_score, first_ts)
+        for offset, delta, reason in _OPEN_RECORD.iter_unpack(memoryview(data)[_OPEN_HEADER.size:]):
+            chunk.offsets.append(offset)
+            chunk.deltas.append(delta)
+            chunk.reasons.append(reason)
+
+        if chunk.offsets:
+            chunk.last_ts = first_ts + chunk.offsets[-1]
+        return chunk
+
+
+class TrustHistory:
+    """
+    One user's history: sealed chunks kept encoded alongside their time span,
+    plus the open chunk receiving appends.
+    """
+    __slots__ = ("sealed", "open")
+
+    def __init__(self):
+        # (first_ts, last_ts, encoded chunk)
+        self.sealed: List[Tuple[int, int, bytes]] = []
+        self.open: Optional[TrustHistoryChunk] = None
+
+    def __len__(self) -> int:
+        return len(self.sealed) * CHUNK_SIZE + (len(self.open) if self.open else 0)
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        if self.open is not None:
+            return self.open.last_ts
+        return self.sealed[-1][1] if self.sealed else None
+
+    def append(self, when: datetime, delta: int, reason: str, previous_score: int) -> None:
+        timestamp = to_timestamp(when)
+        if self.open is None:
+            last_ts = self.last_ts
+            if last_ts is not None:
+                timestamp = max(timestamp, last_ts)
+            self.open = TrustHistoryChunk(previous_score, timestamp)
+        self.open.append(timestamp, delta, REASON_CODES[reason])
+        if self.open.full:
+            self.sealed.append((self.open.first_ts, self.open.last_ts, self.open.encode()))
+            self.open = None
+
+    def events(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Event]:
+        """Events in [start, end), decoding only chunks whose span overlaps the window"""
+        chunks = [
+            ((first_ts, last_ts), partial(TrustHistoryChunk.decode, data))
+            for first_ts, last_ts, data in self.sealed
+        ]
+        if self.open is not None:
+            open_chunk = self.open
+            chunks.append(((open_chunk.first_ts, open_chunk.last_ts), lambda: open_chunk))
+        return window_events(chunks, start, end)
+
+
+def window_events(
+    chunks: Iterable[Tuple[Tuple[int, int], Callable[[], TrustHistoryChunk]]],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Iterator[Event]:
+    """
+    Replay ((first_ts, last_ts), load) pairs in time order, yielding events in
+    [start, end). Chunks outside the window are never loaded.
+    """
+    start_ts = to_timestamp(start) if start else None
+    end_ts = to_timestamp(end) if end else None
+
+    for (first_ts, last_ts), load in chunks:
+        if start_ts is not None and last_ts < start_ts:
+            continue
+        if end_ts is not None and first_ts >= end_ts:
+            break
+        for event in load().events():
+            timestamp = event[0]
+            if start_ts is not None and timestamp < start_ts:
+                continue
+            if end_ts is not None and timestamp >= end_ts:
+                return
+            yield event
+
+
+def downsample(events: Iterable[Event], points: int) -> Tuple[List[dict], int, bool]:
+    """
+    Collapse events into at most `points` equal-width time buckets.
+
+    Each bucket keeps its closing score plus the min/max score reached inside
+    it, so short dips survive downsampling. Histories that already fit are
+    returned one event per point. Returns (points, total events, downsampled).
+    """
+    events = list(events)
+    total = len(events)
+    if total <= points:
+        return [_bucket([event]) for event in events], total, False
+
+    first_ts = events[0][0]
+    span = events[-1][0] - first_ts + 1
+    buckets: Dict[int, List[Event]] = {}
+    for event in events:
+        buckets.setdefault((event[0] - first_ts) * points // span, []).append(event)
+
+    return [_bucket(buckets[index]) for index in sorted(buckets)], total, True
+
+
+def _bucket(events: List[Event]) -> dict:
+    scores = [event[3] for event in events]
+    reasons: Dict[str, int] = {}
+    for event in events:
+        name = REASON_NAMES.get(event[2], "unknown")
+        reasons[name] = reasons.get(name, 0) + 1
+
+    return {
+        "start_time": from_timestamp(events[0][0]),
+        "end_time": from_timestamp(events[-1][0]),
+        "events": len(events),
+        "delta": centi_to_float(sum(event[1] for event in events)),
+        "score": centi_to_float(scores[-1]),
+        "min_score": centi_to_float(min(scores)),
+        "max_score": centi_to_float(max(scores)),
+        "reasons": reasons,
+    }
@@ -1,6 +1,11 @@
+from datetime import datetime, timedelta
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.mock_store import store
+from app.core.outbox import OutboxDispatcher, FileSink
+from app.core.archive import PeriodicJob
 
 # Import routes
 from app.api.routes import auth_mock, cars_mock, bookings_mock, auctions_mock, admin_mock
@@ -15,6 +20,9 @@ app = FastAPI(
     openapi_url="/api/openapi.json"
 )
 
+# Rate limiting and load shedding, inside CORS so rejections carry CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +32,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Domain event delivery; other modules add in-process handlers with outbox_dispatcher.subscribe
+outbox_dispatcher = OutboxDispatcher(
+    store,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_seconds=settings.OUTBOX_POLL_SECONDS,
+    lease_seconds=settings.OUTBOX_LEASE_SECONDS
+)
+if settings.OUTBOX_FILE_SINK:
+    outbox_dispatcher.subscribe(FileSink(settings.OUTBOX_FILE_SINK))
+
+
+# Periodic archival of finished bookings and closed auctions
+archive_job = PeriodicJob(
+    "archive-job",
+    lambda: store.archive_terminal(datetime.utcnow() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)),
+    settings.ARCHIVE_INTERVAL_SECONDS
+)
+
+
+@app.on_event("startup")
+def start_background_jobs():
+    if settings.OUTBOX_DISPATCH_ENABLED:
+        outbox_dispatcher.start()
+    archive_job.start()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    outbox_dispatcher.stop()
+    archive_job.stop()
+
+
 # Include routers
 app.include_router(auth_mock.router, prefix="/api")
 app.include_router(cars_mock.router, prefix="/api")
@@ -1,14 +1,20 @@
 # Models package
-from app.models.user import User
+from app.models.user import User, TrustChunk
 from app.models.car import Car
-from app.models.booking import Availability, Booking, AvailabilityStatus, BookingStatus
+from app.models.booking import Availability, CarCalendar, Booking, AvailabilityStatus, BookingStatus
 from app.models.auction import Auction, Bid, AuctionStatus
 from app.models.rating import Ride, Rating, RideStatus
+from app.models.report import CarDailyStat
+from app.models.outbox import OutboxEvent
+from app.models.archive import ArchiveSegment, ArchivedRecord
+from app.models.idempotency import IdempotencyKey
 
 __all__ = [
     "User",
+    "TrustChunk",
     "Car", 
     "Availability",
+    "CarCalendar",
     "Booking",
     "AvailabilityStatus",
     "BookingStatus",
@@ -18,4 +24,9 @@ __all__ = [
     "Ride",
     "Rating",
     "RideStatus",
+    "CarDailyStat",
+    "OutboxEvent",
+    "ArchiveSegment",
+    "ArchivedRecord",
+    "IdempotencyKey",
 ]
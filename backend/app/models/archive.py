@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, LargeBinary, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class ArchiveSegment(Base):
+    """
+    A compressed, append-only batch of archived bookings or auctions with
+    their dependent rows (see app.core.archive). Never updated once written.
+    """
+    __tablename__ = "archive_segments"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    kind = Column(String(20), nullable=False)
+    record_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ArchivedRecord(Base):
+    """Index of archived ids, so history views find a record's segment without decoding the others"""
+    __tablename__ = "archived_records"
+    
+    record_id = Column(UUID(as_uuid=True), primary_key=True)
+    kind = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False)
+    segment_id = Column(BigInteger, ForeignKey("archive_segments.id"), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        # History views list one kind, optionally one status, newest first
+        Index('ix_archived_records_kind', 'kind', 'status', 'created_at'),
+    )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Column, String, DateTime, Numeric, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, Numeric, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -32,6 +32,15 @@ class Auction(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # A car's auctions by status; overlap checks only look at active ones
+    __table_args__ = (
+        Index('ix_auctions_car_status', 'car_id', 'status'),
+        Index(
+            'ix_auctions_active', 'car_id', 'start_time', 'end_time',
+            postgresql_where=text("status = 'active'")
+        ),
+    )
+    
     # Relationships
     car = relationship("Car", back_populates="auctions")
     winner = relationship("User", foreign_keys=[winner_id])
@@ -53,9 +62,12 @@ class Bid(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Unique constraint: one bid per user per auction
+    # Unique constraint: one bid per user per auction (its index also serves
+    # lookups by auction_id); a user's bids and a booking's bid need their own
     __table_args__ = (
         UniqueConstraint('auction_id', 'user_id', name='unique_user_auction_bid'),
+        Index('ix_bids_user_id', 'user_id'),
+        Index('ix_bids_booking_id', 'booking_id'),
     )
     
     # Relationships
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Column, String, DateTime, Numeric, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Numeric, ForeignKey, Enum, Index, Integer, LargeBinary, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -34,10 +34,27 @@ class Availability(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index('ix_availability_car_status', 'car_id', 'status'),
+    )
+    
     # Relationships
     car = relationship("Car", back_populates="availabilities")
 
 
+class CarCalendar(Base):
+    """Hourly booked/locked bitsets for a car (see app.core.availability_calendar)"""
+    __tablename__ = "car_calendars"
+    
+    car_id = Column(UUID(as_uuid=True), ForeignKey("cars.id", ondelete="CASCADE"), primary_key=True)
+    booked = Column(LargeBinary, nullable=False, default=b"")
+    locked = Column(LargeBinary, nullable=False, default=b"")
+    # Hour slot of bit 0, moved forward as old hours are trimmed
+    base_slot = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class Booking(Base):
     __tablename__ = "bookings"
     
@@ -54,6 +71,18 @@ class Booking(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Occupancy lookups: "is this car taken between start and end";
+    # conflict checks only look at open requests, a small slice of the table;
+    # a user's bookings are listed newest first
+    __table_args__ = (
+        Index('ix_bookings_occupancy', 'car_id', 'status', 'start_time', 'end_time'),
+        Index(
+            'ix_bookings_open', 'car_id', 'start_time', 'end_time',
+            postgresql_where=text("status IN ('pending', 'competing')")
+        ),
+        Index('ix_bookings_user_created', 'user_id', 'created_at'),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="bookings")
     car = relationship("Car", back_populates="bookings")
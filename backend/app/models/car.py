@@ -1,9 +1,9 @@
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Numeric, Text
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Numeric, Text, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.core.database import Base
 
 
@@ -23,10 +23,26 @@ class Car(Base):
     fuel_type = Column(String(20), default="petrol")  # petrol, diesel, electric, hybrid
     description = Column(Text, nullable=True)
     
+    # Full-text search document, kept current by Postgres on every insert/update
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(model, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
+    
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Catalog listing: price range filters and price sorts over active cars
+    __table_args__ = (
+        Index('ix_cars_active_price', 'is_active', 'daily_price', 'id'),
+        Index('ix_cars_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+    
     # Relationships
     availabilities = relationship("Availability", back_populates="car", cascade="all, delete-orphan")
     bookings = relationship("Booking", back_populates="car", cascade="all, delete-orphan")
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, LargeBinary, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Idempotency-Key claims and their stored responses (see app.core.idempotency)"""
+    __tablename__ = "idempotency_keys"
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    route = Column(String(100), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    
+    fingerprint = Column(String(32), nullable=False)
+    response = Column(LargeBinary, nullable=True)  # NULL while the first request is still running
+    claimed_until = Column(DateTime, nullable=False)  # A NULL response past this was abandoned
+    expires_at = Column(DateTime, nullable=False)
@@ -0,0 +1,42 @@
+"""
+Relationship loading for the API response models, applied with
+query.options(*...). Each selectinload fetches a relationship for the whole
+page in one IN query instead of a lazy load per row.
+"""
+from typing import Optional
+from sqlalchemy.orm import selectinload, load_only
+from app.core.fieldsets import FieldTree, column_names
+from app.models.booking import Booking
+from app.models.auction import Auction, Bid
+from app.models.car import Car
+from app.models.user import User
+
+
+BOOKING_DETAILS = (selectinload(Booking.user), selectinload(Booking.car))
+
+AUCTION_DETAILS = (
+    selectinload(Auction.car),
+    selectinload(Auction.winner),
+    selectinload(Auction.bids).selectinload(Bid.user),
+)
+
+AUCTION_SUMMARY = (selectinload(Auction.car), selectinload(Auction.bids))
+
+
+def columns_only(model, fields: FieldTree, always=("id",)):
+    """load_only for the requested fields of `model`, so other columns stay out of the SELECT"""
+    return load_only(*[getattr(model, name) for name in column_names(model, fields, always)])
+
+
+def booking_details_options(fields: Optional[FieldTree]) -> tuple:
+    """BOOKING_DETAILS narrowed to a sparse fieldset: unrequested relations are not loaded at all"""
+    if fields is None:
+        return BOOKING_DETAILS
+    options = [columns_only(Booking, fields, always=("id", "user_id", "car_id"))]
+    for relation, model in (("user", User), ("car", Car)):
+        if relation in fields:
+            loader = selectinload(getattr(Booking, relation))
+            if fields[relation] is not None:
+                loader = loader.options(columns_only(model, fields[relation]))
+            options.append(loader)
+    return tuple(options)
@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, JSON, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    Domain events written in the same transaction as the change they
+    describe, then delivered by the outbox dispatcher (see app.core.outbox)
+    """
+    __tablename__ = "outbox_events"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String(50), nullable=False)
+    aggregate_id = Column(UUID(as_uuid=True), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Delivery state: leased by a dispatcher until claimed_until, done once dispatched_at is set
+    claimed_until = Column(DateTime, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    dispatched_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Dispatchers only ever scan undelivered events, oldest first
+        Index('ix_outbox_events_pending', 'id', postgresql_where=text('dispatched_at IS NULL')),
+    )
@@ -0,0 +1,28 @@
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Column, Integer, Date, DateTime, Numeric, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class CarDailyStat(Base):
+    """Per-car daily counters behind /admin/reports (see app.core.reporting)"""
+    __tablename__ = "car_daily_stats"
+    
+    car_id = Column(UUID(as_uuid=True), ForeignKey("cars.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    
+    requests = Column(Integer, nullable=False, default=0)
+    conflicts = Column(Integer, nullable=False, default=0)
+    auctions = Column(Integer, nullable=False, default=0)
+    confirmed = Column(Integer, nullable=False, default=0)
+    booked_minutes = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=Decimal("0.00"))
+    rides_completed = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        # Fleet-wide windows and daily series scan by day across cars
+        Index('ix_car_daily_stats_day', 'day'),
+    )
@@ -0,0 +1,78 @@
+"""
+Cached statements for hot ORM queries, run with db.scalars(...).
+
+Each is a lambda_stmt: SQLAlchemy builds and compiles the SELECT once per
+call site, keyed on the lambda's code, and on later calls only pulls the
+closure variables out as bound parameters. A db.query(...).filter(...)
+chain instead constructs the whole expression and its cache key on every
+call. Closure variables must be plain values (ids, datetimes), never
+expressions, or each call would compile a new statement.
+"""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from app.models.user import User
+from app.models.car import Car
+from app.models.booking import Booking, BookingStatus
+from app.models.auction import Auction, AuctionStatus
+
+# Plain strings: attribute chains like BookingStatus.CONFIRMED.value inside
+# a lambda would be tracked as parameters rather than rendered as values
+CONFIRMED = BookingStatus.CONFIRMED.value
+OPEN_STATUSES = [BookingStatus.PENDING.value, BookingStatus.COMPETING.value]
+AUCTION_ACTIVE = AuctionStatus.ACTIVE.value
+
+
+def user_by_id(user_id) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id).limit(1))
+
+
+def active_car(car_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Car).where(Car.id == car_id, Car.is_active == True).limit(1))
+
+
+def confirmed_overlap(car_id: UUID, start_time: datetime, end_time: datetime) -> StatementLambdaElement:
+    """First confirmed booking of the car overlapping the period"""
+    return lambda_stmt(
+        lambda: select(Booking).where(
+            Booking.car_id == car_id,
+            Booking.status == CONFIRMED,
+            Booking.start_time < end_time,
+            Booking.end_time > start_time
+        ).limit(1)
+    )
+
+
+def open_overlaps(
+    car_id: UUID,
+    start_time: datetime,
+    end_time: datetime,
+    exclude_booking_id: Optional[UUID] = None
+) -> StatementLambdaElement:
+    """Pending/competing bookings of the car overlapping the period"""
+    stmt = lambda_stmt(
+        lambda: select(Booking).where(
+            Booking.car_id == car_id,
+            Booking.status.in_(OPEN_STATUSES),
+            # Overlap check: (start1 < end2) AND (end1 > start2)
+            Booking.start_time < end_time,
+            Booking.end_time > start_time
+        )
+    )
+    if exclude_booking_id:
+        stmt += lambda s: s.where(Booking.id != exclude_booking_id)
+    return stmt
+
+
+def active_auction_overlap(car_id: UUID, start_time: datetime, end_time: datetime) -> StatementLambdaElement:
+    """The car's active auction overlapping the period, if any"""
+    return lambda_stmt(
+        lambda: select(Auction).where(
+            Auction.car_id == car_id,
+            Auction.status == AUCTION_ACTIVE,
+            Auction.start_time < end_time,
+            Auction.end_time > start_time
+        ).limit(1)
+    )
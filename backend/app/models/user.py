@@ -1,10 +1,12 @@
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Numeric, Text, ForeignKey, CheckConstraint, UniqueConstraint
+from sqlalchemy import Column, String, Boolean, Integer, BigInteger, DateTime, Numeric, Text, ForeignKey, CheckConstraint, UniqueConstraint, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.core.fixed_point import to_centi, centi_to_decimal
+from app.core.scoring import trust_score
 
 
 class User(Base):
@@ -38,13 +40,9 @@ class User(Base):
         trust_score = (avg_rating × 20) + (total_rides × 0.5) 
                       - (damage_count × 15) - (rash_count × 10)
         """
-        score = (
-            (float(self.avg_rating) * 20) +
-            (self.total_rides * 0.5) -
-            (self.damage_count * 15) -
-            (self.rash_count * 10)
-        )
-        return Decimal(str(max(score, 0)))
+        return centi_to_decimal(trust_score(
+            to_centi(self.avg_rating), self.total_rides, self.damage_count, self.rash_count
+        ))
     
     def update_trust_score(self):
         """Recalculate and update trust score"""
@@ -53,3 +51,28 @@ class User(Base):
     @property
     def is_admin(self) -> bool:
         return self.role == "admin"
+
+
+# Leaderboard, /admin/users listing and rank queries: (role, is_blocked) equality, trust order
+Index('ix_users_leaderboard', User.role, User.is_blocked, User.trust_score.desc())
+
+
+class TrustChunk(Base):
+    """Encoded chunk of a user's trust history (see app.core.trust_history)"""
+    __tablename__ = "trust_history_chunks"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    
+    # Event span in epoch seconds, so range reads skip chunks without decoding
+    first_ts = Column(BigInteger, nullable=False)
+    last_ts = Column(BigInteger, nullable=False)
+    event_count = Column(Integer, nullable=False, default=0)
+    sealed = Column(Boolean, nullable=False, default=False)
+    data = Column(LargeBinary, nullable=False)
+    
+    __table_args__ = (
+        # Newest chunk lookup on append, ordered replay on read
+        UniqueConstraint('user_id', 'seq', name='uq_trust_history_chunks_user_seq'),
+    )
@@ -17,6 +17,7 @@ from app.schemas.car import (
     AvailabilityBase,
     AvailabilityCreate,
     AvailabilityResponse,
+    AvailabilityRange,
     CarWithAvailability,
 )
 from app.schemas.booking import (
@@ -55,6 +56,7 @@ __all__ = [
     "AvailabilityBase",
     "AvailabilityCreate",
     "AvailabilityResponse",
+    "AvailabilityRange",
     "CarWithAvailability",
     # Booking
     "BookingCreate",
@@ -65,6 +65,11 @@ class AvailabilityResponse(AvailabilityBase):
         from_attributes = True
 
 
+class AvailabilityRange(AvailabilityBase):
+    """Run-length encoded calendar range"""
+    pass
+
+
 class CarWithAvailability(CarResponse):
     availabilities: List[AvailabilityResponse] = []
     
@@ -1,11 +1,26 @@
 # Services package
+from app.services.trust_history_engine import trust_history_engine, TrustHistoryEngine
 from app.services.trust_engine import trust_engine, TrustEngine
+from app.services.calendar_engine import calendar_engine, CalendarEngine
+from app.services.report_engine import report_engine, ReportEngine
+from app.services.outbox_engine import outbox_engine, OutboxEngine
+from app.services.archive_engine import archive_engine, ArchiveEngine
 from app.services.auction_engine import auction_engine, AuctionEngine
 from app.services.booking_engine import booking_engine, BookingEngine
 
 __all__ = [
+    "trust_history_engine",
+    "TrustHistoryEngine",
     "trust_engine",
     "TrustEngine",
+    "calendar_engine",
+    "CalendarEngine",
+    "report_engine",
+    "ReportEngine",
+    "outbox_engine",
+    "OutboxEngine",
+    "archive_engine",
+    "ArchiveEngine",
     "auction_engine",
     "AuctionEngine",
     "booking_engine",
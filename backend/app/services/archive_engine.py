@@ -0,0 +1,192 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Session, selectinload
+from app.core.database import SessionLocal
+from app.models import ArchiveSegment, ArchivedRecord, Booking, Auction, Bid, Ride, Rating
+from app.core.store_protocol import Codec
+from app.core.archive import (
+    ArchiveEntry, BOOKINGS, AUCTIONS, ARCHIVABLE_BOOKING_STATUSES, ARCHIVABLE_AUCTION_STATUSES,
+    SEGMENT_RECORDS, pack_segment, unpack_segment
+)
+
+
+# Archived rows are plain column dicts, so no record types are needed
+ROW_CODEC = Codec(())
+
+
+def _columns(row) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    return {attr.key: getattr(row, attr.key) for attr in inspect(type(row)).column_attrs}
+
+
+class ArchiveEngine:
+    """
+    Archive Engine
+
+    Moves closed auctions (with their bids) and finished bookings (with
+    their ride and rating) into archive_segments, one compressed segment
+    per batch, and deletes the live rows in the same transaction.
+    car_daily_stats, trust scores and trust history are kept separately
+    and are unchanged.
+
+    archive_terminal is a background job and commits each batch in its
+    own session; the read methods only query.
+    """
+
+    @staticmethod
+    def archive_terminal(cutoff: datetime, batch_size: int = SEGMENT_RECORDS) -> Dict[str, int]:
+        archived = {AUCTIONS: 0, BOOKINGS: 0}
+        while True:
+            with SessionLocal() as db:
+                count = ArchiveEngine._archive_auctions(db, cutoff, batch_size)
+                db.commit()
+            archived[AUCTIONS] += count
+            if count < batch_size:
+                break
+        while True:
+            with SessionLocal() as db:
+                count = ArchiveEngine._archive_bookings(db, cutoff, batch_size)
+                db.commit()
+            archived[BOOKINGS] += count
+            if count < batch_size:
+                break
+        return archived
+
+    @staticmethod
+    def _archive_auctions(db: Session, cutoff: datetime, limit: int) -> int:
+        auctions = (
+            db.query(Auction)
+            .filter(
+                Auction.status.in_(ARCHIVABLE_AUCTION_STATUSES),
+                func.coalesce(Auction.auction_end, Auction.created_at) < cutoff
+            )
+            .options(selectinload(Auction.bids))
+            .order_by(Auction.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=Auction)
+            .all()
+        )
+        entries = [
+            (a.id, a.status, a.created_at, {
+                "auction": _columns(a),
+                "bids": [_columns(b) for b in sorted(a.bids, key=lambda b: b.created_at)],
+            })
+            for a in auctions
+        ]
+        if entries:
+            ArchiveEngine._write_segment(db, AUCTIONS, entries)
+            ids = [a.id for a in auctions]
+            db.query(Bid).filter(Bid.auction_id.in_(ids)).delete(synchronize_session=False)
+            db.query(Auction).filter(Auction.id.in_(ids)).delete(synchronize_session=False)
+        return len(entries)
+
+    @staticmethod
+    def _archive_bookings(db: Session, cutoff: datetime, limit: int) -> int:
+        has_bid = db.query(Bid.id).filter(Bid.booking_id == Booking.id).exists()
+        riding = db.query(Ride.id).filter(Ride.booking_id == Booking.id, Ride.status == "active").exists()
+        bookings = (
+            db.query(Booking)
+            .filter(
+                Booking.status.in_(ARCHIVABLE_BOOKING_STATUSES),
+                Booking.updated_at < cutoff,
+                ~has_bid,
+                ~riding
+            )
+            .options(selectinload(Booking.ride).selectinload(Ride.rating))
+            .order_by(Booking.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=Booking)
+            .all()
+        )
+        entries = [
+            (b.id, b.status, b.created_at, {
+                "booking": _columns(b),
+                "ride": _columns(b.ride),
+                "rating": _columns(b.ride.rating) if b.ride else None,
+            })
+            for b in bookings
+        ]
+        if entries:
+            ArchiveEngine._write_segment(db, BOOKINGS, entries)
+            ids = [b.id for b in bookings]
+            ride_ids = [b.ride.id for b in bookings if b.ride]
+            if ride_ids:
+                db.query(Rating).filter(Rating.ride_id.in_(ride_ids)).delete(synchronize_session=False)
+                db.query(Ride).filter(Ride.id.in_(ride_ids)).delete(synchronize_session=False)
+            db.query(Booking).filter(Booking.id.in_(ids)).delete(synchronize_session=False)
+        return len(entries)
+
+    @staticmethod
+    def _write_segment(db: Session, kind: str, entries: List[ArchiveEntry]) -> None:
+        segment = ArchiveSegment(kind=kind, record_count=len(entries), data=pack_segment(ROW_CODEC, entries))
+        db.add(segment)
+        db.flush()
+        db.add_all(
+            ArchivedRecord(
+                record_id=record_id, kind=kind, status=record_status,
+                segment_id=segment.id, created_at=created_at
+            )
+            for record_id, record_status, created_at, _ in entries
+        )
+
+    # ============ Reads ============
+
+    @staticmethod
+    def _bundles(db: Session, records: List[ArchivedRecord]) -> List[dict]:
+        """Bundles for index rows, in their order, decoding each segment once"""
+        segment_ids = {record.segment_id for record in records}
+        decoded: Dict[UUID, dict] = {}
+        for segment in db.query(ArchiveSegment).filter(ArchiveSegment.id.in_(segment_ids)):
+            for record_id, _, _, bundle in unpack_segment(ROW_CODEC, segment.data):
+                decoded[record_id] = bundle
+        return [decoded[record.record_id] for record in records if record.record_id in decoded]
+
+    @staticmethod
+    def get_archived(db: Session, record_id: UUID) -> Optional[dict]:
+        record = db.query(ArchivedRecord).filter(ArchivedRecord.record_id == record_id).first()
+        if record is None:
+            return None
+        bundles = ArchiveEngine._bundles(db, [record])
+        return bundles[0] if bundles else None
+
+    @staticmethod
+    def scan(db: Session, kind: str, status: str = None, skip: int = 0, limit: int = None) -> List[dict]:
+        """Archived bundles of one kind, newest first"""
+        query = db.query(ArchivedRecord).filter(ArchivedRecord.kind == kind)
+        if status:
+            query = query.filter(ArchivedRecord.status == status)
+        query = query.order_by(ArchivedRecord.created_at.desc()).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return ArchiveEngine._bundles(db, query.all())
+
+    @staticmethod
+    def stats(db: Session) -> Dict[str, Dict[str, int]]:
+        rows = (
+            db.query(
+                ArchiveSegment.kind,
+                func.count(ArchiveSegment.id),
+                func.sum(ArchiveSegment.record_count),
+                func.sum(func.length(ArchiveSegment.data))
+            )
+            .group_by(ArchiveSegment.kind)
+            .all()
+        )
+        stats = {
+            kind: {"segments": segments, "records": int(records or 0), "bytes": int(size or 0)}
+            for kind, segments, records, size in rows
+        }
+        stats["hot"] = {
+            "bookings": db.query(func.count(Booking.id)).scalar(),
+            "auctions": db.query(func.count(Auction.id)).scalar(),
+            "bids": db.query(func.count(Bid.id)).scalar(),
+            "rides": db.query(func.count(Ride.id)).scalar(),
+            "ratings": db.query(func.count(Rating.id)).scalar(),
+        }
+        return stats
+
+
+archive_engine = ArchiveEngine()
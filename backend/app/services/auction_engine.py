@@ -1,12 +1,18 @@
 from datetime import datetime, timedelta
-from decimal import Decimal
 from typing import Optional, List, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
-from app.models import Auction, Bid, Booking, User, Availability, AuctionStatus, BookingStatus, AvailabilityStatus
+from app.models import Auction, Bid, Booking, User, AuctionStatus, BookingStatus
+from app.models.loaders import AUCTION_DETAILS
+from app.models.statements import open_overlaps, active_auction_overlap
 from app.core.config import settings
+from app.core.fixed_point import to_paise, to_centi, to_score, score_to_decimal
+from app.core.scoring import final_scores, TRUST_THRESHOLD
 from app.services.trust_engine import trust_engine
+from app.services.calendar_engine import calendar_engine
+from app.services.report_engine import report_engine
+from app.services.outbox_engine import outbox_engine
 
 
 class AuctionEngine:
@@ -38,21 +44,7 @@ class AuctionEngine:
         exclude_booking_id: Optional[UUID] = None
     ) -> List[Booking]:
         """Find overlapping pending/competing bookings for the same car and time"""
-        query = (
-            db.query(Booking)
-            .filter(
-                Booking.car_id == car_id,
-                Booking.status.in_([BookingStatus.PENDING.value, BookingStatus.COMPETING.value]),
-                # Overlap check: (start1 < end2) AND (end1 > start2)
-                Booking.start_time < end_time,
-                Booking.end_time > start_time
-            )
-        )
-        
-        if exclude_booking_id:
-            query = query.filter(Booking.id != exclude_booking_id)
-        
-        return query.all()
+        return db.scalars(open_overlaps(car_id, start_time, end_time, exclude_booking_id)).all()
     
     @staticmethod
     def get_or_create_auction(
@@ -63,16 +55,7 @@ class AuctionEngine:
     ) -> Tuple[Auction, bool]:
         """Get existing auction or create new one for the car/time slot"""
         # Check for existing active auction
-        existing = (
-            db.query(Auction)
-            .filter(
-                Auction.car_id == car_id,
-                Auction.status == AuctionStatus.ACTIVE.value,
-                Auction.start_time < end_time,
-                Auction.end_time > start_time
-            )
-            .first()
-        )
+        existing = db.scalars(active_auction_overlap(car_id, start_time, end_time)).first()
         
         if existing:
             return existing, False
@@ -87,37 +70,17 @@ class AuctionEngine:
             status=AuctionStatus.ACTIVE.value
         )
         db.add(auction)
+        
+        # Lock the period on the car's calendar
+        calendar_engine.lock(db, auction)
+        report_engine.auction_opened(db, auction)
+        outbox_engine.auction_opened(db, auction)
+        
         db.commit()
         db.refresh(auction)
         
-        # Lock the availability
-        AuctionEngine._lock_availability(db, car_id, start_time, end_time)
-        
         return auction, True
     
-    @staticmethod
-    def _lock_availability(
-        db: Session,
-        car_id: UUID,
-        start_time: datetime,
-        end_time: datetime
-    ):
-        """Lock car availability during auction"""
-        availability = (
-            db.query(Availability)
-            .filter(
-                Availability.car_id == car_id,
-                Availability.start_time <= start_time,
-                Availability.end_time >= end_time,
-                Availability.status == AvailabilityStatus.AVAILABLE.value
-            )
-            .first()
-        )
-        
-        if availability:
-            availability.status = AvailabilityStatus.LOCKED.value
-            db.commit()
-    
     @staticmethod
     def create_or_update_bid(
         db: Session,
@@ -141,6 +104,7 @@ class AuctionEngine:
             existing_bid.offer_price = booking.offer_price
             existing_bid.trust_score_snapshot = user.trust_score
             existing_bid.updated_at = datetime.utcnow()
+            outbox_engine.bid_placed(db, existing_bid)
             db.commit()
             db.refresh(existing_bid)
             return existing_bid
@@ -154,9 +118,14 @@ class AuctionEngine:
             trust_score_snapshot=user.trust_score
         )
         db.add(bid)
+        outbox_engine.bid_placed(db, bid)
         
         # Update booking status
-        booking.status = BookingStatus.COMPETING.value
+        previous = booking.status
+        if previous != BookingStatus.COMPETING.value:
+            booking.status = BookingStatus.COMPETING.value
+            report_engine.booking_changed(db, booking, previous)
+            outbox_engine.booking_changed(db, booking, previous)
         
         db.commit()
         db.refresh(bid)
@@ -169,25 +138,15 @@ class AuctionEngine:
         if not bids:
             return
         
-        # Find max values for normalization
-        max_trust = max(float(b.trust_score_snapshot) for b in bids) or 1
-        max_rides = max(b.user.total_rides for b in bids) or 1
-        max_price = max(float(b.offer_price) for b in bids) or 1
+        # Normalize and weight on fixed-point integers
+        scores = final_scores(
+            [to_centi(b.trust_score_snapshot) for b in bids],
+            [b.user.total_rides for b in bids],
+            [to_paise(b.offer_price) for b in bids]
+        )
         
-        for bid in bids:
-            # Normalize components
-            normalized_trust = float(bid.trust_score_snapshot) / max_trust
-            normalized_rides = bid.user.total_rides / max_rides
-            normalized_price = float(bid.offer_price) / max_price
-            
-            # Calculate final score
-            final_score = (
-                0.5 * normalized_trust +
-                0.3 * normalized_rides +
-                0.2 * normalized_price
-            )
-            
-            bid.final_score = Decimal(str(round(final_score, 4)))
+        for bid, score in zip(bids, scores):
+            bid.final_score = score_to_decimal(score)
         
         db.commit()
     
@@ -204,15 +163,15 @@ class AuctionEngine:
         # Separate eligible (high trust) and fallback (low trust) bids
         eligible_bids = [
             b for b in bids 
-            if float(b.trust_score_snapshot) >= settings.TRUST_THRESHOLD
+            if to_centi(b.trust_score_snapshot) >= TRUST_THRESHOLD
         ]
         
         if eligible_bids:
             # Trust-based: highest final_score wins
-            winner_bid = max(eligible_bids, key=lambda b: float(b.final_score or 0))
+            winner_bid = max(eligible_bids, key=lambda b: to_score(b.final_score or 0))
         else:
             # Fallback: highest offer_price wins
-            winner_bid = max(bids, key=lambda b: float(b.offer_price))
+            winner_bid = max(bids, key=lambda b: to_paise(b.offer_price))
         
         return winner_bid
     
@@ -223,6 +182,8 @@ class AuctionEngine:
         
         if not winning_bid:
             auction.status = AuctionStatus.CLOSED.value
+            calendar_engine.unlock(db, auction)
+            outbox_engine.auction_closed(db, auction)
             db.commit()
             return None
         
@@ -233,24 +194,23 @@ class AuctionEngine:
         
         # Confirm winning booking
         winning_booking = winning_bid.booking
+        previous = winning_booking.status
         winning_booking.status = BookingStatus.CONFIRMED.value
+        report_engine.booking_changed(db, winning_booking, previous)
+        outbox_engine.booking_changed(db, winning_booking, previous)
         
         # Reject other bookings
         for bid in auction.bids:
             if bid.id != winning_bid.id:
+                previous = bid.booking.status
                 bid.booking.status = BookingStatus.REJECTED.value
+                report_engine.booking_changed(db, bid.booking, previous)
+                outbox_engine.booking_changed(db, bid.booking, previous)
         
-        # Update availability to booked
-        availability = (
-            db.query(Availability)
-            .filter(
-                Availability.car_id == auction.car_id,
-                Availability.status == AvailabilityStatus.LOCKED.value
-            )
-            .first()
-        )
-        if availability:
-            availability.status = AvailabilityStatus.BOOKED.value
+        # Swap the auction lock for the winner's booking on the calendar
+        calendar_engine.unlock(db, auction)
+        calendar_engine.mark_booked(db, winning_booking)
+        outbox_engine.auction_closed(db, auction)
         
         db.commit()
         return winning_booking
@@ -265,6 +225,7 @@ class AuctionEngine:
                 Bid.user_id == user_id,
                 Auction.status == AuctionStatus.ACTIVE.value
             )
+            .options(*AUCTION_DETAILS)
             .all()
         )
 
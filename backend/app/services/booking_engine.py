@@ -4,9 +4,13 @@ from typing import Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from app.models import Booking, Availability, User, Car, BookingStatus, AvailabilityStatus
+from app.models import Booking, User, Car, BookingStatus
+from app.models.statements import user_by_id, active_car, confirmed_overlap
 from app.services.trust_engine import trust_engine
 from app.services.auction_engine import auction_engine
+from app.services.calendar_engine import calendar_engine
+from app.services.report_engine import report_engine
+from app.services.outbox_engine import outbox_engine
 from app.core.config import settings
 
 
@@ -30,40 +34,18 @@ class BookingEngine:
     ) -> bool:
         """Check if car is available for the requested time slot"""
         # Check if car exists and is active
-        car = db.query(Car).filter(Car.id == car_id, Car.is_active == True).first()
+        car = db.scalars(active_car(car_id)).first()
         if not car:
             return False
         
         # Check for existing confirmed bookings
-        conflicting_booking = (
-            db.query(Booking)
-            .filter(
-                Booking.car_id == car_id,
-                Booking.status == BookingStatus.CONFIRMED.value,
-                Booking.start_time < end_time,
-                Booking.end_time > start_time
-            )
-            .first()
-        )
+        conflicting_booking = db.scalars(confirmed_overlap(car_id, start_time, end_time)).first()
         
         if conflicting_booking:
             return False
         
-        # Check availability records
-        availability = (
-            db.query(Availability)
-            .filter(
-                Availability.car_id == car_id,
-                Availability.start_time <= start_time,
-                Availability.end_time >= end_time,
-                Availability.status == AvailabilityStatus.AVAILABLE.value
-            )
-            .first()
-        )
-        
-        # If no availability records, assume available (for simplicity)
-        # In production, you might want stricter rules
-        return True
+        # Check the car's calendar for booked hours
+        return calendar_engine.is_free(db, car_id, start_time, end_time)
     
     @staticmethod
     def create_booking_request(
@@ -85,21 +67,12 @@ class BookingEngine:
             raise ValueError("Your account is not eligible for bookings at this time.")
         
         # Check basic availability
-        car = db.query(Car).filter(Car.id == car_id, Car.is_active == True).first()
+        car = db.scalars(active_car(car_id)).first()
         if not car:
             raise ValueError("Car not found or not available.")
         
         # Check for confirmed bookings (hard block)
-        confirmed_conflict = (
-            db.query(Booking)
-            .filter(
-                Booking.car_id == car_id,
-                Booking.status == BookingStatus.CONFIRMED.value,
-                Booking.start_time < end_time,
-                Booking.end_time > start_time
-            )
-            .first()
-        )
+        confirmed_conflict = db.scalars(confirmed_overlap(car_id, start_time, end_time)).first()
         
         if confirmed_conflict:
             raise ValueError("Car is already booked for this time period.")
@@ -114,6 +87,8 @@ class BookingEngine:
             status=BookingStatus.PENDING.value
         )
         db.add(booking)
+        report_engine.booking_changed(db, booking, None)
+        outbox_engine.booking_changed(db, booking, None)
         db.commit()
         db.refresh(booking)
         
@@ -132,7 +107,7 @@ class BookingEngine:
             
             # Add all conflicting bookings to auction
             for conflict_booking in conflicts:
-                conflict_user = db.query(User).filter(User.id == conflict_booking.user_id).first()
+                conflict_user = db.scalars(user_by_id(conflict_booking.user_id)).first()
                 auction_engine.create_or_update_bid(db, auction, conflict_booking, conflict_user)
             
             # Add current booking to auction
@@ -162,8 +137,14 @@ class BookingEngine:
             # Apply trust penalty
             trust_engine.apply_cancellation_penalty(db, user)
         
+        if booking.status == BookingStatus.CONFIRMED.value:
+            calendar_engine.release_booked(db, booking)
+        
+        previous = booking.status
         booking.status = BookingStatus.CANCELLED.value
         booking.updated_at = datetime.utcnow()
+        report_engine.booking_changed(db, booking, previous)
+        outbox_engine.booking_changed(db, booking, previous)
         
         db.commit()
         db.refresh(booking)
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models import CarCalendar, Booking, Auction, BookingStatus, AuctionStatus
+from app.core.availability_calendar import AvailabilityCalendar, BOOKED, LOCKED
+
+
+class CalendarEngine:
+    """
+    Calendar Engine
+
+    Keeps each car's availability calendar (hourly booked/locked bitsets in
+    car_calendars) in step with booking and auction transitions:
+    - Booking confirmed: hours marked booked
+    - Confirmed booking cancelled: hours released
+    - Auction opened: hours locked
+    - Auction closed: lock released
+
+    Callers commit; every method only stages changes on the session.
+    """
+
+    @staticmethod
+    def _load(db: Session, car_id: UUID) -> CarCalendar:
+        """The car's calendar row, locked for update; created empty on the car's first write"""
+        # A locking read finds nothing to lock while the row is missing, so two
+        # first writers would both insert it; ON CONFLICT lets the second one
+        # wait for the first and then lock the row it created
+        db.execute(
+            insert(CarCalendar)
+            .values(car_id=car_id, booked=b"", locked=b"", base_slot=0)
+            .on_conflict_do_nothing(index_elements=[CarCalendar.car_id])
+        )
+        return (
+            db.query(CarCalendar)
+            .filter(CarCalendar.car_id == car_id)
+            .with_for_update()
+            .one()
+        )
+
+    @staticmethod
+    def _unpack(row: CarCalendar) -> AvailabilityCalendar:
+        return AvailabilityCalendar(
+            booked=AvailabilityCalendar.decode(row.booked),
+            locked=AvailabilityCalendar.decode(row.locked),
+            base=row.base_slot
+        )
+
+    @staticmethod
+    def _store(row: CarCalendar, calendar: AvailabilityCalendar) -> None:
+        """Write the calendar back, dropping hours past CALENDAR_RETENTION_DAYS"""
+        calendar.trim(datetime.utcnow() - timedelta(days=settings.CALENDAR_RETENTION_DAYS))
+        row.booked = AvailabilityCalendar.encode(calendar.booked)
+        row.locked = AvailabilityCalendar.encode(calendar.locked)
+        row.base_slot = calendar.base
+        row.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def mark_booked(db: Session, booking: Booking) -> None:
+        """Mark a confirmed booking's hours as booked"""
+        row = CalendarEngine._load(db, booking.car_id)
+        calendar = CalendarEngine._unpack(row)
+        calendar.mark(BOOKED, booking.start_time, booking.end_time)
+        CalendarEngine._store(row, calendar)
+
+    @staticmethod
+    def release_booked(db: Session, booking: Booking) -> None:
+        """Free a cancelled booking's hours, keeping any other confirmed booking's hold"""
+        row = CalendarEngine._load(db, booking.car_id)
+        calendar = CalendarEngine._unpack(row)
+        still_booked = (
+            db.query(Booking.start_time, Booking.end_time)
+            .filter(
+                Booking.car_id == booking.car_id,
+                Booking.id != booking.id,
+                Booking.status == BookingStatus.CONFIRMED.value,
+                Booking.start_time < booking.end_time,
+                Booking.end_time > booking.start_time
+            )
+            .all()
+        )
+        calendar.release(BOOKED, booking.start_time, booking.end_time, keep=still_booked)
+        CalendarEngine._store(row, calendar)
+
+    @staticmethod
+    def lock(db: Session, auction: Auction) -> None:
+        """Lock the auctioned period"""
+        row = CalendarEngine._load(db, auction.car_id)
+        calendar = CalendarEngine._unpack(row)
+        calendar.mark(LOCKED, auction.start_time, auction.end_time)
+        CalendarEngine._store(row, calendar)
+
+    @staticmethod
+    def unlock(db: Session, auction: Auction) -> None:
+        """Release a closed auction's lock, keeping other active auctions' locks"""
+        row = CalendarEngine._load(db, auction.car_id)
+        calendar = CalendarEngine._unpack(row)
+        still_locked = (
+            db.query(Auction.start_time, Auction.end_time)
+            .filter(
+                Auction.car_id == auction.car_id,
+                Auction.id != auction.id,
+                Auction.status == AuctionStatus.ACTIVE.value,
+                Auction.start_time < auction.end_time,
+                Auction.end_time > auction.start_time
+            )
+            .all()
+        )
+        calendar.release(LOCKED, auction.start_time, auction.end_time, keep=still_locked)
+        CalendarEngine._store(row, calendar)
+
+    @staticmethod
+    def is_free(db: Session, car_id: UUID, start_time: datetime, end_time: datetime) -> bool:
+        """True if no booked hour falls in the period"""
+        row = db.query(CarCalendar).filter(CarCalendar.car_id == car_id).first()
+        if row is None:
+            return True
+        return CalendarEngine._unpack(row).is_free(start_time, end_time)
+
+    @staticmethod
+    def get_ranges(
+        db: Session,
+        car_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+        status: Optional[str] = None
+    ) -> List[dict]:
+        """Calendar for the window as run-length encoded ranges"""
+        row = db.query(CarCalendar).filter(CarCalendar.car_id == car_id).first()
+        calendar = CalendarEngine._unpack(row) if row else AvailabilityCalendar()
+        return calendar.ranges(start_time, end_time, status)
+
+
+calendar_engine = CalendarEngine()
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore, Claimed
+from app.models import IdempotencyKey
+
+
+def _slot(user_id: UUID, route: str, key: str) -> tuple:
+    return IdempotencyKey.user_id == user_id, IdempotencyKey.route == route, IdempotencyKey.key == key
+
+
+class IdempotencyEngine:
+    """
+    Idempotency Engine
+
+    Keeps Idempotency-Key claims in idempotency_keys, whose primary key is
+    (user_id, route, key), so a retry that lands on another worker still
+    finds the first request's claim or response. Runs on the request's own
+    session and commits each step at once: the claim before the request's
+    work, the response after it.
+
+    A claim still without a response after IDEMPOTENCY_LEASE_SECONDS
+    (claimed_until) belonged to a request whose worker died; the next retry
+    takes it over instead of getting 409 until the key expires.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim_idempotency_key(self, user_id: UUID, route: str, key: str, fingerprint: str) -> Optional[Claimed]:
+        db = self.db
+        while True:
+            now = datetime.utcnow()
+            values = dict(
+                fingerprint=fingerprint,
+                claimed_until=now + timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS),
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+            )
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.expires_at <= now
+            ))
+            # Concurrent claims of one key: the loser waits for the winner's commit
+            created = db.execute(
+                insert(IdempotencyKey)
+                .values(user_id=user_id, route=route, key=key, **values)
+                .on_conflict_do_nothing(index_elements=[
+                    IdempotencyKey.user_id, IdempotencyKey.route, IdempotencyKey.key
+                ])
+                .returning(IdempotencyKey.key)
+            ).first()
+            if created is None:
+                created = db.execute(
+                    update(IdempotencyKey)
+                    .where(
+                        *_slot(user_id, route, key),
+                        IdempotencyKey.response.is_(None),
+                        IdempotencyKey.claimed_until <= now
+                    )
+                    .values(**values)
+                    .returning(IdempotencyKey.key)
+                ).first()
+            if created is not None:
+                db.commit()
+                return None
+            existing = db.execute(
+                select(IdempotencyKey.fingerprint, IdempotencyKey.response).where(*_slot(user_id, route, key))
+            ).first()
+            db.commit()
+            if existing is not None:
+                return existing.fingerprint, existing.response
+            # Abandoned between the insert and the select; claim it again
+
+    def finish_idempotency_key(self, user_id: UUID, route: str, key: str, body: bytes) -> None:
+        self.db.execute(update(IdempotencyKey).where(*_slot(user_id, route, key)).values(response=body))
+        self.db.commit()
+
+    def abandon_idempotency_key(self, user_id: UUID, route: str, key: str) -> None:
+        # The request failed; drop whatever it left in the transaction first
+        self.db.rollback()
+        self.db.execute(delete(IdempotencyKey).where(
+            *_slot(user_id, route, key), IdempotencyKey.response.is_(None)
+        ))
+        self.db.commit()
+
+
+def idempotency_store(db: Session) -> IdempotencyStore:
+    """Idempotency-Key handling on the request's session"""
+    return IdempotencyStore(IdempotencyEngine(db))
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models import OutboxEvent, Booking, Auction, Bid, Ride
+from app.core.fixed_point import to_paise
+from app.core.outbox import (
+    Event, EventSpec, booking_event, auction_opened_event, auction_closed_event, bid_event, ride_event
+)
+
+
+class OutboxEngine:
+    """
+    Outbox Engine
+
+    Stages an outbox_events row next to each booking, auction, bid and ride
+    transition, so the event commits or rolls back with the change itself.
+    Callers commit; the recording methods only stage rows on the session.
+
+    claim_events/ack_events are the dispatcher's source and run in their
+    own sessions.
+    """
+
+    @staticmethod
+    def record(db: Session, spec: EventSpec) -> None:
+        event_type, aggregate_id, payload = spec
+        db.add(OutboxEvent(event_type=event_type, aggregate_id=aggregate_id, payload=payload))
+
+    @staticmethod
+    def booking_changed(db: Session, booking: Booking, previous: Optional[str]) -> None:
+        if booking.id is None:
+            db.flush()
+        OutboxEngine.record(db, booking_event(
+            booking.id, booking.car_id, booking.user_id, previous, booking.status,
+            to_paise(booking.offer_price), booking.start_time, booking.end_time
+        ))
+
+    @staticmethod
+    def auction_opened(db: Session, auction: Auction) -> None:
+        if auction.id is None:
+            db.flush()
+        OutboxEngine.record(db, auction_opened_event(
+            auction.id, auction.car_id, auction.start_time, auction.end_time
+        ))
+
+    @staticmethod
+    def auction_closed(db: Session, auction: Auction) -> None:
+        OutboxEngine.record(db, auction_closed_event(auction.id, auction.car_id, auction.winner_id))
+
+    @staticmethod
+    def bid_placed(db: Session, bid: Bid) -> None:
+        if bid.id is None:
+            db.flush()
+        OutboxEngine.record(db, bid_event(
+            bid.id, bid.auction_id, bid.user_id, bid.booking_id, to_paise(bid.offer_price)
+        ))
+
+    @staticmethod
+    def ride_changed(db: Session, ride: Ride, previous: Optional[str]) -> None:
+        if ride.id is None:
+            db.flush()
+        OutboxEngine.record(db, ride_event(ride.id, ride.booking_id, previous, ride.status))
+
+    # ============ Dispatcher source ============
+
+    @staticmethod
+    def claim_events(limit: int, lease_seconds: float) -> List[Event]:
+        """Lease the oldest undelivered events; SKIP LOCKED lets several dispatchers run"""
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            rows = (
+                db.query(OutboxEvent)
+                .filter(
+                    OutboxEvent.dispatched_at.is_(None),
+                    or_(OutboxEvent.claimed_until.is_(None), OutboxEvent.claimed_until < now)
+                )
+                .order_by(OutboxEvent.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            events = []
+            for row in rows:
+                row.claimed_until = now + timedelta(seconds=lease_seconds)
+                row.attempts += 1
+                events.append(Event(
+                    row.id, row.event_type, row.aggregate_id, row.payload, row.created_at, row.attempts
+                ))
+            db.commit()
+        return events
+
+    @staticmethod
+    def ack_events(event_ids: List[int]) -> None:
+        if not event_ids:
+            return
+        with SessionLocal() as db:
+            db.query(OutboxEvent).filter(OutboxEvent.id.in_(event_ids)).update(
+                {OutboxEvent.dispatched_at: datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+
+
+outbox_engine = OutboxEngine()
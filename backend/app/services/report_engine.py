@@ -0,0 +1,124 @@
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models import CarDailyStat, Booking, Auction, Ride
+from app.core.fixed_point import to_paise, paise_to_decimal
+from app.core.reporting import (
+    METRICS, REVENUE, Delta, booking_deltas, auction_deltas, ride_deltas, day_index, day_date
+)
+
+
+class ReportEngine:
+    """
+    Report Engine
+
+    Keeps car_daily_stats in step with booking, auction and ride transitions
+    so /admin/reports reads pre-aggregated rows instead of scanning bookings.
+    Each transition is one upsert adding its deltas to one row per affected day.
+
+    Callers commit; every method only stages changes on the session.
+    """
+
+    @staticmethod
+    def _apply(db: Session, car_id: UUID, deltas: Iterable[Delta]) -> None:
+        by_day: Dict[int, List[int]] = {}
+        for day, metric, amount in deltas:
+            by_day.setdefault(day, [0] * len(METRICS))[metric] += amount
+        if not by_day:
+            return
+
+        rows = [
+            {
+                "car_id": car_id,
+                "day": day_date(day),
+                **{
+                    name: paise_to_decimal(vector[metric]) if metric == REVENUE else vector[metric]
+                    for metric, name in enumerate(METRICS)
+                },
+            }
+            # Day order, so concurrent transitions take row locks in the same order
+            for day, vector in sorted(by_day.items())
+        ]
+        # One upsert adding the deltas in place: a missing day is created by
+        # whichever transition gets there first, and nothing is read back
+        statement = insert(CarDailyStat).values(rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[CarDailyStat.car_id, CarDailyStat.day],
+            set_={
+                **{
+                    name: getattr(CarDailyStat, name) + getattr(statement.excluded, name)
+                    for name in METRICS
+                },
+                "updated_at": datetime.utcnow(),
+            }
+        ))
+
+    @staticmethod
+    def booking_changed(db: Session, booking: Booking, previous: Optional[str]) -> None:
+        """Record a booking's move from `previous` (None when just created) to its current status"""
+        ReportEngine._apply(db, booking.car_id, booking_deltas(
+            booking.start_time, booking.end_time, to_paise(booking.offer_price),
+            previous, booking.status
+        ))
+
+    @staticmethod
+    def auction_opened(db: Session, auction: Auction) -> None:
+        ReportEngine._apply(db, auction.car_id, auction_deltas(auction.start_time))
+
+    @staticmethod
+    def ride_completed(db: Session, ride: Ride) -> None:
+        ReportEngine._apply(db, ride.booking.car_id, ride_deltas(ride.ended_at))
+
+    # ============ Reads ============
+
+    @staticmethod
+    def _vector(row) -> List[int]:
+        return [
+            to_paise(value or 0) if metric == REVENUE else int(value or 0)
+            for metric, value in enumerate(row)
+        ]
+
+    @staticmethod
+    def _sums():
+        return [func.sum(getattr(CarDailyStat, name)) for name in METRICS]
+
+    @staticmethod
+    def fleet_totals(db: Session, start: date, end: date) -> List[int]:
+        row = (
+            db.query(*ReportEngine._sums())
+            .filter(CarDailyStat.day >= start, CarDailyStat.day <= end)
+            .one()
+        )
+        return ReportEngine._vector(row)
+
+    @staticmethod
+    def car_totals(db: Session, start: date, end: date) -> Dict[UUID, List[int]]:
+        rows = (
+            db.query(CarDailyStat.car_id, *ReportEngine._sums())
+            .filter(CarDailyStat.day >= start, CarDailyStat.day <= end)
+            .group_by(CarDailyStat.car_id)
+            .all()
+        )
+        return {row[0]: ReportEngine._vector(row[1:]) for row in rows}
+
+    @staticmethod
+    def daily(
+        db: Session,
+        start: date,
+        end: date,
+        car_id: Optional[UUID] = None
+    ) -> List[Tuple[int, List[int]]]:
+        query = (
+            db.query(CarDailyStat.day, *ReportEngine._sums())
+            .filter(CarDailyStat.day >= start, CarDailyStat.day <= end)
+        )
+        if car_id:
+            query = query.filter(CarDailyStat.car_id == car_id)
+        rows = query.group_by(CarDailyStat.day).order_by(CarDailyStat.day).all()
+        return [(day_index(row[0]), ReportEngine._vector(row[1:])) for row in rows]
+
+
+report_engine = ReportEngine()
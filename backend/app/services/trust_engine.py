@@ -1,8 +1,18 @@
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import User, Rating, Ride
-from app.core.config import settings
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func, select, update, case
+from app.models import User, Rating, Ride, Booking
+from app.core.fixed_point import to_centi, centi_to_decimal
+from app.core.scoring import (
+    trust_score, running_average, TRUST_THRESHOLD, AUTO_REJECT_THRESHOLD, AUTO_BLOCK_THRESHOLD,
+    LATE_CANCEL_PENALTY
+)
+from app.core.trust_history import REASON_RATING, REASON_LATE_CANCEL, REASON_RECOMPUTE
+from app.services.trust_history_engine import trust_history_engine
+
+# The auto-block threshold as the SQL-side score value
+AUTO_BLOCK_SCORE = centi_to_decimal(AUTO_BLOCK_THRESHOLD)
 
 
 class TrustEngine:
@@ -18,64 +28,85 @@ class TrustEngine:
     Formula:
     trust_score = (avg_rating × 20) + (total_rides × 0.5) 
                   - (damage_count × 15) - (rash_count × 10)
+    
+    Arithmetic runs on integer centipoints (app.core.scoring); Decimal is
+    only used on the ORM columns. recalculate_user_trust evaluates the same
+    formula in SQL, on exact numerics.
     """
     
     @staticmethod
     def calculate_trust_score(
-        avg_rating: float,
+        avg_rating: Decimal,
         total_rides: int,
         damage_count: int,
         rash_count: int
     ) -> Decimal:
         """Calculate trust score from components"""
-        score = (
-            (avg_rating * 20) +
-            (total_rides * 0.5) -
-            (damage_count * 15) -
-            (rash_count * 10)
+        return centi_to_decimal(
+            trust_score(to_centi(avg_rating), total_rides, damage_count, rash_count)
         )
-        return Decimal(str(max(score, 0)))
     
     @staticmethod
     def recalculate_user_trust(db: Session, user: User) -> User:
         """
         Recalculate user's trust score from their ride history
+        
+        One UPDATE ... FROM (aggregate over the user's ratings): counts, the
+        average and the incident sums are computed by the database and
+        written, with the trust score and auto-block, in the same statement.
+        With no ratings the stored stats are kept and only the score is
+        recomputed from them.
         """
-        # Get all ratings for this user's rides
-        ratings = (
-            db.query(Rating)
-            .join(Ride)
-            .join(Ride.booking)
-            .filter(Ride.booking.has(user_id=user.id))
-            .all()
-        )
+        previous_score = user.trust_score
         
-        if ratings:
-            # Calculate average rating
-            total_rating = sum(r.driving_rating for r in ratings)
-            avg_rating = total_rating / len(ratings)
-            
-            # Count incidents
-            damage_count = sum(1 for r in ratings if r.damage_flag)
-            rash_count = sum(1 for r in ratings if r.rash_flag)
-            
-            # Update user stats
-            user.total_rides = len(ratings)
-            user.avg_rating = Decimal(str(round(avg_rating, 2)))
-            user.damage_count = damage_count
-            user.rash_count = rash_count
+        stats = (
+            select(
+                func.count(Rating.id).label("rides"),
+                func.round(func.avg(Rating.driving_rating), 2).label("avg_rating"),
+                func.sum(case((Rating.damage_flag == True, 1), else_=0)).label("damage_count"),
+                func.sum(case((Rating.rash_flag == True, 1), else_=0)).label("rash_count"),
+            )
+            .join(Ride, Rating.ride_id == Ride.id)
+            .join(Booking, Ride.booking_id == Booking.id)
+            .where(Booking.user_id == user.id)
+            .subquery()
+        )
+        rated = stats.c.rides > 0
+        total_rides = case((rated, stats.c.rides), else_=User.total_rides)
+        avg_rating = case((rated, stats.c.avg_rating), else_=User.avg_rating)
+        damage_count = case((rated, stats.c.damage_count), else_=User.damage_count)
+        rash_count = case((rated, stats.c.rash_count), else_=User.rash_count)
         
-        # Calculate new trust score
-        user.trust_score = TrustEngine.calculate_trust_score(
-            float(user.avg_rating),
-            user.total_rides,
-            user.damage_count,
-            user.rash_count
+        # scoring.trust_score, on the new values (SET expressions only see the old row)
+        trust_score = func.greatest(
+            avg_rating * 20 + total_rides * Decimal("0.5") - damage_count * 15 - rash_count * 10,
+            0
         )
         
-        # Auto-block if below threshold
-        if float(user.trust_score) < settings.AUTO_BLOCK_THRESHOLD:
-            user.is_blocked = True
+        row = db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(
+                total_rides=total_rides,
+                avg_rating=avg_rating,
+                damage_count=damage_count,
+                rash_count=rash_count,
+                trust_score=trust_score,
+                # Auto-block if below threshold
+                is_blocked=case(
+                    (trust_score < AUTO_BLOCK_SCORE, True), else_=User.is_blocked
+                ),
+            )
+            .returning(
+                User.total_rides, User.avg_rating, User.damage_count,
+                User.rash_count, User.trust_score, User.is_blocked
+            ),
+            execution_options={"synchronize_session": False}
+        ).one()
+        for key, value in row._mapping.items():
+            set_committed_value(user, key, value)
+        
+        trust_history_engine.record(db, user, previous_score, REASON_RECOMPUTE)
         
         db.commit()
         db.refresh(user)
@@ -86,13 +117,15 @@ class TrustEngine:
         """
         Quick update after a new rating is added
         """
+        previous_score = user.trust_score
+        
         # Increment ride count
         user.total_rides += 1
         
         # Update average rating incrementally
-        old_avg = float(user.avg_rating)
-        new_avg = ((old_avg * (user.total_rides - 1)) + rating.driving_rating) / user.total_rides
-        user.avg_rating = Decimal(str(round(new_avg, 2)))
+        user.avg_rating = centi_to_decimal(running_average(
+            to_centi(user.avg_rating), user.total_rides, rating.driving_rating
+        ))
         
         # Update incident counts
         if rating.damage_flag:
@@ -102,14 +135,16 @@ class TrustEngine:
         
         # Recalculate trust score
         user.trust_score = TrustEngine.calculate_trust_score(
-            float(user.avg_rating),
+            user.avg_rating,
             user.total_rides,
             user.damage_count,
             user.rash_count
         )
         
+        trust_history_engine.record(db, user, previous_score, REASON_RATING)
+        
         # Auto-block check
-        if float(user.trust_score) < settings.AUTO_BLOCK_THRESHOLD:
+        if to_centi(user.trust_score) < AUTO_BLOCK_THRESHOLD:
             user.is_blocked = True
         
         db.commit()
@@ -119,9 +154,11 @@ class TrustEngine:
     @staticmethod
     def apply_cancellation_penalty(db: Session, user: User) -> User:
         """Apply trust penalty for late cancellation"""
-        current_score = float(user.trust_score)
-        new_score = max(0, current_score - settings.LATE_CANCEL_PENALTY)
-        user.trust_score = Decimal(str(new_score))
+        previous_score = user.trust_score
+        new_score = max(0, to_centi(previous_score) - LATE_CANCEL_PENALTY)
+        user.trust_score = centi_to_decimal(new_score)
+        
+        trust_history_engine.record(db, user, previous_score, REASON_LATE_CANCEL)
         
         db.commit()
         db.refresh(user)
@@ -132,13 +169,13 @@ class TrustEngine:
         """Check if user should be auto-rejected"""
         return (
             user.is_blocked or 
-            float(user.trust_score) < settings.AUTO_REJECT_THRESHOLD
+            to_centi(user.trust_score) < AUTO_REJECT_THRESHOLD
         )
     
     @staticmethod
     def is_auction_eligible(user: User) -> bool:
         """Check if user is eligible for trust-based auction scoring"""
-        return float(user.trust_score) >= settings.TRUST_THRESHOLD
+        return to_centi(user.trust_score) >= TRUST_THRESHOLD
 
 
 trust_engine = TrustEngine()
@@ -0,0 +1,110 @@
+from datetime import datetime
+from decimal import Decimal
+from functools import partial
+from typing import Iterator, Optional
+from uuid import UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models import User, TrustChunk
+from app.core.fixed_point import to_centi
+from app.core.trust_history import (
+    TrustHistoryChunk, Event, CHUNK_SIZE, REASON_CODES, to_timestamp, window_events
+)
+
+
+class TrustHistoryEngine:
+    """
+    Trust History Engine
+
+    Appends every trust score change to the user's newest trust_history_chunks
+    row. The open chunk is stored as uncompressed fixed-width records, so an
+    append adds one record to one row however long the history grows; a
+    chunk is compressed once, when its CHUNK_SIZE-th event seals it, and the
+    next change starts a new one.
+
+    Callers commit; record() only stages changes on the session.
+    """
+
+    @staticmethod
+    def record(db: Session, user: User, previous_score: Decimal, reason: str) -> None:
+        """Append the change from previous_score to user.trust_score, if any"""
+        delta = to_centi(user.trust_score) - to_centi(previous_score)
+        if not delta:
+            return
+
+        timestamp = to_timestamp(datetime.utcnow())
+        reason_code = REASON_CODES[reason]
+        while True:
+            row = (
+                db.query(TrustChunk)
+                .filter(TrustChunk.user_id == user.id)
+                .order_by(TrustChunk.seq.desc())
+                .with_for_update()
+                .first()
+            )
+            if row is not None and not row.sealed:
+                TrustHistoryEngine._append(row, timestamp, delta, reason_code)
+                break
+
+            if row is not None:
+                timestamp = max(timestamp, row.last_ts)
+            chunk = TrustHistoryChunk(to_centi(previous_score), timestamp)
+            chunk.append(timestamp, delta, reason_code)
+            # Two first writers (or two writers past a sealed chunk) both see
+            # no open chunk; the loser waits for the winner, then appends to it
+            created = db.execute(
+                insert(TrustChunk)
+                .values(
+                    user_id=user.id,
+                    seq=row.seq + 1 if row else 0,
+                    first_ts=chunk.first_ts,
+                    last_ts=chunk.last_ts,
+                    event_count=1,
+                    sealed=False,
+                    data=chunk.encode_open()
+                )
+                .on_conflict_do_nothing(index_elements=[TrustChunk.user_id, TrustChunk.seq])
+                .returning(TrustChunk.id)
+            ).first()
+            if created is not None:
+                break
+
+        # Sessions don't autoflush; write the append before the next one reads the row
+        db.flush()
+
+    @staticmethod
+    def _append(row: TrustChunk, timestamp: int, delta: int, reason_code: int) -> None:
+        # Out-of-order clocks are clamped so offsets stay non-decreasing
+        timestamp = max(timestamp, row.last_ts)
+        row.data = row.data + TrustHistoryChunk.open_record(row.first_ts, timestamp, delta, reason_code)
+        row.last_ts = timestamp
+        row.event_count += 1
+        if row.event_count >= CHUNK_SIZE:
+            row.data = TrustHistoryChunk.decode_open(row.data).encode()
+            row.sealed = True
+
+    @staticmethod
+    def get_events(
+        db: Session,
+        user_id: UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[Event]:
+        """Events in [start, end); chunks outside the window are not fetched"""
+        query = db.query(TrustChunk).filter(TrustChunk.user_id == user_id)
+        if start:
+            query = query.filter(TrustChunk.last_ts >= to_timestamp(start))
+        if end:
+            query = query.filter(TrustChunk.first_ts < to_timestamp(end))
+
+        chunks = [
+            (
+                (row.first_ts, row.last_ts),
+                partial(TrustHistoryChunk.decode if row.sealed else TrustHistoryChunk.decode_open, row.data)
+            )
+            for row in query.order_by(TrustChunk.seq).all()
+        ]
+        return window_events(chunks, start, end)
+
+
+trust_history_engine = TrustHistoryEngine()
@@ -0,0 +1,89 @@
+"""
+Index check for the booking/auction hot queries
+
+    cd backend && alembic upgrade head && python -m benchmarks.explain_indexes
+
+EXPLAINs each hot query against DATABASE_URL with sequential scans
+disabled, so the planner picks an index whenever one can serve the query
+(even on a small or empty database), and checks it picked the expected
+one. Exits non-zero if any query falls back to a scan without an index.
+tests/test_explain_indexes.py runs the same checks under pytest.
+"""
+import sys
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+from uuid import uuid4
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models import Booking, Auction, Bid, Availability, AuctionStatus, AvailabilityStatus
+from app.models import statements
+
+
+def hot_queries() -> List[Tuple[str, object, Tuple[str, ...]]]:
+    """(label, statement, acceptable indexes)"""
+    user_id, car_id, auction_id, booking_id = uuid4(), uuid4(), uuid4(), uuid4()
+    start = datetime(2030, 1, 1)
+    end = start + timedelta(days=2)
+    return [
+        ("user by id (deps)", statements.user_by_id(user_id), ("users_pkey",)),
+        ("open conflicts", statements.open_overlaps(car_id, start, end, booking_id),
+         ("ix_bookings_open", "ix_bookings_occupancy")),
+        ("confirmed conflict", statements.confirmed_overlap(car_id, start, end), ("ix_bookings_occupancy",)),
+        ("my bookings", select(Booking).where(Booking.user_id == user_id).order_by(Booking.created_at.desc()),
+         ("ix_bookings_user_created",)),
+        ("active auction overlap", statements.active_auction_overlap(car_id, start, end), ("ix_auctions_active",)),
+        ("car auctions by status",
+         select(Auction).where(Auction.car_id == car_id, Auction.status == AuctionStatus.CLOSED.value),
+         ("ix_auctions_car_status",)),
+        ("auction bids", select(Bid).where(Bid.auction_id == auction_id), ("unique_user_auction_bid",)),
+        ("user bids", select(Bid).where(Bid.user_id == user_id), ("ix_bids_user_id",)),
+        ("booking bid", select(Bid).where(Bid.booking_id == booking_id), ("ix_bids_booking_id",)),
+        ("car availability",
+         select(Availability).where(
+             Availability.car_id == car_id, Availability.status == AvailabilityStatus.AVAILABLE.value
+         ),
+         ("ix_availability_car_status",)),
+    ]
+
+
+def _index_names(plan: dict) -> Iterator[str]:
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", ()):
+        yield from _index_names(child)
+
+
+def explain(db: Session, stmt) -> dict:
+    # Literal values, as psycopg2 interpolates them client side: a partial
+    # index only qualifies when the planner can see the status values
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    row = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled)).scalar()
+    return row[0]["Plan"]
+
+
+def disable_seqscan(db: Session) -> None:
+    """For the rest of the session's transaction"""
+    db.connection().exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+
+def used_indexes(db: Session, stmt) -> List[str]:
+    return sorted(set(_index_names(explain(db, stmt))))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    failures = 0
+    with SessionLocal() as db:
+        disable_seqscan(db)
+        for label, stmt, expected in hot_queries():
+            used = used_indexes(db, stmt)
+            ok = any(name in used for name in expected)
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {label:<24} uses {', '.join(used) or 'no index'}"
+                  + ("" if ok else f" (expected {' or '.join(expected)})"))
+        db.rollback()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
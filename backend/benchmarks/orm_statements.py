@@ -0,0 +1,119 @@
+"""
+Per-call cost of the hot ORM lookups: query chains vs cached statements
+
+    cd backend && python -m benchmarks.orm_statements --calls 20000
+
+Runs each lookup against DATABASE_URL in one session, with ids that match
+no rows, so the database does next to no work:
+  - "query": db.query(...).filter(...) as deps.py, AuctionEngine and
+    BookingEngine built it before, a new expression on every call
+  - "lambda": the app.models.statements lambda statements now used there
+CPU time is this process only (statement construction, compiled-cache
+lookup, parameter binding, result handling), i.e. the per-request Python
+overhead; wall time adds the round trip.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from uuid import uuid4
+from app.core.database import SessionLocal
+from app.models import User, Car, Booking, Auction, BookingStatus, AuctionStatus
+from app.models import statements
+
+
+def _query_forms(db) -> dict:
+    def user_by_id(user_id, car_id, start, end):
+        return db.query(User).filter(User.id == user_id).first()
+
+    def active_car(user_id, car_id, start, end):
+        return db.query(Car).filter(Car.id == car_id, Car.is_active == True).first()
+
+    def confirmed_overlap(user_id, car_id, start, end):
+        return db.query(Booking).filter(
+            Booking.car_id == car_id,
+            Booking.status == BookingStatus.CONFIRMED.value,
+            Booking.start_time < end,
+            Booking.end_time > start
+        ).first()
+
+    def open_overlaps(user_id, car_id, start, end):
+        return db.query(Booking).filter(
+            Booking.car_id == car_id,
+            Booking.status.in_([BookingStatus.PENDING.value, BookingStatus.COMPETING.value]),
+            Booking.start_time < end,
+            Booking.end_time > start
+        ).filter(Booking.id != user_id).all()
+
+    def active_auction_overlap(user_id, car_id, start, end):
+        return db.query(Auction).filter(
+            Auction.car_id == car_id,
+            Auction.status == AuctionStatus.ACTIVE.value,
+            Auction.start_time < end,
+            Auction.end_time > start
+        ).first()
+
+    return {
+        "user_by_id": user_by_id, "active_car": active_car, "confirmed_overlap": confirmed_overlap,
+        "open_overlaps": open_overlaps, "active_auction_overlap": active_auction_overlap,
+    }
+
+
+def _lambda_forms(db) -> dict:
+    def user_by_id(user_id, car_id, start, end):
+        return db.scalars(statements.user_by_id(user_id)).first()
+
+    def active_car(user_id, car_id, start, end):
+        return db.scalars(statements.active_car(car_id)).first()
+
+    def confirmed_overlap(user_id, car_id, start, end):
+        return db.scalars(statements.confirmed_overlap(car_id, start, end)).first()
+
+    def open_overlaps(user_id, car_id, start, end):
+        return db.scalars(statements.open_overlaps(car_id, start, end, user_id)).all()
+
+    def active_auction_overlap(user_id, car_id, start, end):
+        return db.scalars(statements.active_auction_overlap(car_id, start, end)).first()
+
+    return {
+        "user_by_id": user_by_id, "active_car": active_car, "confirmed_overlap": confirmed_overlap,
+        "open_overlaps": open_overlaps, "active_auction_overlap": active_auction_overlap,
+    }
+
+
+def _measure(lookup: Callable, args: List[tuple]) -> tuple:
+    for call in args[:100]:  # warm the compiled cache
+        lookup(*call)
+    cpu, wall = time.process_time(), time.perf_counter()
+    for call in args:
+        lookup(*call)
+    count = len(args)
+    return 1e6 * (time.process_time() - cpu) / count, 1e6 * (time.perf_counter() - wall) / count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    epoch = datetime(2030, 1, 1)
+    calls = [
+        (uuid4(), uuid4(), epoch + timedelta(hours=i % 1000), epoch + timedelta(hours=i % 1000 + 48))
+        for i in range(args.calls)
+    ]
+
+    print(f"{args.calls:,} calls per lookup; microseconds per call (CPU / wall)")
+    print(f"{'lookup':<24} {'query':>17} {'lambda':>17} {'CPU saved':>10}")
+    with SessionLocal() as db:
+        query_forms, lambda_forms = _query_forms(db), _lambda_forms(db)
+        for name, query_form in query_forms.items():
+            query_cpu, query_wall = _measure(query_form, calls)
+            lambda_cpu, lambda_wall = _measure(lambda_forms[name], calls)
+            print(
+                f"{name:<24} {query_cpu:7.1f} / {query_wall:7.1f} {lambda_cpu:7.1f} / {lambda_wall:7.1f}"
+                f" {100 * (query_cpu - lambda_cpu) / query_cpu:9.1f}%"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+In-memory store record footprint
+
+    cd backend && python -m benchmarks.store_memory --bookings 1000000
+
+Builds the same bookings twice and reports traced allocations:
+  - "dict records": the previous layout, a plain dataclass with a
+    per-instance __dict__, its own UUID copies of user_id/car_id and its
+    own status string (as parsed from a request body or the store protocol)
+  - "slotted records": mock_store.Booking as the store keeps it, slotted,
+    with an interned status and foreign keys shared with the user/car records
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from uuid import UUID, uuid4
+from app.core.mock_store import InMemoryStore, Booking
+
+STATUSES = [b"pending", b"competing", b"confirmed", b"rejected", b"cancelled", b"completed"]
+
+
+@dataclass
+class DictBooking:
+    id: UUID
+    user_id: UUID
+    car_id: UUID
+    start_time: datetime
+    end_time: datetime
+    offer_price: int
+    status: str = "pending"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+
+def _rows(count: int, users: List[UUID], cars: List[UUID]):
+    """Field values as they reach the store: ids and statuses freshly parsed per booking"""
+    rng = random.Random(42)
+    epoch = datetime(2030, 1, 1)
+    for _ in range(count):
+        start = epoch + timedelta(hours=rng.randrange(24 * 365))
+        yield (
+            uuid4(),
+            UUID(str(rng.choice(users))),
+            UUID(str(rng.choice(cars))),
+            start,
+            start + timedelta(hours=rng.randrange(1, 72)),
+            rng.randrange(100_000, 1_000_000),
+            rng.choice(STATUSES).decode(),
+        )
+
+
+def _measure(label: str, build: Callable[[], list], count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    records = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<18} {size / 2**20:9.1f} MiB  {size / count:7.1f} B/booking")
+    del records
+    return size
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--cars", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    user_records = {uid: type("U", (), {"id": uid})() for uid in (uuid4() for _ in range(args.users))}
+    car_records = {cid: type("C", (), {"id": cid})() for cid in (uuid4() for _ in range(args.cars))}
+    users, cars = list(user_records), list(car_records)
+
+    def dict_records():
+        return [DictBooking(*row) for row in _rows(args.bookings, users, cars)]
+
+    def slotted_records():
+        records = []
+        for row in _rows(args.bookings, users, cars):
+            booking = Booking(*row)
+            InMemoryStore._share_ids(booking, user_id=user_records, car_id=car_records)
+            records.append(booking)
+        return records
+
+    print(f"{args.bookings:,} bookings over {args.users:,} users and {args.cars:,} cars")
+    before = _measure("dict records", dict_records, args.bookings)
+    after = _measure("slotted records", slotted_records, args.bookings)
+    print(f"{'reduction':<18} {(before - after) / 2**20:9.1f} MiB  {100 * (before - after) / before:6.1f} %")
+
+
+if __name__ == "__main__":
+    main()
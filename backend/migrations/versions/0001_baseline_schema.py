@@ -0,0 +1,148 @@
+"""baseline schema
+
+The original schema: users, cars, availability, bookings, auctions, bids,
+rides and ratings. Databases created from it before migrations were
+introduced already have it: `alembic stamp 0001`, then upgrade.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 03:38:49.836141
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cars',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('number_plate', sa.String(length=20), nullable=False),
+    sa.Column('daily_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('deposit', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('seats', sa.Integer(), nullable=True),
+    sa.Column('transmission', sa.String(length=20), nullable=True),
+    sa.Column('fuel_type', sa.String(length=20), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('number_plate')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=True),
+    sa.Column('total_rides', sa.Integer(), nullable=True),
+    sa.Column('avg_rating', sa.Numeric(precision=3, scale=2), nullable=True),
+    sa.Column('damage_count', sa.Integer(), nullable=True),
+    sa.Column('rash_count', sa.Integer(), nullable=True),
+    sa.Column('trust_score', sa.Numeric(precision=6, scale=2), nullable=True),
+    sa.Column('is_blocked', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_table('auctions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('car_id', sa.UUID(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('auction_start', sa.DateTime(), nullable=True),
+    sa.Column('auction_end', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('winner_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['car_id'], ['cars.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['winner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('availability',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('car_id', sa.UUID(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['car_id'], ['cars.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('bookings',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('car_id', sa.UUID(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('offer_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['car_id'], ['cars.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('bids',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('auction_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('booking_id', sa.UUID(), nullable=False),
+    sa.Column('offer_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('trust_score_snapshot', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('final_score', sa.Numeric(precision=6, scale=2), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['auction_id'], ['auctions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('auction_id', 'user_id', name='unique_user_auction_bid')
+    )
+    op.create_table('rides',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('booking_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('ended_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('booking_id')
+    )
+    op.create_table('ratings',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('ride_id', sa.UUID(), nullable=False),
+    sa.Column('driving_rating', sa.Integer(), nullable=False),
+    sa.Column('damage_flag', sa.Boolean(), nullable=True),
+    sa.Column('rash_flag', sa.Boolean(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.CheckConstraint('driving_rating >= 1 AND driving_rating <= 5', name='rating_range_check'),
+    sa.ForeignKeyConstraint(['ride_id'], ['rides.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ride_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ratings')
+    op.drop_table('rides')
+    op.drop_table('bids')
+    op.drop_table('bookings')
+    op.drop_table('availability')
+    op.drop_table('auctions')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_table('cars')
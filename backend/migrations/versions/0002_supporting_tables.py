@@ -0,0 +1,127 @@
+"""supporting tables
+
+Tables, columns and indexes added on top of the baseline schema:
+car_calendars, car_daily_stats, trust_history_chunks, outbox_events,
+archive_segments/archived_records, the cars.search_vector column, and the
+catalog, leaderboard and occupancy indexes. Indexes on the baseline tables
+are built CONCURRENTLY, outside the migration transaction, so existing
+databases stay writable while they build.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 05:12:37.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(model, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.create_table('car_calendars',
+    sa.Column('car_id', sa.UUID(), nullable=False),
+    sa.Column('booked', sa.LargeBinary(), nullable=False),
+    sa.Column('locked', sa.LargeBinary(), nullable=False),
+    sa.Column('base_slot', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['car_id'], ['cars.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('car_id')
+    )
+    op.create_table('car_daily_stats',
+    sa.Column('car_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('requests', sa.Integer(), nullable=False),
+    sa.Column('conflicts', sa.Integer(), nullable=False),
+    sa.Column('auctions', sa.Integer(), nullable=False),
+    sa.Column('confirmed', sa.Integer(), nullable=False),
+    sa.Column('booked_minutes', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('rides_completed', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['car_id'], ['cars.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('car_id', 'day')
+    )
+    op.create_index('ix_car_daily_stats_day', 'car_daily_stats', ['day'], unique=False)
+    op.create_table('trust_history_chunks',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('first_ts', sa.BigInteger(), nullable=False),
+    sa.Column('last_ts', sa.BigInteger(), nullable=False),
+    sa.Column('event_count', sa.Integer(), nullable=False),
+    sa.Column('sealed', sa.Boolean(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'seq', name='uq_trust_history_chunks_user_seq')
+    )
+    op.create_table('outbox_events',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('aggregate_id', sa.UUID(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('claimed_until', sa.DateTime(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('dispatched_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_events_pending', 'outbox_events', ['id'], unique=False, postgresql_where=sa.text('dispatched_at IS NULL'))
+    op.create_table('archive_segments',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('record_count', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('archived_records',
+    sa.Column('record_id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('segment_id', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['segment_id'], ['archive_segments.id'], ),
+    sa.PrimaryKeyConstraint('record_id')
+    )
+    op.create_index('ix_archived_records_kind', 'archived_records', ['kind', 'status', 'created_at'], unique=False)
+    op.add_column('cars', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_cars_active_price', 'cars', ['is_active', 'daily_price', 'id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_cars_search_vector', 'cars', ['search_vector'], unique=False, if_not_exists=True, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_users_leaderboard', 'users', ['role', 'is_blocked', sa.text('trust_score DESC')], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_bookings_occupancy', 'bookings', ['car_id', 'status', 'start_time', 'end_time'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_bookings_occupancy', table_name='bookings', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_leaderboard', table_name='users', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_cars_search_vector', table_name='cars', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_cars_active_price', table_name='cars', if_exists=True, postgresql_concurrently=True)
+
+    op.drop_column('cars', 'search_vector')
+    op.drop_index('ix_archived_records_kind', table_name='archived_records')
+    op.drop_table('archived_records')
+    op.drop_table('archive_segments')
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events', postgresql_where=sa.text('dispatched_at IS NULL'))
+    op.drop_table('outbox_events')
+    op.drop_table('trust_history_chunks')
+    op.drop_index('ix_car_daily_stats_day', table_name='car_daily_stats')
+    op.drop_table('car_daily_stats')
+    op.drop_table('car_calendars')
@@ -0,0 +1,51 @@
+"""hot path indexes
+
+Composite and partial indexes for the booking/auction queries; see
+tests/test_explain_indexes.py for the check that each query uses one.
+Built CONCURRENTLY, outside the migration transaction, so bookings and
+bids stay writable while they build.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 03:52:10.412907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_bookings_open', 'bookings', ['car_id', 'start_time', 'end_time'], "status IN ('pending', 'competing')"),
+    ('ix_bookings_user_created', 'bookings', ['user_id', 'created_at'], None),
+    ('ix_auctions_car_status', 'auctions', ['car_id', 'status'], None),
+    ('ix_auctions_active', 'auctions', ['car_id', 'start_time', 'end_time'], "status = 'active'"),
+    ('ix_bids_user_id', 'bids', ['user_id'], None),
+    ('ix_bids_booking_id', 'bids', ['booking_id'], None),
+    ('ix_availability_car_status', 'availability', ['car_id', 'status'], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
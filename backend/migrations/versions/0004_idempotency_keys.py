@@ -0,0 +1,38 @@
+"""idempotency keys
+
+Idempotency-Key claims and stored responses, shared by every worker.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 06:24:51.318064
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('idempotency_keys',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('route', sa.String(length=100), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('fingerprint', sa.String(length=32), nullable=False),
+    sa.Column('response', sa.LargeBinary(), nullable=True),
+    sa.Column('claimed_until', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'route', 'key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,57 @@
+import contextlib
+import io
+import pytest
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateColumn
+from app.core.database import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+
+# SQLite stand-ins for the Postgres-only DDL, so engine tests run without a server
+
+@compiles(UUID, "sqlite")
+def _uuid(type_, compiler, **kw):
+    return "CHAR(36)"
+
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector(type_, compiler, **kw):
+    return "TEXT"
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint(type_, compiler, **kw):
+    # Only INTEGER PRIMARY KEY autoincrements in SQLite
+    return "INTEGER"
+
+
+@compiles(CreateColumn, "sqlite")
+def _create_column(element, compiler, **kw):
+    if element.element.name == "search_vector":
+        return "search_vector TEXT"
+    return compiler.visit_create_column(element, **kw)
+
+
+@pytest.fixture
+def sqlite_session():
+    """A session on a fresh in-memory SQLite database with every table"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def memory_store():
+    """A fresh seeded InMemoryStore"""
+    from app.core.mock_store import InMemoryStore
+    with contextlib.redirect_stdout(io.StringIO()):
+        return InMemoryStore()
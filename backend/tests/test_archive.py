@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+from app.api.routes import admin_mock
+from app.core.archive import RecordArchive, BOOKINGS, AUCTIONS
+from app.core.loaders import StoreLoaders
+from app.core.mock_store import Auction, Bid, Booking, Rating, Ride
+from app.core.store_protocol import Codec
+from app.models import ArchivedRecord, Booking as BookingRow, Car, Ride as RideRow, User
+from app.services import archive_engine
+
+START = datetime(2031, 3, 10, 9, 0)
+END = datetime(2031, 3, 12, 9, 0)
+LONG_AGO = datetime(2030, 1, 1)
+CUTOFF = datetime(2030, 6, 1)
+
+
+def _entries(count: int, status=lambda i: "completed", kind="booking"):
+    base = datetime(2030, 1, 1)
+    return [
+        (uuid4(), status(i), base + timedelta(hours=i), {kind: {"n": i}})
+        for i in range(count)
+    ]
+
+
+# ============ Segments ============
+
+def test_reads_find_records_in_any_segment_past_the_cache():
+    archive = RecordArchive(Codec(()), segment_records=4, cached_segments=1)
+    entries = _entries(10)
+    assert archive.append(BOOKINGS, entries) == 10
+    stats = archive.stats()[BOOKINGS]
+    assert (stats["segments"], stats["records"]) == (3, 10)
+    for record_id, _, _, bundle in reversed(entries):
+        assert record_id in archive
+        assert archive.get(record_id) == bundle
+    assert archive.get(uuid4()) is None
+
+
+def test_scan_is_newest_first_and_pages_across_segments():
+    archive = RecordArchive(Codec(()), segment_records=4)
+    archive.append(BOOKINGS, _entries(10, status=lambda i: "cancelled" if i % 3 == 0 else "completed"))
+    archive.append(AUCTIONS, _entries(2, status=lambda i: "closed", kind="auction"))
+
+    numbers = [bundle["booking"]["n"] for bundle in archive.scan(BOOKINGS)]
+    assert numbers == list(range(9, -1, -1))
+    assert [b["booking"]["n"] for b in archive.scan(BOOKINGS, skip=3, limit=4)] == [6, 5, 4, 3]
+    assert [b["booking"]["n"] for b in archive.scan(BOOKINGS, "cancelled")] == [9, 6, 3, 0]
+    assert [b["booking"]["n"] for b in archive.scan(BOOKINGS, "cancelled", skip=1, limit=2)] == [6, 3]
+    assert archive.scan(BOOKINGS, "cancelled", skip=4) == []
+    assert archive.scan(BOOKINGS, "rejected") == []
+    assert len(archive.scan(AUCTIONS)) == 2
+
+
+# ============ In-memory store ============
+
+def _finished_booking(store, user, status="completed", updated_at=LONG_AGO) -> Booking:
+    booking = store.create_booking(Booking(
+        id=uuid4(), user_id=user.id, car_id=store.get_all_cars()[0].id,
+        start_time=START, end_time=END, offer_price=100000, status=status, created_at=updated_at
+    ))
+    booking.updated_at = updated_at
+    return booking
+
+
+def test_archive_moves_finished_records_with_their_dependents(memory_store):
+    store = memory_store
+    user = store.get_user_by_email("vikram@example.com")
+    rated = _finished_booking(store, user)
+    ride = store.create_ride(Ride(id=uuid4(), booking_id=rated.id, status="completed"))
+    rating = store.create_rating(Rating(id=uuid4(), ride_id=ride.id, driving_rating=5))
+    recent = _finished_booking(store, user, updated_at=CUTOFF + timedelta(days=1))
+    riding = _finished_booking(store, user)
+    store.create_ride(Ride(id=uuid4(), booking_id=riding.id))
+    live_bid = _finished_booking(store, user, status="rejected")
+    auction = store.create_auction(Auction(id=uuid4(), car_id=live_bid.car_id, start_time=START, end_time=END))
+    store.create_bid(Bid(id=uuid4(), auction_id=auction.id, user_id=user.id, booking_id=live_bid.id,
+                         offer_price=1, trust_score_snapshot=0))
+    closed = store.create_auction(Auction(id=uuid4(), car_id=live_bid.car_id, start_time=START, end_time=END,
+                                          status="closed", auction_end=LONG_AGO))
+    closed_bid = store.create_bid(Bid(id=uuid4(), auction_id=closed.id, user_id=user.id, booking_id=recent.id,
+                                      offer_price=1, trust_score_snapshot=0))
+
+    assert store.archive_terminal(CUTOFF) == {AUCTIONS: 1, BOOKINGS: 1}
+    assert store.get_booking_by_id(rated.id) is None
+    assert store.get_ride_by_id(ride.id) is None and store.get_rating_by_ride(ride.id) is None
+    bundle = store.get_archived(rated.id)
+    assert (bundle["booking"], bundle["ride"], bundle["rating"]) == (rated, ride, rating)
+    assert store.get_archived(closed.id) == {"auction": closed, "bids": [closed_bid]}
+    for kept in (recent, riding, live_bid):
+        assert store.get_booking_by_id(kept.id) is not None
+    assert store.get_auction_by_id(auction.id) is not None
+
+    # Nothing left to move the second time
+    assert store.archive_terminal(CUTOFF) == {AUCTIONS: 0, BOOKINGS: 0}
+
+
+def test_booking_cursor_survives_archiving(memory_store):
+    store = memory_store
+    user = store.get_user_by_email("vikram@example.com")
+    old = [_finished_booking(store, user) for _ in range(3)]
+    new = [_finished_booking(store, user, updated_at=CUTOFF + timedelta(days=1)) for _ in range(2)]
+    before = [b.id for b in store.iter_bookings()]
+    store.archive_terminal(CUTOFF)
+    archived = {b.id for b in old}
+    after = [b.id for b in store.iter_bookings()]
+    assert after == [booking_id for booking_id in before if booking_id not in archived]
+    assert after[-2:] == [b.id for b in new]
+
+
+def test_admin_list_reads_through_to_the_archive(memory_store, monkeypatch):
+    store = memory_store
+    monkeypatch.setattr(admin_mock, "store", store)
+    user = store.get_user_by_email("vikram@example.com")
+    for _ in range(3):
+        _finished_booking(store, user, status="cancelled")
+    store.archive_terminal(CUTOFF)
+    live = len(store.get_all_bookings("cancelled"))
+
+    def page(skip, limit, include_archived=True):
+        return admin_mock.list_all_bookings(
+            status_filter="cancelled", skip=skip, limit=limit, include_archived=include_archived,
+            fields=None, admin=None, loaders=StoreLoaders(store)
+        )
+
+    assert len(page(0, 100, include_archived=False)) == live
+    everything = page(0, 100)
+    assert len(everything) == live + 3
+    assert [b["id"] for b in page(live, 2)] == [b["id"] for b in everything[live:live + 2]]
+    assert [b["id"] for b in page(live + 2, 2)] == [everything[-1]["id"]]
+    assert page(live + 3, 2) == []
+
+
+# ============ Database ============
+
+def test_database_archive_moves_bookings_and_reads_them_back(sqlite_session):
+    db = sqlite_session
+    user = User(name="U", email="u@example.com", password_hash="x", trust_score=Decimal("50"))
+    car = Car(model="Test", number_plate="T-1", daily_price=Decimal("1500"), deposit=Decimal("100"))
+    db.add_all([user, car])
+    db.flush()
+    rows = [
+        BookingRow(user_id=user.id, car_id=car.id, start_time=START, end_time=END, offer_price=Decimal("1500.50"),
+                   status=status, created_at=LONG_AGO + timedelta(hours=i), updated_at=updated_at)
+        for i, (status, updated_at) in enumerate([
+            ("completed", LONG_AGO), ("cancelled", LONG_AGO), ("confirmed", LONG_AGO), ("completed", CUTOFF)
+        ])
+    ]
+    db.add_all(rows)
+    db.flush()
+    db.add(RideRow(booking_id=rows[0].id, status="completed"))
+    db.commit()
+    ids = [row.id for row in rows]
+
+    assert archive_engine._archive_bookings(db, CUTOFF, 10) == 2
+    db.commit()
+    assert {b.id for b in db.query(BookingRow)} == {ids[2], ids[3]}
+    assert db.query(RideRow).count() == 0
+    assert db.query(ArchivedRecord).count() == 2
+
+    bundle = archive_engine.get_archived(db, ids[0])
+    assert bundle["booking"]["offer_price"] == Decimal("1500.50")
+    assert bundle["ride"]["status"] == "completed" and bundle["rating"] is None
+    assert [b["booking"]["id"] for b in archive_engine.scan(db, BOOKINGS)] == [ids[1], ids[0]]
+    assert [b["booking"]["id"] for b in archive_engine.scan(db, BOOKINGS, "completed")] == [ids[0]]
+    assert archive_engine.scan(db, BOOKINGS, skip=1, limit=5) == [bundle]
@@ -0,0 +1,94 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from app.api.routes import bookings, bookings_mock, cars_mock
+from app.core.batch import MAX_BATCH_IDS, in_request_order, parse_ids
+from app.core.loaders import StoreLoaders
+from app.core.mock_store import Booking as StoreBooking
+from app.models import Booking, Car, User
+
+START = datetime(2031, 3, 10, 9, 0)
+END = datetime(2031, 3, 12, 9, 0)
+
+
+def test_ids_keep_request_order_without_duplicates():
+    a, b, c = uuid4(), uuid4(), uuid4()
+    assert parse_ids([f"{b}, {a}", str(c), f"{a},,{b}"]) == [b, a, c]
+    assert in_request_order([b, a, c], {a: "a", c: "c"}) == ["a", "c"]
+
+
+@pytest.mark.parametrize("values", [
+    [], [" , "], ["not-a-uuid"], [",".join(str(uuid4()) for _ in range(MAX_BATCH_IDS + 1))]
+])
+def test_missing_malformed_and_too_many_ids_are_a_400(values):
+    with pytest.raises(HTTPException) as error:
+        parse_ids(values)
+    assert error.value.status_code == 400
+
+
+def test_the_limit_counts_distinct_ids():
+    same = str(uuid4())
+    assert len(parse_ids([same] * (MAX_BATCH_IDS * 2))) == 1
+
+
+# ============ In-memory store ============
+
+def test_car_batch_returns_known_cars_in_request_order(memory_store, monkeypatch):
+    monkeypatch.setattr(cars_mock, "store", memory_store)
+    cars = memory_store.get_all_cars()[:3]
+    ids = [str(cars[2].id), str(uuid4()), str(cars[0].id)]
+    body = json.loads(cars_mock.get_cars_batch(ids=[",".join(ids)]).body)
+    assert [car["id"] for car in body] == [ids[0], ids[2]]
+    assert body[0]["model"] == cars[2].model
+
+
+def test_booking_batch_checks_ownership_over_the_whole_set(memory_store, monkeypatch):
+    store = memory_store
+    monkeypatch.setattr(bookings_mock, "store", store)
+    car_id = store.get_all_cars()[0].id
+    owner = store.get_user_by_email("vikram@example.com")
+    other = next(u for u in store.get_all_users() if u.id != owner.id and not u.is_admin)
+    admin = next(u for u in store.get_all_users() if u.is_admin)
+    mine, theirs = (
+        store.create_booking(StoreBooking(id=uuid4(), user_id=user.id, car_id=car_id,
+                                          start_time=START, end_time=END, offer_price=100000))
+        for user in (owner, other)
+    )
+
+    def batch(user, *records):
+        return bookings_mock.get_bookings_batch(
+            ids=[str(r.id) for r in records], current_user=user, loaders=StoreLoaders(store)
+        )
+
+    assert [b["id"] for b in batch(owner, mine)] == [str(mine.id)]
+    with pytest.raises(HTTPException) as error:
+        batch(owner, mine, theirs)
+    assert error.value.status_code == 403
+    assert [b["id"] for b in batch(admin, theirs, mine)] == [str(theirs.id), str(mine.id)]
+
+
+# ============ Database ============
+
+def test_database_booking_batch_keeps_request_order_and_checks_ownership(sqlite_session):
+    db = sqlite_session
+    owner = User(name="U", email="u@example.com", password_hash="x", trust_score=Decimal("50"))
+    other = User(name="V", email="v@example.com", password_hash="x", trust_score=Decimal("50"))
+    car = Car(model="Test", number_plate="T-1", daily_price=Decimal("1500"), deposit=Decimal("100"))
+    db.add_all([owner, other, car])
+    db.flush()
+    rows = [
+        Booking(user_id=user.id, car_id=car.id, start_time=START, end_time=END, offer_price=Decimal("1500"))
+        for user in (owner, owner, other)
+    ]
+    db.add_all(rows)
+    db.commit()
+
+    found = bookings.get_bookings_batch(ids=[f"{rows[1].id},{uuid4()},{rows[0].id}"], current_user=owner, db=db)
+    assert [b.id for b in found] == [rows[1].id, rows[0].id]
+    assert found[0].car.model == "Test"
+    with pytest.raises(HTTPException) as error:
+        bookings.get_bookings_batch(ids=[str(rows[2].id)], current_user=owner, db=db)
+    assert error.value.status_code == 403
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.core.availability_calendar import (
+    AvailabilityCalendar, CALENDAR_EPOCH, AVAILABLE, BOOKED, LOCKED, slot_index
+)
+from app.core.config import settings
+from app.models import Auction, Booking, Car, CarCalendar, User
+from app.services.calendar_engine import calendar_engine
+
+DAY = datetime(2031, 3, 10)
+
+
+def _at(hour: float) -> datetime:
+    return DAY + timedelta(hours=hour)
+
+
+def _spans(ranges) -> list:
+    return [(r["start_time"], r["end_time"], r["status"]) for r in ranges]
+
+
+def test_partial_hours_are_held_whole():
+    calendar = AvailabilityCalendar()
+    calendar.mark(BOOKED, _at(9.5), _at(11.25))
+    assert _spans(calendar.ranges(_at(8), _at(13))) == [
+        (_at(8), _at(9), AVAILABLE),
+        (_at(9), _at(12), BOOKED),
+        (_at(12), _at(13), AVAILABLE),
+    ]
+    assert calendar.is_free(_at(12), _at(13))
+    assert not calendar.is_free(_at(11.9), _at(12.5))
+
+
+def test_booked_wins_over_locked_and_status_filters():
+    calendar = AvailabilityCalendar()
+    calendar.mark(LOCKED, _at(0), _at(6))
+    calendar.mark(BOOKED, _at(2), _at(4))
+    assert _spans(calendar.ranges(_at(0), _at(8))) == [
+        (_at(0), _at(2), LOCKED),
+        (_at(2), _at(4), BOOKED),
+        (_at(4), _at(6), LOCKED),
+        (_at(6), _at(8), AVAILABLE),
+    ]
+    assert _spans(calendar.ranges(_at(0), _at(8), LOCKED)) == [(_at(0), _at(2), LOCKED), (_at(4), _at(6), LOCKED)]
+    assert calendar.is_free(_at(0), _at(2))
+    assert not calendar.is_free(_at(0), _at(2), LOCKED)
+
+
+def test_empty_windows_and_spans():
+    calendar = AvailabilityCalendar()
+    assert calendar.ranges(_at(5), _at(5)) == []
+    assert calendar.ranges(_at(6), _at(5)) == []
+    calendar.mark(BOOKED, _at(5), _at(5))
+    assert calendar.booked == 0
+    assert _spans(calendar.ranges(_at(5.5), _at(5.75))) == [(_at(5), _at(6), AVAILABLE)]
+
+
+def test_release_keeps_spans_still_held():
+    calendar = AvailabilityCalendar()
+    calendar.mark(BOOKED, _at(0), _at(10))
+    calendar.release(BOOKED, _at(0), _at(10), keep=[(_at(3), _at(5))])
+    assert _spans(calendar.ranges(_at(0), _at(10), BOOKED)) == [(_at(3), _at(5), BOOKED)]
+
+
+def test_pre_epoch_hours_keep_their_times():
+    calendar = AvailabilityCalendar()
+    start = CALENDAR_EPOCH - timedelta(hours=3)
+    assert slot_index(start) == -3
+    calendar.mark(BOOKED, start, CALENDAR_EPOCH + timedelta(hours=2))
+    assert _spans(calendar.ranges(start, CALENDAR_EPOCH + timedelta(hours=4))) == [
+        (start, CALENDAR_EPOCH, AVAILABLE),
+        (CALENDAR_EPOCH, CALENDAR_EPOCH + timedelta(hours=2), BOOKED),
+        (CALENDAR_EPOCH + timedelta(hours=2), CALENDAR_EPOCH + timedelta(hours=4), AVAILABLE),
+    ]
+
+
+def test_trim_rebases_by_whole_days_and_keeps_later_hours():
+    calendar = AvailabilityCalendar()
+    calendar.mark(BOOKED, _at(-30), _at(-20))
+    calendar.mark(LOCKED, _at(1), _at(3))
+    calendar.mark(BOOKED, _at(2), _at(5))
+    before = calendar.ranges(_at(0), _at(48))
+
+    calendar.trim(_at(12))
+    assert calendar.base == slot_index(DAY)
+    assert calendar.booked.bit_length() == 5
+    assert calendar.ranges(_at(0), _at(48)) == before
+    # Hours before the base read as available and new marks are clipped to it
+    assert _spans(calendar.ranges(_at(-30), _at(0))) == [(_at(-30), _at(0), AVAILABLE)]
+    calendar.mark(BOOKED, _at(-5), _at(1))
+    assert _spans(calendar.ranges(_at(-2), _at(2), BOOKED)) == [(_at(0), _at(1), BOOKED)]
+
+    calendar.trim(_at(-48))
+    assert calendar.base == slot_index(DAY)
+
+
+def test_database_calendar_stores_its_base(sqlite_session, monkeypatch):
+    db = sqlite_session
+    monkeypatch.setattr(settings, "CALENDAR_RETENTION_DAYS", 0)
+    user = User(name="U", email="u@example.com", password_hash="x", trust_score=Decimal("50"))
+    car = Car(model="Test", number_plate="T-1", daily_price=Decimal("1500"), deposit=Decimal("100"))
+    db.add_all([user, car])
+    db.flush()
+    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    old = Booking(user_id=user.id, car_id=car.id, start_time=now - timedelta(days=3),
+                  end_time=now - timedelta(days=2), offer_price=Decimal("10"), status="confirmed")
+    auction = Auction(car_id=car.id, start_time=now + timedelta(hours=1), end_time=now + timedelta(hours=3))
+    db.add_all([old, auction])
+    db.flush()
+    calendar_engine.mark_booked(db, old)
+    calendar_engine.lock(db, auction)
+    db.commit()
+
+    row = db.query(CarCalendar).filter(CarCalendar.car_id == car.id).one()
+    assert row.base_slot == slot_index(now) // 24 * 24
+    assert row.booked == b""
+    assert _spans(calendar_engine.get_ranges(db, car.id, now, now + timedelta(hours=4), LOCKED)) == [
+        (now + timedelta(hours=1), now + timedelta(hours=3), LOCKED)
+    ]
@@ -0,0 +1,45 @@
+"""
+Each booking/auction hot query is planned on an index (the checks in
+benchmarks/explain_indexes.py). Needs a PostgreSQL at DATABASE_URL migrated
+with `alembic upgrade head`; skipped when none is reachable.
+"""
+import pytest
+from sqlalchemy import create_engine, pool
+from sqlalchemy.exc import OperationalError
+from app.core.config import settings
+from app.core.database import SessionLocal
+from benchmarks.explain_indexes import hot_queries, disable_seqscan, used_indexes
+
+
+def _postgres_reachable() -> bool:
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        return False
+    probe = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool, connect_args={"connect_timeout": 3})
+    try:
+        with probe.connect():
+            return True
+    except OperationalError:
+        return False
+    finally:
+        probe.dispose()
+
+
+pytestmark = pytest.mark.skipif(not _postgres_reachable(), reason="no PostgreSQL reachable at DATABASE_URL")
+
+HOT_QUERIES = hot_queries()
+
+
+@pytest.fixture(scope="module")
+def db():
+    with SessionLocal() as db:
+        disable_seqscan(db)
+        yield db
+        db.rollback()
+
+
+@pytest.mark.parametrize("label, stmt, expected", HOT_QUERIES, ids=[label for label, _, _ in HOT_QUERIES])
+def test_hot_query_uses_index(db, label, stmt, expected):
+    used = used_indexes(db, stmt)
+    assert any(name in used for name in expected), (
+        f"{label} uses {', '.join(used) or 'no index'}, expected {' or '.join(expected)}"
+    )
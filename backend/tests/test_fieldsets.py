@@ -0,0 +1,97 @@
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect
+from app.core.fieldsets import (
+    MAX_FIELDS_LENGTH, column_names, dump_fields, field_tree, key, parse_fields, project, schema_tree, wants
+)
+from app.models import Booking, Car, User
+from app.models.loaders import booking_details_options
+from app.schemas.booking import BookingWithDetails
+
+ALLOWED = field_tree("id", "status", "offer_price", car=("model", "image_url"), user=("name",))
+
+
+def test_parse_merges_relation_paths_and_a_whole_relation_wins():
+    assert parse_fields(None, ALLOWED) is None
+    assert parse_fields(" id , car.model,,car.image_url ", ALLOWED) == {
+        "id": None, "car": {"model": None, "image_url": None}
+    }
+    assert parse_fields("car.model,car", ALLOWED) == {"car": None}
+    assert parse_fields("car,car.model", ALLOWED) == {"car": None}
+
+
+@pytest.mark.parametrize("raw", [
+    "nope", "id,status.x", "car.number_plate", "user.name.first", ",,", "x" * (MAX_FIELDS_LENGTH + 1)
+])
+def test_parse_rejects_unknown_and_empty_fieldsets(raw):
+    with pytest.raises(HTTPException) as error:
+        parse_fields(raw, ALLOWED)
+    assert error.value.status_code == 400
+
+
+def test_unknown_field_error_lists_the_choices():
+    with pytest.raises(HTTPException) as error:
+        parse_fields("nope", ALLOWED)
+    assert "car.image_url" in error.value.detail and "user.name" in error.value.detail
+
+
+def test_key_is_canonical_and_wants_treats_none_as_everything():
+    assert key(None) == "*"
+    assert key(parse_fields("car.model,id", ALLOWED)) == key(parse_fields("id,car.model", ALLOWED)) == "car.model,id"
+    assert key(parse_fields("car", ALLOWED)) == "car"
+    assert wants(None, "user") and wants({"user": None}, "user") and not wants({"id": None}, "user")
+
+
+def test_project_keeps_requested_keys_one_level_deep():
+    payload = {"id": 1, "status": "confirmed", "car": {"model": "Innova", "image_url": None}, "user": None}
+    assert project(payload, None) is payload
+    assert project(payload, {"status": None, "car": {"model": None}, "user": {"name": None}}) == {
+        "status": "confirmed", "car": {"model": "Innova"}, "user": None
+    }
+    assert project(None, {"id": None}) is None
+
+
+def test_schema_tree_descends_into_nested_schemas():
+    tree = schema_tree(BookingWithDetails)
+    assert tree["status"] is None
+    assert "model" in tree["car"] and "email" not in tree["user"]
+    assert column_names(Booking, {"status": None, "car": {"model": None}}, always=("id", "car_id")) == [
+        "id", "car_id", "status"
+    ]
+
+
+def test_dump_fields_reads_only_the_named_attributes():
+    class Strict(SimpleNamespace):
+        def __getattr__(self, name):
+            raise AssertionError(f"{name} was read")
+
+    car = Strict(model="Innova", image_url=None)
+    booking = Strict(id=uuid4(), offer_price=Decimal("1500.50"), status="confirmed", car=car, user=None)
+    fields = {"id": None, "offer_price": None, "car": {"model": None}, "user": None}
+    assert dump_fields(BookingWithDetails, booking, fields) == {
+        "id": str(booking.id), "offer_price": "1500.50", "car": {"model": "Innova"}, "user": None
+    }
+
+
+def test_database_loads_only_requested_columns_and_relations(sqlite_session):
+    db = sqlite_session
+    user = User(name="U", email="u@example.com", password_hash="x", trust_score=Decimal("50"))
+    car = Car(model="Innova", number_plate="T-1", daily_price=Decimal("1500"), deposit=Decimal("100"),
+              description="Family MPV")
+    db.add_all([user, car])
+    db.flush()
+    db.add(Booking(user_id=user.id, car_id=car.id, start_time=datetime(2031, 3, 10), end_time=datetime(2031, 3, 11),
+                   offer_price=Decimal("1500"), status="confirmed"))
+    db.commit()
+    db.expunge_all()
+
+    fields = parse_fields("status,car.model", schema_tree(BookingWithDetails))
+    booking = db.query(Booking).options(*booking_details_options(fields)).one()
+    state = inspect(booking)
+    assert {"offer_price", "start_time", "user"} <= state.unloaded
+    assert "description" in inspect(booking.car).unloaded
+    assert dump_fields(BookingWithDetails, booking, fields) == {"status": "confirmed", "car": {"model": "Innova"}}
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from app.core.idempotency import IdempotencyKeys, IdempotencyStore, REPLAYED_HEADER, fingerprint
+from app.models import IdempotencyKey, User
+from app.services.idempotency_engine import idempotency_store
+
+ROUTE = "POST /bookings/request"
+
+
+class KeysBackend:
+    """The store's idempotency methods over a bare IdempotencyKeys"""
+
+    def __init__(self, keys: IdempotencyKeys):
+        self.keys = keys
+
+    def claim_idempotency_key(self, user_id, route, key, request_fingerprint):
+        return self.keys.claim((user_id, route, key), request_fingerprint)
+
+    def finish_idempotency_key(self, user_id, route, key, body):
+        self.keys.finish((user_id, route, key), body)
+
+    def abandon_idempotency_key(self, user_id, route, key):
+        self.keys.abandon((user_id, route, key))
+
+
+def _memory(ttl=60, max_keys=100, lease=60) -> IdempotencyStore:
+    return IdempotencyStore(KeysBackend(IdempotencyKeys(ttl, max_keys, lease)))
+
+
+@pytest.fixture
+def db_store(sqlite_session):
+    user = User(name="U", email="u@example.com", password_hash="x", trust_score=Decimal("50"))
+    sqlite_session.add(user)
+    sqlite_session.commit()
+    return idempotency_store(sqlite_session), user.id
+
+
+@pytest.fixture(params=["memory", "database"])
+def keyed(request):
+    """(IdempotencyStore, user id) for each backend"""
+    if request.param == "memory":
+        return _memory(), uuid4()
+    return request.getfixturevalue("db_store")
+
+
+def _status(store, user_id, key, request_fingerprint) -> int:
+    with pytest.raises(HTTPException) as raised:
+        store.call(user_id, ROUTE, key, request_fingerprint)
+    return raised.value.status_code
+
+
+def test_retry_replays_the_first_response_bytes(keyed):
+    store, user_id = keyed
+    with store.call(user_id, ROUTE, "k", "fp") as call:
+        assert call.replay is None
+        call.done({"id": "b-1", "price": 10.5, "name": "Śrī"})
+    with store.call(user_id, ROUTE, "k", "fp") as call:
+        assert call.replay.body == '{"id":"b-1","price":10.5,"name":"Śrī"}'.encode()
+        assert call.replay.headers[REPLAYED_HEADER] == "true"
+
+
+def test_reused_key_with_another_payload_is_rejected(keyed):
+    store, user_id = keyed
+    with store.call(user_id, ROUTE, "k", "fp") as call:
+        call.done({})
+    assert _status(store, user_id, "k", "other") == 422
+
+
+def test_key_in_progress_is_a_conflict(keyed):
+    store, user_id = keyed
+    store.call(user_id, ROUTE, "k", "fp")
+    assert _status(store, user_id, "k", "fp") == 409
+
+
+def test_failed_request_frees_its_key(keyed):
+    store, user_id = keyed
+    with pytest.raises(RuntimeError):
+        with store.call(user_id, ROUTE, "k", "fp"):
+            raise RuntimeError("boom")
+    with store.call(user_id, ROUTE, "k", "fp") as call:
+        assert call.replay is None
+
+
+def test_keys_are_per_user_and_route(keyed):
+    store, user_id = keyed
+    store.call(user_id, ROUTE, "k", "fp")
+    with store.call(user_id, "POST /auctions/{auction_id}/bid", "k", "fp") as call:
+        assert call.replay is None
+
+
+def test_key_length_is_checked(keyed):
+    store, user_id = keyed
+    assert _status(store, user_id, "", "fp") == 400
+    assert _status(store, user_id, "x" * 256, "fp") == 400
+    with store.call(user_id, ROUTE, None, "fp") as call:
+        assert call.replay is None
+        assert call.done(1) == 1
+
+
+def test_memory_unfinished_claim_is_taken_after_its_lease():
+    store = _memory(lease=0)
+    user_id = uuid4()
+    store.call(user_id, ROUTE, "k", "fp")
+    with store.call(user_id, ROUTE, "k", "fp") as call:
+        assert call.replay is None
+
+
+def test_memory_keys_expire_and_are_bounded():
+    keys = IdempotencyKeys(ttl_seconds=0, max_keys=10, lease_seconds=60)
+    keys.claim(("u", ROUTE, "a"), "fp")
+    assert keys.claim(("u", ROUTE, "a"), "fp") is None
+
+    keys = IdempotencyKeys(ttl_seconds=60, max_keys=2, lease_seconds=60)
+    for key in "abc":
+        keys.claim(("u", ROUTE, key), "fp")
+    # "a" was evicted, "c" is held
+    assert keys.claim(("u", ROUTE, "a"), "fp") is None
+    assert keys.claim(("u", ROUTE, "c"), "fp") == ("fp", None)
+
+
+def test_database_unfinished_claim_is_taken_after_its_lease(db_store, sqlite_session):
+    store, user_id = db_store
+    store.call(user_id, ROUTE, "k", "fp")
+    sqlite_session.query(IdempotencyKey).update({IdempotencyKey.claimed_until: datetime.utcnow() - timedelta(seconds=1)})
+    sqlite_session.commit()
+    assert store.call(user_id, ROUTE, "k", "fp").replay is None
+    assert _status(store, user_id, "k", "fp") == 409
+
+
+def test_database_expired_keys_are_dropped(db_store, sqlite_session):
+    store, user_id = db_store
+    with store.call(user_id, ROUTE, "old", "fp") as call:
+        call.done({})
+    sqlite_session.query(IdempotencyKey).update({IdempotencyKey.expires_at: datetime.utcnow()})
+    sqlite_session.commit()
+    assert store.call(user_id, ROUTE, "old", "fp").replay is None
+    assert sqlite_session.query(IdempotencyKey).count() == 1
+
+
+def test_database_abandon_discards_the_failed_request_writes(db_store, sqlite_session):
+    store, user_id = db_store
+    with pytest.raises(RuntimeError):
+        with store.call(user_id, ROUTE, "k", "fp"):
+            sqlite_session.add(User(name="V", email="v@example.com", password_hash="x"))
+            sqlite_session.flush()
+            raise RuntimeError("boom")
+    assert sqlite_session.query(User).count() == 1
+    assert sqlite_session.query(IdempotencyKey).count() == 0
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
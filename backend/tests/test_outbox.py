@@ -0,0 +1,118 @@
+import time
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+from app.api.routes import auctions, auctions_mock
+from app.core import mock_store
+from app.core.outbox import (
+    MemoryOutbox, OutboxDispatcher, BOOKING_REQUESTED, BID_PLACED
+)
+from app.models import Auction, Car, OutboxEvent, User
+from app.schemas import BidCreate
+
+START = datetime(2031, 3, 10, 9, 0)
+END = datetime(2031, 3, 12, 9, 0)
+
+
+def _fill(outbox: MemoryOutbox, count: int) -> None:
+    for i in range(count):
+        outbox.append("test.event", uuid4(), {"i": i})
+
+
+def test_claim_takes_oldest_unleased_events_in_order():
+    outbox = MemoryOutbox()
+    _fill(outbox, 5)
+    assert [e.id for e in outbox.claim(3, 30)] == [1, 2, 3]
+    assert [e.id for e in outbox.claim(10, 30)] == [4, 5]
+    assert outbox.claim(10, 30) == []
+
+
+def test_ack_drops_events_and_unclaimed_ids_are_ignored():
+    outbox = MemoryOutbox()
+    _fill(outbox, 3)
+    claimed = outbox.claim(2, 30)
+    outbox.ack([claimed[0].id, 3, 99])
+    assert len(outbox) == 2
+    # Event 3 was never claimed, so the ack left it for the next claim
+    assert [e.id for e in outbox.claim(10, 30)] == [3]
+
+
+def test_expired_lease_is_claimed_again_before_new_events():
+    outbox = MemoryOutbox()
+    _fill(outbox, 2)
+    first = outbox.claim(1, 0.01)
+    time.sleep(0.02)
+    _fill(outbox, 1)
+    again = outbox.claim(10, 30)
+    assert [e.id for e in again] == [first[0].id, 2, 3]
+    assert again[0].attempts == 2
+
+
+def test_live_lease_is_not_claimed_twice():
+    outbox = MemoryOutbox()
+    _fill(outbox, 1)
+    outbox.claim(1, 30)
+    assert outbox.claim(1, 30) == []
+
+
+def test_dispatcher_acks_only_after_every_subscriber_returns():
+    outbox = MemoryOutbox()
+    _fill(outbox, 3)
+
+    class Source:
+        def claim_events(self, limit, lease_seconds):
+            return outbox.claim(limit, lease_seconds)
+
+        def ack_events(self, event_ids):
+            outbox.ack(event_ids)
+
+    delivered = []
+
+    def failing(batch):
+        raise RuntimeError("sink down")
+
+    dispatcher = OutboxDispatcher(Source(), batch_size=10, poll_seconds=1, lease_seconds=0.01)
+    dispatcher.subscribe(lambda batch: delivered.extend(e.id for e in batch))
+    dispatcher.subscribe(failing)
+    try:
+        dispatcher.dispatch_once()
+    except RuntimeError:
+        pass
+    assert len(outbox) == 3
+
+    dispatcher._subscribers.pop()
+    time.sleep(0.02)
+    assert dispatcher.dispatch_once() == 3
+    assert len(outbox) == 0
+    assert delivered == [1, 2, 3, 1, 2, 3]
+
+
+def test_new_bid_emits_the_same_events_in_both_backends(sqlite_session, memory_store, monkeypatch):
+    db = sqlite_session
+    bidder = User(name="Bidder", email="bidder@example.com", password_hash="x", trust_score=Decimal("50"))
+    car = Car(model="Test", number_plate="T-1", daily_price=Decimal("1500"), deposit=Decimal("100"))
+    db.add_all([bidder, car])
+    db.flush()
+    auction = Auction(car_id=car.id, start_time=START, end_time=END, status="active")
+    db.add(auction)
+    db.commit()
+    auctions._place_bid(auction.id, BidCreate(offer_price=Decimal("4200")), bidder, db)
+    db_events = [
+        (row.event_type, row.payload.get("previous_status"), row.payload.get("status"))
+        for row in db.query(OutboxEvent).order_by(OutboxEvent.id)
+    ]
+
+    monkeypatch.setattr(auctions_mock, "store", memory_store)
+    memory_auction = memory_store.create_auction(mock_store.Auction(
+        id=uuid4(), car_id=memory_store.get_all_cars()[0].id, start_time=START, end_time=END
+    ))
+    memory_store.claim_events(100, 30)
+    auctions_mock._place_bid(str(memory_auction.id), 4200.0, memory_store.get_user_by_email("vikram@example.com"))
+    memory_events = [
+        (event.type, event.payload.get("previous_status"), event.payload.get("status"))
+        for event in memory_store.claim_events(100, 30)
+    ]
+
+    assert db_events == memory_events
+    assert [event[0] for event in db_events] == [BOOKING_REQUESTED, BID_PLACED]
+    assert db_events[0][1:] == (None, "competing")
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from app.core import rate_limit
+from app.core.rate_limit import AdmissionControl, RateLimiter, RateLimitMiddleware, TokenBucket, parse_rate
+from app.core.security import create_access_token
+
+ROUTE = "POST /api/bookings/request"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.monotonic for the rate limiter"""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_rates_parse_to_capacity_and_refill():
+    assert parse_rate("10/minute") == (10.0, 10.0 / 60)
+    assert parse_rate("2/second") == (2.0, 2.0)
+    for spec in ("10", "10/day", "0/second", "-1/hour"):
+        with pytest.raises(ValueError):
+            parse_rate(spec)
+
+
+def test_bucket_bursts_then_refills_one_token_at_a_time():
+    capacity, refill = parse_rate("3/minute")
+    bucket = TokenBucket(capacity, now=0.0)
+    assert [bucket.take(capacity, refill, 0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take(capacity, refill, 0.0) == pytest.approx(20.0)
+    assert bucket.take(capacity, refill, 10.0) == pytest.approx(10.0)
+    assert bucket.take(capacity, refill, 20.0) == 0.0
+    # A long idle time refills to capacity, never beyond
+    assert [bucket.take(capacity, refill, 10_000.0) for _ in range(4)][-1] > 0
+
+
+def test_route_limits_are_per_ip_and_the_default_covers_everything(clock):
+    limiter = RateLimiter("5/second", {ROUTE: "2/minute"}, {})
+    assert [limiter.check(ROUTE, "1.1.1.1", None) for _ in range(2)] == [0.0, 0.0]
+    assert limiter.check(ROUTE, "1.1.1.1", None) == pytest.approx(30.0)
+    assert limiter.check(ROUTE, "2.2.2.2", None) == 0.0
+    # Other routes only count against the default bucket
+    assert [limiter.check("GET /api/cars", "2.2.2.2", None) for _ in range(4)] == [0.0] * 4
+    assert limiter.check("GET /api/cars", "2.2.2.2", None) > 0
+    clock[0] += 1
+    assert limiter.check("GET /api/cars", "2.2.2.2", None) == 0.0
+
+
+def test_user_limits_follow_the_token_and_anonymous_requests_fall_back_to_ip(clock):
+    limiter = RateLimiter(None, {}, {ROUTE: "1/minute"})
+    token = "Bearer " + create_access_token({"sub": "user-1"})
+    assert limiter.check(ROUTE, "1.1.1.1", token) == 0.0
+    assert limiter.check(ROUTE, "2.2.2.2", token) > 0
+    assert limiter.check(ROUTE, "1.1.1.1", None) == 0.0
+    assert limiter.check(ROUTE, "1.1.1.1", "Bearer not-a-token") > 0
+    assert limiter.check(ROUTE, "3.3.3.3", "Basic abc") == 0.0
+
+
+def test_least_recently_used_buckets_are_dropped(clock):
+    limiter = RateLimiter("1/hour", {}, {}, max_buckets=2)
+    limiter.check("GET /", "a", None)
+    limiter.check("GET /", "b", None)
+    limiter.check("GET /", "a", None)
+    limiter.check("GET /", "c", None)
+    # "a" was kept; "b" was dropped and comes back full
+    assert limiter.check("GET /", "a", None) > 0
+    assert limiter.check("GET /", "b", None) == 0.0
+
+
+def test_admission_sheds_past_the_in_flight_limit():
+    admission = AdmissionControl(max_in_flight=2, retry_after=1.0)
+    assert [admission.admit(), admission.admit(), admission.admit()] == [True, True, False]
+    assert (admission.in_flight, admission.shed) == (2, 1)
+    admission.release()
+    assert admission.admit()
+    assert all(AdmissionControl(0, 1.0).admit() for _ in range(1000))
+
+
+def _request(middleware, path="/api/cars", method="GET", client="1.1.1.1"):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "client": (client, 1234)}
+    asyncio.run(middleware(scope, receive, send))
+    start = sent[0]
+    return start["status"], dict(start["headers"])
+
+
+def _app(seen: list):
+    async def app(scope, receive, send):
+        seen.append(scope["path"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+def test_middleware_answers_429_and_503_with_retry_after(clock):
+    seen = []
+    admission = AdmissionControl(max_in_flight=1, retry_after=2.5)
+    middleware = RateLimitMiddleware(_app(seen), RateLimiter("1/minute", {}, {}), admission)
+    assert _request(middleware)[0] == 200
+    status, headers = _request(middleware)
+    assert (status, headers[b"retry-after"]) == (429, b"60")
+    assert _request(middleware, path="/api/health")[0] == 200
+    assert _request(middleware, method="OPTIONS")[0] == 200
+    assert admission.in_flight == 0
+
+    admission.in_flight = 1
+    status, headers = _request(middleware, client="9.9.9.9")
+    assert (status, headers[b"retry-after"]) == (503, b"3")
+    assert seen == ["/api/cars", "/api/health", "/api/cars"]
@@ -0,0 +1,161 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+import pytest
+from app.api.routes import auctions, auctions_mock
+from app.core import mock_store
+from app.core.reporting import (
+    ReportAggregates, booking_deltas, day_index, day_date, fleet_cutoff, report_window, summarize,
+    DAY_CAPACITY, DEFAULT_REPORT_DAYS, METRICS, REPORT_EPOCH,
+    REQUESTS, CONFLICTS, CONFIRMED, BOOKED_MINUTES, REVENUE
+)
+from app.models import Auction, Car, User
+from app.schemas import BidCreate
+from app.services import report_engine
+
+START = datetime(2031, 3, 10, 9, 0)
+END = datetime(2031, 3, 12, 9, 0)
+FIRST_DAY = day_index(START)
+LAST_DAY = day_index(END)
+
+
+def _db_daily(db):
+    return report_engine.daily(db, day_date(FIRST_DAY), day_date(LAST_DAY))
+
+
+def _deltas(before, after):
+    before = dict(before)
+    return [
+        (day, [a - b for a, b in zip(totals, before.get(day, [0] * len(totals)))])
+        for day, totals in after
+    ]
+
+
+def test_new_bid_daily_totals_match_across_backends(sqlite_session, memory_store, monkeypatch):
+    db = sqlite_session
+    bidder = User(name="Bidder", email="bidder@example.com", password_hash="x", trust_score=Decimal("50"))
+    car = Car(model="Test", number_plate="T-1", daily_price=Decimal("1500"), deposit=Decimal("100"))
+    db.add_all([bidder, car])
+    db.flush()
+    auction = Auction(car_id=car.id, start_time=START, end_time=END, status="active")
+    db.add(auction)
+    db.commit()
+    before = _db_daily(db)
+    auctions._place_bid(auction.id, BidCreate(offer_price=Decimal("4200")), bidder, db)
+    db_deltas = _deltas(before, _db_daily(db))
+
+    monkeypatch.setattr(auctions_mock, "store", memory_store)
+    memory_car = memory_store.get_all_cars()[0]
+    memory_auction = memory_store.create_auction(
+        mock_store.Auction(id=uuid4(), car_id=memory_car.id, start_time=START, end_time=END)
+    )
+    memory_bidder = memory_store.get_user_by_email("vikram@example.com")
+    before = memory_store.get_daily_totals(FIRST_DAY, LAST_DAY)
+    auctions_mock._place_bid(str(memory_auction.id), 4200.0, memory_bidder)
+    memory_deltas = _deltas(before, memory_store.get_daily_totals(FIRST_DAY, LAST_DAY))
+
+    assert db_deltas == memory_deltas
+    # The new booking is one request and one conflict on its start day
+    assert db_deltas[0][0] == FIRST_DAY
+    assert db_deltas[0][1][:2] == [1, 1]
+
+
+def test_fleet_size_counts_cars_created_by_window_end(memory_store):
+    seeded = len(memory_store.get_all_cars(active_only=False))
+    memory_store.create_car(mock_store.Car(
+        id=uuid4(), model="Later", number_plate="LATE-1", daily_price=100000, deposit=0,
+        created_at=datetime(2031, 3, 13, 0, 0)
+    ))
+    assert memory_store.get_car_count(fleet_cutoff(END.date())) == seeded
+    assert memory_store.get_car_count(fleet_cutoff(datetime(2031, 3, 13).date())) == seeded + 1
+
+
+# ============ Aggregates ============
+
+def test_window_sums_match_a_plain_scan():
+    rng = random.Random(34)
+    aggregates = ReportAggregates()
+    cars = [uuid4() for _ in range(3)]
+    plain = {}
+    edges = [0, 1, DAY_CAPACITY - 1]
+    for _ in range(500):
+        car_id = rng.choice(cars)
+        day = rng.choice(edges) if rng.random() < 0.1 else rng.randrange(0, 3000)
+        metric = rng.randrange(len(METRICS))
+        amount = rng.randint(-5, 20)
+        aggregates.apply(car_id, [(day, metric, amount)])
+        plain[car_id, day, metric] = plain.get((car_id, day, metric), 0) + amount
+
+    def scan(first, last, car_ids):
+        return [
+            sum(amount for (car_id, day, m), amount in plain.items()
+                if car_id in car_ids and first <= day <= last and m == metric)
+            for metric in range(len(METRICS))
+        ]
+
+    windows = [(0, 0), (0, DAY_CAPACITY - 1), (1, 1), (DAY_CAPACITY - 1, DAY_CAPACITY - 1)] + [
+        tuple(sorted((rng.randrange(0, 3100), rng.randrange(0, 3100)))) for _ in range(50)
+    ]
+    for first, last in windows:
+        assert aggregates.fleet_totals(first, last) == scan(first, last, cars)
+        assert aggregates.car_totals(cars[0], first, last) == scan(first, last, cars[:1])
+    assert aggregates.car_totals(uuid4(), 0, 10) == [0] * len(METRICS)
+
+
+def test_daily_rows_are_the_same_sparse_or_dense():
+    aggregates = ReportAggregates()
+    car_id = uuid4()
+    aggregates.apply(car_id, [(10, REQUESTS, 1), (12, REQUESTS, 2), (40, REQUESTS, 1), (11, REVENUE, 0)])
+    sparse = aggregates.daily(0, 1000, car_id)
+    assert [day for day, _ in sparse] == [10, 12, 40]
+    assert aggregates.daily(10, 12, car_id) == sparse[:2]
+    assert aggregates.daily(11, 11) == []
+
+    aggregates.drop_car(car_id)
+    assert aggregates.daily(0, 1000, car_id) == []
+    assert aggregates.fleet_totals(0, 1000)[REQUESTS] == 4
+
+
+def test_booking_deltas_follow_transitions():
+    start = datetime(2031, 3, 10, 22, 30)
+    end = datetime(2031, 3, 11, 1, 15)
+    day = day_index(start)
+    assert booking_deltas(start, end, 500, None, "competing") == [(day, REQUESTS, 1), (day, CONFLICTS, 1)]
+    assert booking_deltas(start, end, 500, "competing", "competing") == []
+
+    confirmed = booking_deltas(start, end, 500, "competing", "confirmed")
+    assert sorted(confirmed) == sorted([
+        (day, CONFIRMED, 1), (day, REVENUE, 500), (day, BOOKED_MINUTES, 90), (day + 1, BOOKED_MINUTES, 75)
+    ])
+    assert booking_deltas(start, end, 500, "confirmed", "completed") == []
+    cancelled = booking_deltas(start, end, 500, "confirmed", "cancelled")
+    assert sorted(cancelled) == sorted((d, m, -amount) for d, m, amount in confirmed)
+
+
+def test_day_indexes_and_windows_are_bounded():
+    assert day_index(REPORT_EPOCH) == 0
+    assert day_index(datetime(2023, 12, 31, 23)) == 0
+    assert day_index(date(9999, 1, 1)) == DAY_CAPACITY - 1
+    assert day_index(datetime(2024, 1, 2, 1, tzinfo=timezone(timedelta(hours=5)))) == 0
+    assert day_date(day_index(date(2031, 3, 10))) == date(2031, 3, 10)
+
+    assert report_window(date(2031, 1, 1), date(2031, 1, 1)) == (date(2031, 1, 1), date(2031, 1, 1))
+    start, end = report_window(None, date(2031, 1, 30))
+    assert (end - start).days + 1 == DEFAULT_REPORT_DAYS
+    for start, end, max_days in (
+        (date(2031, 1, 2), date(2031, 1, 1), None),
+        (date(2023, 12, 31), date(2024, 1, 1), None),
+        (date(2031, 1, 1), date(2031, 1, 8), 7),
+    ):
+        with pytest.raises(ValueError):
+            report_window(start, end, max_days)
+
+
+def test_summaries_of_empty_windows_do_not_divide_by_zero():
+    summary = summarize([0] * len(METRICS), days=0, cars=0)
+    assert (summary["conflict_rate"], summary["utilization"], summary["revenue"]) == (0.0, 0.0, 0.0)
+    totals = [0] * len(METRICS)
+    totals[REQUESTS], totals[CONFLICTS], totals[BOOKED_MINUTES] = 4, 1, 24 * 60
+    summary = summarize(totals, days=2, cars=3)
+    assert (summary["conflict_rate"], summary["booked_hours"], summary["utilization"]) == (0.25, 24.0, round(1 / 6, 4))
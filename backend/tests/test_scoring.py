@@ -0,0 +1,66 @@
+import random
+from fractions import Fraction
+from app.core.scoring import final_scores, running_average, trust_score
+
+
+def baseline_final_scores(trusts, rides, prices):
+    """The float formula the auction engines used before fixed point"""
+    max_trust = max(float(t) for t in trusts) or 1
+    max_rides = max(rides) or 1
+    max_price = max(float(p) for p in prices) or 1
+    return [
+        round(0.5 * (float(t) / max_trust) + 0.3 * (r / max_rides) + 0.2 * (float(p) / max_price), 4)
+        for t, r, p in zip(trusts, rides, prices)
+    ]
+
+
+def near_half(trusts, rides, prices) -> bool:
+    """A sum that sits on a rounding tie, where the float formula depends on representation error"""
+    max_trust, max_rides, max_price = max(trusts) or 1, max(rides) or 1, max(prices) or 1
+    for t, r, p in zip(trusts, rides, prices):
+        exact = 10000 * (
+            Fraction(5, 10) * Fraction(t, max_trust)
+            + Fraction(3, 10) * Fraction(r, max_rides)
+            + Fraction(2, 10) * Fraction(p, max_price)
+        )
+        if abs(exact - int(exact) - Fraction(1, 2)) < Fraction(1, 10 ** 9):
+            return True
+    return False
+
+
+def test_final_scores_match_baseline_rounding():
+    rng = random.Random(7)
+    compared = 0
+    for _ in range(20000):
+        trusts = [rng.randint(0, 12000) for _ in range(3)]
+        rides = [rng.randint(0, 40) for _ in range(3)]
+        prices = [rng.randint(1, 5_000_000) for _ in range(3)]
+        if near_half(trusts, rides, prices):
+            continue
+        expected = [round(score * 10000) for score in baseline_final_scores(trusts, rides, prices)]
+        assert final_scores(trusts, rides, prices) == expected, (trusts, rides, prices)
+        compared += 1
+    assert compared > 19000
+
+
+def test_final_scores_round_the_sum_once():
+    # Rounding each term separately gives 1180 + 1548 + 2000 = 4728
+    trusts, rides, prices = [2201, 9325, 1033], [16, 7, 31], [250000, 250000, 250000]
+    assert final_scores(trusts, rides, prices)[0] == 4729
+    assert baseline_final_scores(trusts, rides, prices)[0] == 0.4729
+
+
+def test_final_scores_all_zero_inputs():
+    assert final_scores([0, 0], [0, 0], [0, 0]) == [0, 0]
+    assert final_scores([], [], []) == []
+
+
+def test_trust_score_is_floored_at_zero():
+    assert trust_score(480, 25, 0, 0) == 480 * 20 + 25 * 50
+    assert trust_score(100, 0, 3, 0) == 0
+
+
+def test_running_average_rounds_half_up():
+    # 4.50 over two samples, then a 5: (450 * 2 + 500) / 3 = 466.67
+    assert running_average(450, 3, 5) == 467
+    assert running_average(0, 1, 4) == 400
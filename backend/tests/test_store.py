@@ -0,0 +1,185 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+import pytest
+from app.core import mock_store
+from app.core.mock_store import Auction, Bid, Booking, Car, Rating, Ride, User, RECORD_TYPES
+from app.core.outbox import Event, AUCTION_CLOSED
+from app.core.scoring import LATE_CANCEL_PENALTY
+from app.core.store_client import StoreClient
+from app.core.store_protocol import Codec
+from app.core.store_server import StoreServer
+
+START = datetime(2031, 3, 10, 9, 0)
+END = datetime(2031, 3, 12, 9, 0)
+
+
+@pytest.fixture
+def client(memory_store, tmp_path):
+    """A StoreClient talking to memory_store through a store server"""
+    server = StoreServer(str(tmp_path / "store.sock"), memory_store, Codec(RECORD_TYPES))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield StoreClient(server.server_address)
+    server.shutdown()
+    server.server_close()
+
+
+def _user(store, email="vikram@example.com") -> User:
+    return store.get_user_by_email(email)
+
+
+def _booking(store, user, status="pending", start=START, end=END) -> Booking:
+    return store.create_booking(Booking(
+        id=uuid4(), user_id=user.id, car_id=store.get_all_cars()[0].id,
+        start_time=start, end_time=end, offer_price=420000, status=status
+    ))
+
+
+def _run(workers: int, target) -> list:
+    results = [None] * workers
+
+    def work(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_every_record_type_survives_the_protocol():
+    codec = Codec(RECORD_TYPES)
+    ids = [uuid4() for _ in range(3)]
+    records = [
+        User(id=ids[0], name="Śrī", email="s@example.com", phone=None, password_hash="h",
+             total_rides=3, avg_rating=467, trust_score=-1, is_blocked=True, version=2),
+        Car(id=ids[1], model="M", number_plate="P-1", daily_price=10 ** 12, deposit=0, description=""),
+        Booking(id=ids[2], user_id=ids[0], car_id=ids[1], start_time=START, end_time=END, offer_price=1),
+        Auction(id=uuid4(), car_id=ids[1], start_time=START, end_time=END, auction_end=None, winner_id=ids[0]),
+        Bid(id=uuid4(), auction_id=uuid4(), user_id=ids[0], booking_id=ids[2], offer_price=5,
+            trust_score_snapshot=0, final_score=10000),
+        Ride(id=uuid4(), booking_id=ids[2], status="damaged", ended_at=END),
+        Rating(id=uuid4(), ride_id=uuid4(), driving_rating=5, damage_flag=True, notes="a\x00b"),
+        Event(id=7, type="booking.changed", aggregate_id=ids[2],
+              payload={"at": datetime(2031, 1, 1, tzinfo=timezone.utc), "price": Decimal("1.50"), "ids": (1, [2])}),
+    ]
+    assert {type(record) for record in records} == set(RECORD_TYPES)
+    decoded = codec.decode(codec.encode(records))
+    assert decoded == records
+    assert [type(record) for record in decoded] == [type(record) for record in records]
+
+
+def test_concurrent_ratings_all_count(client, memory_store):
+    user = _user(memory_store)
+    before = (user.total_rides, user.damage_count, user.rash_count)
+    _run(8, lambda: [client.record_rating(user.id, 5, False, True) for _ in range(25)])
+    assert (user.total_rides, user.damage_count, user.rash_count) == (before[0] + 200, before[1], before[2] + 200)
+    assert user.trust_score == user.calculate_trust_score()
+    assert len(memory_store.get_trust_events(user.id)) >= 1
+
+
+def test_rating_below_the_threshold_blocks(memory_store, monkeypatch):
+    # The default threshold is 0, which a clamped score never goes below
+    monkeypatch.setattr(mock_store, "AUTO_BLOCK_THRESHOLD", 2000)
+    user = memory_store.create_user(User(
+        id=uuid4(), name="U", email="u@example.com", phone=None, password_hash="x",
+        total_rides=1, avg_rating=200, trust_score=4050
+    ))
+    updated = memory_store.record_rating(user.id, 2, False, False)
+    assert (updated.total_rides, updated.avg_rating, updated.trust_score) == (2, 200, 4100)
+    assert not updated.is_blocked
+    updated = memory_store.record_rating(user.id, 1, True, True)
+    assert (updated.total_rides, updated.avg_rating, updated.damage_count, updated.rash_count) == (3, 167, 1, 1)
+    assert updated.trust_score == 990 and updated.is_blocked
+    assert memory_store.record_rating(uuid4(), 5, False, False) is None
+
+
+def test_concurrent_closes_close_an_auction_once(client, memory_store):
+    bookings = [_booking(memory_store, _user(memory_store, email)) for email in ("rahul@example.com", "vikram@example.com")]
+    auction = memory_store.request_booking(Booking(
+        id=uuid4(), user_id=_user(memory_store, "priya@example.com").id, car_id=bookings[0].car_id,
+        start_time=START, end_time=END, offer_price=430000
+    ))
+    assert auction.status == "competing"
+    auction_id = memory_store.get_all_auctions("active")[0].id
+    memory_store.claim_events(1000, 30)
+
+    results = _run(6, lambda: client.close_auction(auction_id))
+    closed = [result for result in results if result is not None]
+    assert len(closed) == 1
+    closed_auction, winner = closed[0]
+    assert closed_auction.status == "closed" and closed_auction.winner_id == winner.user_id
+
+    statuses = sorted(memory_store.get_booking_by_id(b.booking_id).status for b in memory_store.get_auction_bids(auction_id))
+    assert statuses == ["confirmed", "rejected", "rejected"]
+    events = memory_store.claim_events(1000, 30)
+    assert [e.type for e in events].count(AUCTION_CLOSED) == 1
+
+
+def test_request_booking_joins_conflicts_in_one_auction(memory_store):
+    first = _booking(memory_store, _user(memory_store, "rahul@example.com"))
+    second = memory_store.request_booking(Booking(
+        id=uuid4(), user_id=_user(memory_store).id, car_id=first.car_id,
+        start_time=START + timedelta(hours=1), end_time=END, offer_price=1
+    ))
+    assert second.status == "competing" and first.status == "competing"
+    auction = memory_store.get_active_auction(first.car_id, START, END)
+    assert {bid.booking_id for bid in memory_store.get_auction_bids(auction.id)} == {first.id, second.id}
+
+    memory_store.update_booking_status(first, "confirmed")
+    blocked = Booking(id=uuid4(), user_id=_user(memory_store).id, car_id=first.car_id,
+                      start_time=START, end_time=START + timedelta(hours=2), offer_price=1)
+    assert memory_store.request_booking(blocked) is None
+    assert memory_store.get_booking_by_id(blocked.id) is None
+
+
+def test_status_changes_only_from_the_given_statuses(client, memory_store):
+    booking = _booking(memory_store, _user(memory_store))
+    results = _run(4, lambda: client.update_booking_status(booking, "confirmed", only_from=["pending"]))
+    assert sum(result is not None for result in results) == 1
+    assert memory_store.update_booking_status(booking, "rejected", only_from=["pending"]) is None
+    assert booking.status == "confirmed"
+
+    ride = Ride(id=uuid4(), booking_id=booking.id)
+    assert memory_store.create_ride(ride) is ride
+    assert memory_store.create_ride(Ride(id=uuid4(), booking_id=booking.id)) is None
+    assert memory_store.update_ride_status(ride, "completed", only_from=["active"]) is ride
+    assert memory_store.update_ride_status(ride, "completed", only_from=["active"]) is None
+
+    rating = Rating(id=uuid4(), ride_id=ride.id, driving_rating=4)
+    assert memory_store.create_rating(rating) is rating
+    assert memory_store.create_rating(Rating(id=uuid4(), ride_id=ride.id, driving_rating=1)) is None
+
+
+def test_late_cancel_penalty_applies_once_and_only_to_confirmed(client, memory_store):
+    user = _user(memory_store)
+    score = user.trust_score
+    pending = _booking(memory_store, user)
+    assert memory_store.cancel_booking(pending.id, LATE_CANCEL_PENALTY).status == "cancelled"
+    assert user.trust_score == score
+
+    confirmed = _booking(memory_store, user, status="confirmed")
+    results = _run(4, lambda: client.cancel_booking(confirmed.id, LATE_CANCEL_PENALTY))
+    assert sum(result is not None for result in results) == 1
+    assert user.trust_score == max(0, score - LATE_CANCEL_PENALTY)
+    assert memory_store.cancel_booking(uuid4()) is None
+
+
+def test_bids_on_a_closed_auction_are_refused(memory_store):
+    user = _user(memory_store)
+    auction = memory_store.create_auction(Auction(
+        id=uuid4(), car_id=memory_store.get_all_cars()[0].id, start_time=START, end_time=END
+    ))
+    bid, created = memory_store.place_bid(auction.id, user.id, 100, user.trust_score)
+    assert created
+    again, created = memory_store.place_bid(auction.id, user.id, 200, user.trust_score)
+    assert (again.id, again.offer_price, created) == (bid.id, 200, False)
+    assert memory_store.get_booking_by_id(bid.booking_id).offer_price == 200
+
+    memory_store.close_auction(auction.id)
+    assert memory_store.place_bid(auction.id, user.id, 300, user.trust_score) is None
+    assert memory_store.close_auction(auction.id) is None
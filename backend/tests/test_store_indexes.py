@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+from app.core.store_indexes import CarCatalogIndex, CarTextIndex, OccupancyIndex, TrustLeaderboard
+
+DAY = datetime(2031, 3, 10)
+
+
+def _at(hour: int) -> datetime:
+    return DAY + timedelta(hours=hour)
+
+
+def _car(price: int, transmission="automatic", fuel_type="petrol", seats=5, model="Car", description=None):
+    return SimpleNamespace(
+        id=uuid4(), daily_price=price, transmission=transmission, fuel_type=fuel_type,
+        seats=seats, model=model, description=description
+    )
+
+
+def _user(score: int, role="user", blocked=False):
+    return SimpleNamespace(id=uuid4(), trust_score=score, role=role, is_blocked=blocked)
+
+
+# ============ Occupancy (user-026) ============
+
+def test_occupancy_intervals_are_half_open():
+    index = OccupancyIndex()
+    car = uuid4()
+    booking = uuid4()
+    index.add(booking, car, _at(10), _at(12))
+    assert index.busy_car_ids(_at(11), _at(13)) == {car}
+    assert index.busy_car_ids(_at(12), _at(14)) == set()
+    assert index.busy_car_ids(_at(8), _at(10)) == set()
+    assert index.overlapping(car, _at(0), _at(24)) == [booking]
+    assert index.overlapping(uuid4(), _at(0), _at(24)) == []
+
+
+def test_occupancy_sees_a_long_booking_behind_short_later_ones():
+    index = OccupancyIndex()
+    car = uuid4()
+    long_booking = uuid4()
+    index.add(long_booking, car, _at(0), _at(100))
+    for hour in (10, 20, 30):
+        index.add(uuid4(), car, _at(hour), _at(hour + 1))
+    # Every later interval ends before 50; only the running max end finds the long one
+    assert index.busy_car_ids(_at(50), _at(51)) == {car}
+    index.remove(long_booking)
+    assert index.busy_car_ids(_at(50), _at(51)) == set()
+    assert index.busy_car_ids(_at(20), _at(21)) == {car}
+
+
+def test_occupancy_add_is_idempotent_and_remove_tolerates_unknown_ids():
+    index = OccupancyIndex()
+    car = uuid4()
+    booking = uuid4()
+    index.add(booking, car, _at(0), _at(2))
+    index.add(booking, car, _at(5), _at(7))
+    assert index.busy_car_ids(_at(5), _at(7)) == set()
+    index.remove(uuid4())
+    index.remove(booking)
+    index.remove(booking)
+    assert index.busy_car_ids(_at(0), _at(2)) == set()
+
+
+def test_occupancy_compares_aware_times_as_utc():
+    index = OccupancyIndex()
+    car = uuid4()
+    index.add(uuid4(), car, _at(10), _at(12))
+    ist = timezone(timedelta(hours=5, minutes=30))
+    start = _at(11).replace(tzinfo=timezone.utc).astimezone(ist)
+    assert index.busy_car_ids(start, start + timedelta(hours=1)) == {car}
+
+
+def test_occupancy_drop_car_forgets_its_bookings():
+    index = OccupancyIndex()
+    car = uuid4()
+    booking = uuid4()
+    index.add(booking, car, _at(0), _at(2))
+    index.drop_car(car)
+    assert index.busy_car_ids(_at(0), _at(2)) == set()
+    index.add(booking, car, _at(0), _at(2))
+    assert index.busy_car_ids(_at(0), _at(2)) == {car}
+
+
+# ============ Catalog (user-028) ============
+
+def _catalog(*cars) -> CarCatalogIndex:
+    index = CarCatalogIndex()
+    for car in cars:
+        index.add(car)
+    return index
+
+
+def test_price_bounds_are_inclusive():
+    cars = [_car(price) for price in (100, 200, 200, 300)]
+    index = _catalog(*cars)
+    ids = [car.id for car in cars]
+    assert index.search(min_price=200, max_price=200) == ids[1:3]
+    assert index.search(min_price=201) == ids[3:]
+    assert index.search(max_price=99) == []
+    assert index.search(min_price=300, max_price=100) == []
+
+
+def test_price_sorts_break_ties_in_catalog_order():
+    cars = [_car(price) for price in (300, 100, 200, 100)]
+    index = _catalog(*cars)
+    by_price = [cars[1].id, cars[3].id, cars[2].id, cars[0].id]
+    assert index.search(sort="price_asc") == by_price
+    assert index.search(sort="price_desc") == [cars[0].id, cars[2].id, cars[3].id, cars[1].id]
+    assert index.search(sort="price_asc", skip=1, limit=2) == by_price[1:3]
+    assert index.search(sort="price_asc", skip=10) == []
+
+
+def test_buckets_and_price_filter_together_in_catalog_order():
+    cars = [
+        _car(100, transmission="manual"),
+        _car(500, transmission="automatic", seats=7),
+        _car(200, transmission="automatic"),
+        _car(300, transmission="automatic", fuel_type="diesel"),
+    ]
+    index = _catalog(*cars)
+    assert index.search(transmission="automatic", max_price=400) == [cars[2].id, cars[3].id]
+    assert index.search(transmission="automatic", fuel_type="petrol") == [cars[1].id, cars[2].id]
+    assert index.search(seats=7, min_price=600) == []
+    assert index.search(fuel_type="electric") == []
+    assert index.search(transmission="automatic", exclude={cars[1].id}, limit=1) == [cars[2].id]
+
+
+def test_repricing_keeps_catalog_position_and_forget_drops_it():
+    cars = [_car(100), _car(200), _car(300)]
+    index = _catalog(*cars)
+    cars[0].daily_price = 400
+    index.add(cars[0])
+    assert index.search() == [car.id for car in cars]
+    assert index.search(sort="price_asc")[-1] == cars[0].id
+
+    index.remove(cars[1].id)
+    assert cars[1].id not in index
+    index.add(cars[1])
+    assert index.search() == [car.id for car in cars]
+
+    index.forget(cars[0].id)
+    index.add(cars[0])
+    assert index.search() == [cars[1].id, cars[2].id, cars[0].id]
+
+
+# ============ Text search (user-029) ============
+
+def test_every_term_must_match_and_model_matches_rank_first():
+    innova = _car(100, model="Toyota Innova", description="Family MPV")
+    fortuner = _car(100, model="Toyota Fortuner", description="Rugged SUV, not an innova")
+    city = _car(100, model="Honda City", description="Sedan")
+    index = CarTextIndex()
+    for car in (innova, fortuner, city):
+        index.add(car)
+    assert index.search("innova") == [innova.id, fortuner.id]
+    assert index.search("toyota suv") == [fortuner.id]
+    assert index.search("toyota sedan") == []
+    assert index.search("  ,, ") == []
+
+
+def test_prefixes_match_below_whole_words():
+    exact = _car(100, model="Inno")
+    longer = _car(100, model="Innova")
+    index = CarTextIndex()
+    index.add(longer)
+    index.add(exact)
+    assert index.search("INNO") == [exact.id, longer.id]
+    assert index.search("innovat") == []
+
+
+def test_reindexing_replaces_a_cars_terms():
+    car = _car(100, model="Swift")
+    index = CarTextIndex()
+    index.add(car)
+    car.model = "Baleno"
+    index.add(car)
+    assert index.search("swift") == []
+    assert index.search("baleno") == [car.id]
+    index.remove(car.id)
+    index.remove(car.id)
+    assert index.search("baleno") == []
+
+
+# ============ Leaderboard (user-030) ============
+
+def test_top_orders_by_score_then_registration():
+    users = [_user(5000), _user(7000), _user(5000), _user(9000)]
+    board = TrustLeaderboard()
+    for user in users:
+        board.add(user)
+    assert board.top() == [users[3].id, users[1].id, users[0].id, users[2].id]
+    assert board.top(skip=1, limit=2) == [users[1].id, users[0].id]
+    assert board.top(skip=4) == []
+
+
+def test_ties_share_a_competition_rank():
+    users = [_user(9000), _user(5000), _user(5000), _user(1000)]
+    board = TrustLeaderboard()
+    for user in users:
+        board.add(user)
+    assert [board.rank(user.id) for user in users] == [(1, 4), (2, 4), (2, 4), (4, 4)]
+    assert board.rank(uuid4()) is None
+
+
+def test_partitions_by_role_and_block_and_merges_across_them():
+    active = _user(5000)
+    blocked = _user(8000, blocked=True)
+    admin = _user(10000, role="admin")
+    board = TrustLeaderboard()
+    for user in (active, blocked, admin):
+        board.add(user)
+    assert board.top(role="user", blocked=False) == [active.id]
+    assert board.top(role="user") == [blocked.id, active.id]
+    assert board.top() == [admin.id, blocked.id, active.id]
+    assert board.rank(active.id) == (1, 1)
+
+
+def test_rescoring_moves_a_user_and_keeps_their_tie_position():
+    first, second = _user(5000), _user(5000)
+    board = TrustLeaderboard()
+    board.add(first)
+    board.add(second)
+    first.trust_score = 4000
+    board.add(first)
+    assert board.top() == [second.id, first.id]
+    first.trust_score = 5000
+    board.add(first)
+    assert board.top() == [first.id, second.id]
+    first.is_blocked = True
+    board.add(first)
+    assert board.top(blocked=False) == [second.id]
+    board.remove(first.id)
+    board.remove(first.id)
+    assert board.top() == [second.id]
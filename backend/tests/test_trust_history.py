@@ -0,0 +1,121 @@
+import importlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.core.trust_history import (
+    TrustHistory, TrustHistoryChunk, CHUNK_SIZE, REASON_CODES, REASON_RATING, REASON_LATE_CANCEL,
+    downsample, to_timestamp, window_events
+)
+from app.models import TrustChunk, User
+from app.services import trust_history_engine
+
+START = datetime(2031, 3, 10)
+
+
+def _history(deltas, base=5000, step=timedelta(minutes=1)) -> TrustHistory:
+    history = TrustHistory()
+    score = base
+    for i, delta in enumerate(deltas):
+        history.append(START + i * step, delta, REASON_RATING, score)
+        score += delta
+    return history
+
+
+def test_replay_across_sealed_chunks_keeps_the_running_score():
+    deltas = [(-1) ** i * (i % 7 + 1) for i in range(CHUNK_SIZE * 2 + 3)]
+    history = _history(deltas)
+    assert len(history.sealed) == 2 and len(history.open) == 3
+    assert len(history) == len(deltas)
+
+    events = list(history.events())
+    assert [event[1] for event in events] == deltas
+    assert events[-1][3] == 5000 + sum(deltas)
+    assert events[CHUNK_SIZE][3] == 5000 + sum(deltas[:CHUNK_SIZE + 1])
+
+
+def test_window_is_half_open():
+    history = _history([10, 20, 30, 40])
+    events = list(history.events(START + timedelta(minutes=1), START + timedelta(minutes=3)))
+    assert [event[1] for event in events] == [20, 30]
+    assert list(history.events(START + timedelta(hours=1))) == []
+    assert list(TrustHistory().events()) == []
+
+
+def test_chunks_outside_the_window_are_not_loaded():
+    loaded = []
+
+    def chunk(first_ts: int):
+        def load():
+            loaded.append(first_ts)
+            built = TrustHistoryChunk(0, first_ts)
+            built.append(first_ts, 1, 1)
+            built.append(first_ts + 10, 1, 1)
+            return built
+        return (first_ts, first_ts + 10), load
+
+    chunks = [chunk(100), chunk(200), chunk(300)]
+    start = datetime(1970, 1, 1) + timedelta(seconds=205)
+    end = datetime(1970, 1, 1) + timedelta(seconds=300)
+    assert [event[0] for event in window_events(chunks, start, end)] == [210]
+    assert loaded == [200]
+
+
+def test_clock_going_backwards_is_clamped():
+    history = TrustHistory()
+    history.append(START, 5, REASON_RATING, 100)
+    history.append(START - timedelta(hours=1), 5, REASON_LATE_CANCEL, 105)
+    timestamps = [event[0] for event in history.events()]
+    assert timestamps == [to_timestamp(START)] * 2
+
+
+def test_sealed_and_open_encodings_round_trip():
+    chunk = TrustHistoryChunk(-250, to_timestamp(START))
+    for i, delta in enumerate((2 ** 31 - 1, -(2 ** 31), 0)):
+        chunk.append(chunk.first_ts + i * 3600, delta, REASON_CODES[REASON_LATE_CANCEL])
+    expected = list(chunk.events())
+    assert list(TrustHistoryChunk.decode(chunk.encode()).events()) == expected
+    assert list(TrustHistoryChunk.decode_open(chunk.encode_open()).events()) == expected
+
+    grown = chunk.encode_open() + TrustHistoryChunk.open_record(chunk.first_ts, chunk.last_ts + 60, 7, 1)
+    decoded = TrustHistoryChunk.decode_open(grown)
+    assert len(decoded) == 4 and decoded.last_ts == chunk.last_ts + 60
+    assert TrustHistoryChunk.decode(TrustHistoryChunk(0, 0).encode()).last_ts == 0
+
+
+def test_downsample_keeps_short_dips():
+    deltas = [100] * 50 + [-4000, 4000] + [100] * 48
+    points, total, downsampled = downsample(_history(deltas).events(), 10)
+    assert (total, downsampled) == (100, True)
+    assert len(points) <= 10
+    assert sum(point["events"] for point in points) == 100
+    # The dip to 60 closes its bucket back at 100, but survives as its min
+    dip = [point for point in points if point["min_score"] == 60.0]
+    assert len(dip) == 1 and dip[0]["score"] >= 100.0
+    assert points[-1]["score"] == 148.0
+
+    points, total, downsampled = downsample(_history([1, 2]).events(), 10)
+    assert (len(points), total, downsampled) == (2, 2, False)
+    assert points[0]["reasons"] == {REASON_RATING: 1}
+    assert downsample([], 10) == ([], 0, False)
+
+
+def test_database_history_seals_chunks_like_memory(sqlite_session, monkeypatch):
+    db = sqlite_session
+    module = importlib.import_module("app.services.trust_history_engine")
+    monkeypatch.setattr(module, "CHUNK_SIZE", 3)
+    user = User(name="U", email="u@example.com", password_hash="x", trust_score=Decimal("50"))
+    db.add(user)
+    db.commit()
+
+    scores = [Decimal("51.25"), Decimal("50.75"), Decimal("50.75"), Decimal("60"), Decimal("59"), Decimal("0")]
+    for score in scores:
+        previous = user.trust_score
+        user.trust_score = score
+        trust_history_engine.record(db, user, previous, REASON_RATING)
+    db.commit()
+
+    rows = db.query(TrustChunk).order_by(TrustChunk.seq).all()
+    # The unchanged score is not an event
+    assert [(row.sealed, row.event_count) for row in rows] == [(True, 3), (False, 2)]
+    events = list(trust_history_engine.get_events(db, user.id))
+    assert [event[1] for event in events] == [125, -50, 925, -100, -5900]
+    assert [event[3] for event in events] == [5125, 5075, 6000, 5900, 0]